@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class EmbeddingStore(ABC):
+    """Embeddings keyed by content rather than by post, shared across users."""
+
+    @abstractmethod
+    def get(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """The float32 vector stored under each key, or None where there is none."""
+        pass
+
+    @abstractmethod
+    def put(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Store the rows of ``vectors`` under ``keys``; keys already stored keep their vector."""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from domain.entities.topic import Topic
+from domain.entities.user_id import UserId
+
+
+class FittedTopics(ABC):
+    """A projector that keeps the topic model it fitted for each user."""
+
+    @abstractmethod
+    def fitted_topics(self, user_id: UserId) -> Optional[Dict[int, Topic]]:
+        """The topics of the user's last projection, or None if none was fitted."""
+        pass
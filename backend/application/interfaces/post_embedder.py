@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+import numpy as np
+
+from domain.entities.post import Post
+
+
+class PostEmbedder(ABC):
+    @abstractmethod
+    def embed_posts(self, posts: List[Post]) -> np.ndarray:
+        """Embed posts into a (n_posts, dim) float32 matrix."""
+        pass
+
+    @abstractmethod
+    def stored_post_embeddings(self, posts: List[Post]) -> Tuple[List[int], np.ndarray]:
+        """The positions of the posts already embedded and stored, and their embeddings, without encoding any."""
+        pass
+
+    @abstractmethod
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query into the same space as the posts."""
+        pass
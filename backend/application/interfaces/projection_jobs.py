@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from domain.entities.post import Post, PostProjection
+from domain.entities.projection_job import ProjectionJob
+from domain.entities.user_id import UserId
+
+
+class ProjectionJobs(ABC):
+    """Projections computed in the background, tracked by job ID."""
+
+    @abstractmethod
+    def submit(self, user_id: UserId, generation: int, posts: List[Post]) -> ProjectionJob:
+        """Start projecting ``posts``, or return the job already started for this user and generation."""
+        pass
+
+    @abstractmethod
+    def status(self, user_id: UserId, job_id: str) -> Optional[ProjectionJob]:
+        """The job, or None if it is unknown or belongs to another user."""
+        pass
+
+    @abstractmethod
+    def result(self, user_id: UserId, job_id: str) -> Optional[List[PostProjection]]:
+        """The projections of a finished job, or None while it is not done."""
+        pass
+
+    @abstractmethod
+    def wait(self, user_id: UserId, job_id: str, timeout: float) -> Optional[ProjectionJob]:
+        """The job once it has finished or ``timeout`` seconds have passed, or None if it is unknown."""
+        pass
@@ -1,14 +1,130 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from threading import RLock
+from typing import Any, Callable, Iterable, List, Dict, Sequence, Set, Tuple
 
-from domain.entities.user_id import UserId
+from domain.entities.post import PostId
 from domain.entities.search import Post
 from application.interfaces.tokenizer import Tokenizer
 
-UserIndex = Dict[str, List[set]]  # token -> list of post IDs
+NO_DATE = -(2 ** 31)  # ``doc_days`` value of posts without a parseable date
+
+
+@dataclass(slots=True)
+class Postings:
+    """Sorted doc IDs of the posts containing a token, with term frequencies and positions.
+
+    The token positions of the i-th doc are
+    ``positions[position_offsets[i]:position_offsets[i + 1]]``, and
+    ``char_offsets`` and ``char_ends`` hold where the token starts and ends
+    in the post text at each of those positions. Ends are recorded because
+    normalization can make a token shorter or longer than its source text.
+    Postings loaded from disk may hold read-only ``memoryview`` buffers
+    instead of arrays.
+    """
+    doc_ids: array = field(default_factory=lambda: array("I"))
+    term_freqs: array = field(default_factory=lambda: array("I"))
+    positions: array = field(default_factory=lambda: array("I"))
+    position_offsets: array = field(default_factory=lambda: array("I", [0]))
+    char_offsets: array = field(default_factory=lambda: array("I"))
+    char_ends: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def positions_of(self, doc_id: int) -> array:
+        """Token positions of ``doc_id``, which must be present in this list."""
+        i = bisect_left(self.doc_ids, doc_id)
+        return self.positions[self.position_offsets[i]:self.position_offsets[i + 1]]
+
+    def spans_of(self, doc_id: int) -> List[Tuple[int, int]]:
+        """``(start, end)`` character spans of the token in the text of ``doc_id``, if present."""
+        i = bisect_left(self.doc_ids, doc_id)
+        if i == len(self.doc_ids) or self.doc_ids[i] != doc_id:
+            return []
+        first, last = self.position_offsets[i], self.position_offsets[i + 1]
+        return list(zip(self.char_offsets[first:last], self.char_ends[first:last]))
+
+    def make_mutable(self) -> None:
+        """Copy read-only buffers into arrays before appending to them.
+
+        Each field is checked on its own: compaction replaces only some of them.
+        """
+        for f in fields(self):
+            values = getattr(self, f.name)
+            if not isinstance(values, array):
+                setattr(self, f.name, _copy(values))
+
+
+def _copy(values: memoryview) -> array:
+    out = array("I")
+    out.frombytes(values.cast("B"))
+    return out
+
+
+@dataclass
+class UserIndex:
+    """Inverted index over the posts of a single user.
+
+    Posts are numbered with dense integer doc IDs in insertion order, so
+    appending new posts keeps every posting list sorted.
+    """
+    postings: Dict[str, Postings] = field(default_factory=dict)
+    author_postings: Dict[str, array] = field(default_factory=dict)  # author name token -> sorted doc IDs
+    terms: List[str] = field(default_factory=list)  # sorted keys of ``postings``, for prefix lookups
+    doc_freqs: Dict[str, int] = field(default_factory=dict)  # term -> number of live docs containing it
+    trigrams: Dict[str, List[str]] = field(default_factory=dict)  # character trigram -> terms, for fuzzy lookups
+    authors: List[str] = field(default_factory=list)  # author ordinal -> author name, for facets and filters
+    author_ordinals: Dict[str, int] = field(default_factory=dict)  # author name -> ordinal
+    author_docs: List[array] = field(default_factory=list)  # author ordinal -> sorted doc IDs
+    post_ids: List[PostId] = field(default_factory=list)  # doc ID -> post ID
+    doc_authors: array = field(default_factory=lambda: array("I"))  # doc ID -> author ordinal
+    doc_days: array = field(default_factory=lambda: array("i"))  # doc ID -> post date as days since 1970-01-01
+    doc_id_by_post: Dict[PostId, int] = field(default_factory=dict)  # post ID -> live doc ID
+    doc_lengths: array = field(default_factory=lambda: array("I"))  # doc ID -> number of tokens
+    doc_terms: Sequence[Tuple[str, ...]] = field(default_factory=list)  # doc ID -> distinct terms, to keep ``doc_freqs`` live
+    total_length: int = 0  # summed length of live posts
+    tombstones: Set[int] = field(default_factory=set)  # removed doc IDs still present in postings
+    generation: int = 0  # bumped on every mutation
+    epoch: int = 0  # bumped when compaction renumbers doc IDs
+    derived: Dict[str, Tuple[int, Any]] = field(default_factory=dict, repr=False, compare=False)  # name -> (generation, lazily derived structure)
+    lock: RLock = field(default_factory=RLock, repr=False, compare=False)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.post_ids) - len(self.tombstones)
+
+    @property
+    def avg_doc_length(self) -> float:
+        return self.total_length / self.n_docs if self.n_docs else 0.0
+
+    def get_derived(self, name: str, build: Callable[[], Any]) -> Any:
+        """Return a structure derived from the index, rebuilding it if the index changed since."""
+        with self.lock:
+            cached = self.derived.get(name)
+            if cached is None or cached[0] != self.generation:
+                cached = self.derived[name] = (self.generation, build())
+            return cached[1]
 
 
 class SearchIndexBuilder(ABC):
     @abstractmethod
     def build_index(self, posts: List[Post], tokenizer: Tokenizer) -> UserIndex:
         pass
+
+    @abstractmethod
+    def add_posts(self, index: UserIndex, posts: List[Post], tokenizer: Tokenizer) -> None:
+        """Merge new posts into an existing index."""
+        pass
+
+    @abstractmethod
+    def remove_posts(self, index: UserIndex, post_ids: Iterable[PostId]) -> None:
+        """Mark posts as removed; their postings are dropped on the next compaction."""
+        pass
+
+    @abstractmethod
+    def compact(self, index: UserIndex) -> None:
+        """Purge tombstoned posts from the postings and renumber doc IDs."""
+        pass
@@ -1,10 +1,23 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
-from domain.entities.user_id import UserId
 from domain.entities.post import PostId
+from domain.entities.search import Facets, PostFilter
 from application.interfaces.tokenizer import Tokenizer
+from application.interfaces.search_index_builder import UserIndex
+
+
+@dataclass(frozen=True)
+class RankedMatches:
+    matches: List[Tuple[PostId, float]]  # (post ID, score), best match first
+    total: int  # number of posts matching the query, before pagination
+    total_capped: bool = False  # ``total`` counts only the candidates ranked so far; more posts match
+    terms: List[str] = field(default_factory=list)  # query tokens that contributed to scoring
+    expansions: Dict[str, List[str]] = field(default_factory=dict)  # query token -> fuzzy matches used
+    facets: Facets = field(default_factory=Facets)  # counts over all matches, before pagination
+    # post ID -> sorted (start, end) character spans of the scoring terms, for the matches above
+    highlights: Dict[PostId, List[Tuple[int, int]]] = field(default_factory=dict)
 
 
 @dataclass
@@ -15,6 +28,20 @@ class SearchIndexLookup(ABC):
     def lookup(
         self,
         query: str,
-        index: Dict[str, set[str]],
-    ) -> List[PostId]:
+        index: UserIndex,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fuzzy: bool = False,
+        filters: Optional[PostFilter] = None,
+    ) -> RankedMatches:
+        pass
+
+    @abstractmethod
+    def filter_posts(self, filters: PostFilter, index: UserIndex) -> List[PostId]:
+        """Live posts passing ``filters``, in index order."""
+        pass
+
+    @abstractmethod
+    def facets(self, post_ids: List[PostId], index: UserIndex) -> Facets:
+        """Author and month counts over the given posts; posts missing from the index are not counted."""
         pass
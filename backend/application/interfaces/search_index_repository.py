@@ -2,8 +2,9 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 
 from domain.entities.user_id import UserId
+from domain.entities.post import PostId
+from application.interfaces.search_index_builder import UserIndex
 
-UserIndex = Dict[str, List[set]]  # token -> list of post IDs
 Index = Dict[UserId, UserIndex]
 
 @dataclass
@@ -16,11 +17,11 @@ class SearchIndexRepository:
         # Implementation for updating the search index
         pass
 
-    def get_index_by_user_id(self, user_id: UserId) -> Index | None:
+    def get_index_by_user_id(self, user_id: UserId) -> UserIndex | None:
         # Implementation for retrieving the search index by user ID
         pass
 
-    def get_post_ids_by_token(self, user_id: UserId, token: str) -> Optional[list[int]]:
+    def get_post_ids_by_token(self, user_id: UserId, token: str) -> Optional[list[PostId]]:
         # Implementation for retrieving post IDs by user ID and token
         pass
 
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from domain.entities.search import SearchResponse
+from domain.entities.user_id import UserId
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+
+
+class SearchResultCache(ABC):
+    """Search responses keyed by user, index generation and normalized request."""
+
+    @abstractmethod
+    def get(self, user_id: UserId, generation: int, key: Hashable) -> Optional[SearchResponse]:
+        pass
+
+    @abstractmethod
+    def put(self, user_id: UserId, generation: int, key: Hashable, response: SearchResponse) -> None:
+        """Store a response; entries of the user's older generations are dropped."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        pass
@@ -6,5 +6,11 @@ from domain.entities.search import SearchResult, Post
 
 class SnippetBuilder(ABC):
     @abstractmethod
-    def build(self, matches: List[Tuple[str, float]], tokens: List[str]) -> List[SearchResult]:
+    def build(
+        self,
+        matches: List[Tuple[str, float]],
+        highlights: Dict[str, List[Tuple[int, int]]],
+        posts: Dict[str, Post],
+    ) -> List[SearchResult]:
+        """One result per match, with a snippet of the post around its ``highlights`` spans."""
         pass
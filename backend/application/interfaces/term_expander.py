@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from application.interfaces.search_index_builder import UserIndex
+
+
+class TermExpander(ABC):
+    @abstractmethod
+    def expand(self, token: str, index: UserIndex) -> List[str]:
+        """Return indexed terms close to ``token`` (excluding ``token`` itself), best first."""
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from domain.entities.search import TermSuggestion
+from application.interfaces.search_index_builder import UserIndex
+
+
+class TermSuggester(ABC):
+    @abstractmethod
+    def suggest(self, prefix: str, index: UserIndex, limit: int = 10) -> List[TermSuggestion]:
+        """Return the indexed terms starting with ``prefix``, most frequent first."""
+        pass
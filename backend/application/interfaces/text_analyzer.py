@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class AnalyzedText:
+    tokens: Tuple[str, ...]
+    offsets: Tuple[int, ...]  # where each token starts in the analyzed text
+    ends: Tuple[int, ...]  # where each token ends in the analyzed text; normalization can change its length
+
+
+class TextAnalyzer(ABC):
+    """The one normalization every consumer of post text goes through."""
+
+    @abstractmethod
+    def analyze(self, text: str) -> AnalyzedText:
+        """Normalized tokens of ``text``, with URLs left out."""
+        pass
+
+    @abstractmethod
+    def content_tokens(self, text: str) -> Tuple[str, ...]:
+        """The tokens of ``analyze`` that are not stopwords."""
+        pass
+
+    @abstractmethod
+    def last_word(self, text: str) -> str:
+        """The word ``text`` ends with, normalized as ``analyze`` normalizes tokens, or "" if none.
+
+        Unlike ``analyze`` it keeps a word of one letter, as it is meant for
+        words still being typed.
+        """
+        pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+
+class TextEmbedder(ABC):
+    """Encodes texts into vectors, loading its model on first use."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Names the model and backend; vectors from different names are not comparable."""
+        pass
+
+    @abstractmethod
+    def load(self) -> None:
+        """Load the model now rather than on the first ``encode``."""
+        pass
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (n_texts, dim) float32 matrix."""
+        pass
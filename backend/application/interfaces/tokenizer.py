@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 
 class Tokenizer(ABC):
     @abstractmethod
     def tokenize(self, text: str) -> List[str]:
         pass
+
+    @abstractmethod
+    def tokenize_with_spans(self, text: str) -> List[Tuple[str, int, int]]:
+        """The tokens of ``tokenize`` with the character offsets in ``text`` where each starts and ends."""
+        pass
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from domain.entities.topic import UserTopics
+from domain.entities.user_id import UserId
+
+
+class TopicStore(ABC):
+    """Fitted topics keyed by user and search index generation."""
+
+    @abstractmethod
+    def get(self, user_id: UserId, generation: int) -> Optional[UserTopics]:
+        pass
+
+    @abstractmethod
+    def put(self, user_id: UserId, topics: UserTopics) -> None:
+        """Store the topics fitted at ``topics.generation``."""
+        pass
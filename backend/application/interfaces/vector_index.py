@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+
+
+class VectorIndex(ABC):
+    @abstractmethod
+    def add(self, user_id: UserId, post_ids: List[PostId], vectors: np.ndarray) -> None:
+        """Add or replace the vectors of the given posts."""
+        pass
+
+    @abstractmethod
+    def remove(self, user_id: UserId, post_ids: List[PostId]) -> None:
+        """Drop the vectors of the given posts."""
+        pass
+
+    @abstractmethod
+    def sync(self, user_id: UserId, post_ids: List[PostId]) -> List[PostId]:
+        """Drop vectors of posts not in ``post_ids`` and return the posts that have no vector yet."""
+        pass
+
+    @abstractmethod
+    def size(self, user_id: UserId) -> int:
+        pass
+
+    @abstractmethod
+    def search(self, user_id: UserId, query: np.ndarray, top_k: Optional[int]) -> List[Tuple[PostId, float]]:
+        """Return the ``top_k`` posts by cosine similarity to ``query``, best first.
+
+        ``top_k=None`` scores every vector exactly and returns them all; a
+        number may be answered approximately.
+        """
+        pass
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from domain.entities.health import ModelState
+
+
+class WarmUp(ABC):
+    """Models that load on first use, and can be loaded ahead of it instead."""
+
+    @abstractmethod
+    def warm_up(self) -> None:
+        """Load the models now, blocking until they are ready."""
+        pass
+
+    @abstractmethod
+    def model_state(self) -> ModelState:
+        pass
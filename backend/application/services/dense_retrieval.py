@@ -0,0 +1,27 @@
+from typing import AbstractSet, List, Optional, Tuple
+
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.vector_index import VectorIndex
+
+
+def dense_search(
+    query: str,
+    user_id: UserId,
+    top_k: Optional[int],
+    post_embedder: PostEmbedder,
+    vector_index: VectorIndex,
+    allowed: Optional[AbstractSet[PostId]] = None,
+) -> List[Tuple[PostId, float]]:
+    """Return the user's ``top_k`` posts closest to ``query`` in embedding space, or all of them for None.
+
+    Only the vector index is read: posts are embedded when they are saved.
+    With ``allowed`` every vector is ranked and the other posts are dropped
+    before the ``top_k`` cut, so filters never leave the page short.
+    """
+    query_vector = post_embedder.embed_query(query)
+    if allowed is None:
+        return vector_index.search(user_id, query_vector, top_k=top_k)
+    matches = [match for match in vector_index.search(user_id, query_vector, top_k=None) if match[0] in allowed]
+    return matches if top_k is None else matches[:top_k]
@@ -0,0 +1,43 @@
+from hashlib import sha256
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from application.interfaces.embedding_store import EmbeddingStore
+
+
+def content_key(model_name: str, text: str) -> str:
+    """Store key of the embedding of ``text`` by ``model_name``."""
+    return sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+def cached_embeddings(
+    texts: List[str],
+    model_name: str,
+    encode: Callable[[List[str]], np.ndarray],
+    store: EmbeddingStore,
+) -> np.ndarray:
+    """Embed ``texts``, running ``encode`` only on the distinct texts ``store`` lacks.
+
+    An edited post hashes to a new key, so it is re-encoded as well.
+    """
+    if not texts:
+        return np.asarray(encode([]), dtype=np.float32)
+    keys = [content_key(model_name, text) for text in texts]
+    vectors = store.get(keys)
+    missing = {key: text for key, text, vector in zip(keys, texts, vectors) if vector is None}
+    if missing:
+        encoded = np.asarray(encode(list(missing.values())), dtype=np.float32)
+        store.put(list(missing), encoded)
+        fresh = dict(zip(missing, encoded))
+        vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+    return np.stack(vectors)
+
+
+def stored_embeddings(texts: List[str], model_name: str, store: EmbeddingStore) -> Tuple[List[int], np.ndarray]:
+    """The positions of the ``texts`` whose embedding ``store`` holds, and those embeddings; nothing is encoded."""
+    vectors = store.get([content_key(model_name, text) for text in texts])
+    found = [i for i, vector in enumerate(vectors) if vector is not None]
+    if not found:
+        return [], np.empty((0, 0), dtype=np.float32)
+    return found, np.stack([vectors[i] for i in found])
@@ -0,0 +1,24 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def procrustes_alignment(source: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The similarity transform that best maps ``source`` points onto ``target``.
+
+    Returns ``(matrix, offset)`` such that ``source @ matrix + offset`` is
+    as close as possible to ``target`` in least squares, where ``matrix`` is
+    a rotation, possibly with a reflection, times a uniform scale. UMAP
+    layouts have no preferred orientation, so mirror images are allowed.
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    source_mean, target_mean = source.mean(axis=0), target.mean(axis=0)
+    source_centred, target_centred = source - source_mean, target - target_mean
+
+    u, s, vt = np.linalg.svd(source_centred.T @ target_centred)
+    rotation = u @ vt
+    spread = (source_centred ** 2).sum()
+    scale = s.sum() / spread if spread > 0 else 1.0
+    matrix = scale * rotation
+    return matrix, target_mean - source_mean @ matrix
@@ -0,0 +1,33 @@
+import base64
+import binascii
+from hashlib import sha256
+
+
+def _digest(query_key: str) -> str:
+    return sha256(query_key.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, generation: int, query_key: str) -> str:
+    """Opaque cursor for the page starting at ``offset`` of ``query_key``'s results at index ``generation``."""
+    raw = f"o:{offset}:g:{generation}:q:{_digest(query_key)}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, generation: int, query_key: str) -> int:
+    """Offset encoded by :func:`encode_cursor`; raises ``ValueError`` on malformed input.
+
+    Offsets only line up with the ranking they were issued for, so cursors
+    of another query, or issued before the index changed, are rejected too.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    parts = raw.split(":")
+    if len(parts) != 6 or parts[0::2] != ["o", "g", "q"] or not parts[1].isdigit() or not parts[3].isdigit():
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if parts[5] != _digest(query_key):
+        raise ValueError("Cursor was issued for another query")
+    if int(parts[3]) != generation:
+        raise ValueError("Stale cursor: the posts changed since it was issued; start again from the first page")
+    return int(parts[1])
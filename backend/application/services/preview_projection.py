@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def randomized_pca(
+    points: np.ndarray,
+    n_components: int = 2,
+    n_oversamples: int = 8,
+    n_iter: int = 2,
+    seed: int = 42,
+) -> np.ndarray:
+    """Project ``points`` onto their top principal components with a randomized SVD.
+
+    A few power iterations over a random sketch of the centred points are
+    enough for a layout preview, and take milliseconds even for thousands of
+    embeddings. The seed and sign convention make the same points always land
+    in the same place. Components the points do not have are left at zero.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    coords = np.zeros((len(points), n_components), dtype=np.float32)
+    if len(points) < 2:
+        return coords
+
+    centred = points - points.mean(axis=0)
+    rank = min(n_components + n_oversamples, *centred.shape)
+    rng = np.random.default_rng(seed)
+    basis = centred @ rng.standard_normal((centred.shape[1], rank)).astype(np.float32)
+    for _ in range(n_iter):
+        basis, _ = np.linalg.qr(basis)
+        basis = centred @ (centred.T @ basis)
+    basis, _ = np.linalg.qr(basis)
+    u, s, _ = np.linalg.svd(basis.T @ centred, full_matrices=False)
+
+    kept = min(n_components, len(s))
+    coords[:, :kept] = (basis @ u[:, :kept]) * s[:kept]
+    # Make the largest coordinate of each component positive so the sign does not flip between calls
+    largest = coords[np.abs(coords).argmax(axis=0), np.arange(n_components)]
+    coords *= np.where(largest < 0, -1.0, 1.0).astype(np.float32)
+    return coords
@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+from domain.entities.post import PostProjection, ProjectionTable, ProjectionTopic
+
+
+def projection_table(projections: List[PostProjection]) -> ProjectionTable:
+    """Split projections into parallel columns and a table of the topics they reference.
+
+    Posts of the same topic share its keywords, so each topic's keywords are
+    kept once, from its first post. Projections without a topic (previews)
+    have a topic_id of None and add nothing to the table.
+    """
+    topics: Dict[int, ProjectionTopic] = {}
+    for projection in projections:
+        if projection.topic_id is not None and projection.topic_id not in topics:
+            topics[projection.topic_id] = ProjectionTopic(id=projection.topic_id, keywords=projection.keywords)
+    return ProjectionTable(
+        topics=[topics[topic_id] for topic_id in sorted(topics)],
+        post_id=[projection.post_id for projection in projections],
+        x=[projection.x for projection in projections],
+        y=[projection.y for projection in projections],
+        topic_id=[projection.topic_id for projection in projections],
+    )
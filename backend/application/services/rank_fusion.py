@@ -0,0 +1,20 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from domain.entities.post import PostId
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[Tuple[PostId, float]]],
+    k: int = 60,
+) -> List[Tuple[PostId, float]]:
+    """Fuse best-first rankings by summing 1 / (k + rank) over the lists a post appears in.
+
+    Only ranks are used, so retrievers with incomparable scores (BM25, cosine)
+    can be combined. Ties keep the order in which posts were first seen.
+    """
+    fused: Dict[PostId, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, (post_id, _) in enumerate(ranking, start=1):
+            fused[post_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: -item[1])
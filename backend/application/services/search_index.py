@@ -0,0 +1,38 @@
+from domain.interfaces.post_repository import PostRepository
+from domain.entities.user_id import UserId
+from application.interfaces.search_index_builder import SearchIndexBuilder, UserIndex
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.tokenizer import Tokenizer
+
+
+def get_or_build_user_index(
+    user_id: UserId,
+    index_repository: SearchIndexRepository,
+    index_builder: SearchIndexBuilder,
+    post_repository: PostRepository,
+    tokenizer: Tokenizer,
+) -> UserIndex:
+    """Return the user's search index, building it from their posts on first use."""
+    user_index = index_repository.get_index_by_user_id(user_id)
+    if user_index is None:
+        posts = post_repository.get_posts_by_user_id(user_id)
+        user_index = index_builder.build_index(posts, tokenizer)
+        index_repository.save_user_index(user_id, user_index)
+    return user_index
+
+
+def compact_if_needed(
+    user_id: UserId,
+    index_repository: SearchIndexRepository,
+    index_builder: SearchIndexBuilder,
+    threshold: float,
+) -> bool:
+    """Compact the user's index if at least ``threshold`` of its documents are tombstoned."""
+    user_index = index_repository.get_index_by_user_id(user_id)
+    if user_index is None or not user_index.doc_lengths:
+        return False
+    if len(user_index.tombstones) / len(user_index.doc_lengths) < threshold:
+        return False
+    index_builder.compact(user_index)
+    index_repository.save_user_index(user_id, user_index)
+    return True
@@ -0,0 +1,43 @@
+import logging
+from dataclasses import dataclass
+from threading import Thread
+from typing import Dict, List
+
+from domain.entities.health import Readiness
+from application.interfaces.warm_up import WarmUp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CheckHealth:
+    models: Dict[str, WarmUp]
+    # Without a warm-up, models load on the first request that needs them,
+    # so only a failed load holds readiness back
+    wait_for_models: bool = True
+
+    def readiness(self) -> Readiness:
+        states = {name: model.model_state() for name, model in self.models.items()}
+        ready = "failed" not in states.values() and (
+            not self.wait_for_models or all(state == "ready" for state in states.values())
+        )
+        return Readiness(ready=ready, models=states)
+
+    def start_warm_up(self) -> List[Thread]:
+        """Load every model in a background thread of its own while requests are served."""
+        threads = [
+            Thread(target=self._warm_up, args=(name, model), name=f"warm-up-{name}", daemon=True)
+            for name, model in self.models.items()
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _warm_up(name: str, model: WarmUp) -> None:
+        try:
+            model.warm_up()
+        except Exception:
+            logger.exception("[CheckHealth] Loading the %s models failed", name)
+        else:
+            logger.info("[CheckHealth] %s models are ready", name)
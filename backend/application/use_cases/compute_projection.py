@@ -1,17 +1,119 @@
+import time
 from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
 
 from domain.entities.post import Post, PostProjection
+from domain.entities.projection_job import ProjectionJob, ProjectionUpdate
 from domain.entities.user_id import UserId
 from domain.interfaces.post_repository import PostRepository
+from application.interfaces.post_embedder import PostEmbedder
 from application.interfaces.post_projector import PostProjector
+from application.interfaces.projection_jobs import ProjectionJobs
+from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.tokenizer import Tokenizer
+from application.services.preview_projection import randomized_pca
+from application.services.search_index import get_or_build_user_index
 
 
 @dataclass
 class ComputeProjection:
     post_repository: PostRepository
     post_projector: PostProjector
+    # Background jobs are keyed by the user's search index generation
+    projection_jobs: Optional[ProjectionJobs] = None
+    index_repository: Optional[SearchIndexRepository] = None
+    index_builder: Optional[SearchIndexBuilder] = None
+    tokenizer: Optional[Tokenizer] = None
+    # Progressive projections preview a PCA of these embeddings while the job runs
+    post_embedder: Optional[PostEmbedder] = None
+    # Seconds a progressive projection waits for the refined layout before settling for the preview
+    refine_budget: float = 30.0
+    # Seconds between looks in the embedding store for the embeddings the job writes
+    preview_poll_interval: float = 0.25
 
     def compute(self, user_id: UserId) -> list[PostProjection]:
         posts = self.post_repository.get_posts_by_user_id(user_id)
         projections = self.post_projector.project(posts=posts)  # type: ignore hel
         return projections
+
+    def submit(self, user_id: UserId) -> ProjectionJob:
+        """Project the user's posts in the background, joining a job for the same posts if one exists."""
+        job, _ = self._submit(user_id)
+        return job
+
+    def progressive(self, user_id: UserId) -> Iterator[ProjectionUpdate]:
+        """Submit the user's projection, yielding a quick preview and then the refined layout.
+
+        The preview is a randomized PCA of the post embeddings in the
+        embedding store, so it is ready long before UMAP and the topic model
+        and never encodes posts next to the job. When none are stored yet,
+        the store is looked at again every ``preview_poll_interval`` seconds
+        while the job runs, and the preview is sent once the job has written
+        them. It covers only the posts found there, and is skipped when the
+        job finishes first. If the job has not finished within
+        ``refine_budget`` seconds the last update is a timeout and the
+        preview, if any, stands; the job keeps running, so a later request
+        finds it done.
+        """
+        deadline = time.monotonic() + self.refine_budget
+        job, posts = self._submit(user_id)
+        if self.post_embedder is not None and posts:
+            while job.status not in ("done", "failed"):
+                preview = self._preview(posts)
+                if preview:
+                    yield ProjectionUpdate(stage="preview", job=job, projections=preview)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                job = self.projection_jobs.wait(
+                    user_id, job.id, timeout=min(self.preview_poll_interval, remaining)
+                ) or job
+
+        job = self.projection_jobs.wait(user_id, job.id, timeout=max(deadline - time.monotonic(), 0.0)) or job
+        if job.status == "done":
+            projections = self.projection_jobs.result(user_id, job.id)
+            yield ProjectionUpdate(stage="refined", job=job, projections=projections)
+        elif job.status == "failed":
+            yield ProjectionUpdate(stage="failed", job=job)
+        else:
+            yield ProjectionUpdate(stage="timeout", job=job)
+
+    def _preview(self, posts: List[Post]) -> List[PostProjection]:
+        if not posts:
+            return []
+        found, embeddings = self.post_embedder.stored_post_embeddings(posts)
+        if not found:
+            return []
+        coords = randomized_pca(embeddings)
+        return [
+            PostProjection(post_id=posts[i].id, x=float(x), y=float(y), keywords=[])
+            for i, (x, y) in zip(found, coords)
+        ]
+
+    def _submit(self, user_id: UserId) -> Tuple[ProjectionJob, List[Post]]:
+        if self.projection_jobs is None:
+            raise ValueError("Background projections require a job runner")
+        user_index = get_or_build_user_index(
+            user_id,
+            self.index_repository,
+            self.index_builder,
+            self.post_repository,
+            self.tokenizer,
+        )
+        # Posts are saved before they are indexed, so reading them after the
+        # generation can only make a job newer than its key, never staler
+        generation = user_index.generation
+        posts = self.post_repository.get_posts_by_user_id(user_id)
+        return self.projection_jobs.submit(user_id, generation, posts), posts
+
+    def job(self, user_id: UserId, job_id: str) -> Optional[ProjectionJob]:
+        if self.projection_jobs is None:
+            return None
+        return self.projection_jobs.status(user_id, job_id)
+
+    def result(self, user_id: UserId, job_id: str) -> Optional[list[PostProjection]]:
+        if self.projection_jobs is None:
+            return None
+        return self.projection_jobs.result(user_id, job_id)
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from domain.interfaces.post_repository import PostRepository
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.vector_index import VectorIndex
+from application.services.search_index import compact_if_needed
+
+
+@dataclass
+class DeletePostsUseCase:
+    post_repository: PostRepository
+    index_repository: SearchIndexRepository
+    index_builder: SearchIndexBuilder
+    compaction_threshold: float = 0.2  # tombstoned fraction of the index that triggers compaction
+    vector_index: Optional[VectorIndex] = None
+
+    def execute(self, user_id: UserId, post_ids: list[PostId]) -> list[PostId]:
+        removed = self.post_repository.remove_posts(user_id, post_ids)
+        if self.vector_index is not None and removed:
+            self.vector_index.remove(user_id, removed)
+        user_index = self.index_repository.get_index_by_user_id(user_id)
+        if user_index is not None and removed:
+            self.index_builder.remove_posts(user_index, removed)
+            self.index_repository.save_user_index(user_id, user_index)
+        return removed
+
+    def compact(self, user_id: UserId) -> bool:
+        """Compact the user's index if enough posts have been tombstoned."""
+        return compact_if_needed(user_id, self.index_repository, self.index_builder, self.compaction_threshold)
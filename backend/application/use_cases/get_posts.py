@@ -1,8 +1,14 @@
 from dataclasses import dataclass
 
 from domain.interfaces.post_repository import PostRepository
-from domain.entities.post import Post, PostId
+from domain.entities.post import Post, PostId, PostsResponse
+from domain.entities.search import PostFilter
 from domain.entities.user_id import UserId
+from application.interfaces.search_index_builder import SearchIndexBuilder, UserIndex
+from application.interfaces.search_index_lookup import SearchIndexLookup
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.tokenizer import Tokenizer
+from application.services.search_index import get_or_build_user_index
 
 from typing import Optional
 
@@ -10,12 +16,27 @@ from typing import Optional
 @dataclass
 class GetPostsUseCase:
     post_repository: PostRepository
+    # Author and date filters, and facet counts, are resolved in the search index
+    index_lookup: Optional[SearchIndexLookup] = None
+    index_repository: Optional[SearchIndexRepository] = None
+    index_builder: Optional[SearchIndexBuilder] = None
+    tokenizer: Optional[Tokenizer] = None
 
     def execute(
         self,
         user_id: UserId,
-        post_ids: Optional[list[PostId]]
+        post_ids: Optional[list[PostId]],
+        filters: Optional[PostFilter] = None,
     ) -> list[Post]:
+        if filters is not None and not filters.is_empty:
+            if self.index_lookup is None:
+                raise ValueError("Filtering posts requires a search index")
+            matching = self.index_lookup.filter_posts(filters, self._user_index(user_id))
+            if post_ids is not None:
+                wanted = set(matching)
+                matching = [post_id for post_id in post_ids if post_id in wanted]
+            post_ids = matching
+
         if post_ids is None:
             return self.post_repository.get_posts_by_user_id(user_id=user_id)
 
@@ -23,3 +44,25 @@ class GetPostsUseCase:
             user_id=user_id,
             post_ids=post_ids
         )
+
+    def execute_with_facets(
+        self,
+        user_id: UserId,
+        post_ids: Optional[list[PostId]],
+        filters: Optional[PostFilter] = None,
+    ) -> PostsResponse:
+        """The posts ``execute`` returns, with author and month counts over them."""
+        if self.index_lookup is None:
+            raise ValueError("Facet counts require a search index")
+        posts = self.execute(user_id, post_ids, filters)
+        facets = self.index_lookup.facets([post.id for post in posts], self._user_index(user_id))
+        return PostsResponse(posts=posts, facets=facets)
+
+    def _user_index(self, user_id: UserId) -> UserIndex:
+        return get_or_build_user_index(
+            user_id,
+            self.index_repository,
+            self.index_builder,
+            self.post_repository,
+            self.tokenizer,
+        )
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from domain.entities.post import Post
+from domain.entities.topic import Topic, TopicSummary, UserTopics
+from domain.entities.user_id import UserId
+from domain.interfaces.post_repository import PostRepository
+from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.tokenizer import Tokenizer
+from application.interfaces.topic_store import TopicStore
+from application.services.search_index import get_or_build_user_index
+
+
+@dataclass
+class GetTopics:
+    """Serves the topics fitted by the projection of the user's current posts, without fitting.
+
+    Topics exist once a projection job for the current search index
+    generation has finished; until then every method returns None.
+    """
+    topic_store: TopicStore
+    post_repository: PostRepository
+    index_repository: SearchIndexRepository
+    index_builder: SearchIndexBuilder
+    tokenizer: Tokenizer
+
+    def topics(self, user_id: UserId) -> Optional[List[TopicSummary]]:
+        user_topics = self._current(user_id)
+        if user_topics is None:
+            return None
+        return [user_topics.topics[topic_id].summary for topic_id in sorted(user_topics.topics)]
+
+    def topic_posts(self, user_id: UserId, topic_id: int, limit: int, offset: int) -> Optional[List[Post]]:
+        topic = self._topic(user_id, topic_id)
+        if topic is None:
+            return None
+        return self.post_repository.get_posts_by_user_id_and_ids(
+            user_id=user_id, post_ids=topic.post_ids[offset:offset + limit]
+        )
+
+    def representative_posts(self, user_id: UserId, topic_id: int) -> Optional[List[Post]]:
+        topic = self._topic(user_id, topic_id)
+        if topic is None:
+            return None
+        return self.post_repository.get_posts_by_user_id_and_ids(
+            user_id=user_id, post_ids=topic.representative_post_ids
+        )
+
+    def _topic(self, user_id: UserId, topic_id: int) -> Optional[Topic]:
+        user_topics = self._current(user_id)
+        return None if user_topics is None else user_topics.topics.get(topic_id)
+
+    def _current(self, user_id: UserId) -> Optional[UserTopics]:
+        user_index = get_or_build_user_index(
+            user_id,
+            self.index_repository,
+            self.index_builder,
+            self.post_repository,
+            self.tokenizer,
+        )
+        return self.topic_store.get(user_id, user_index.generation)
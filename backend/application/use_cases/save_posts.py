@@ -3,6 +3,13 @@ from dataclasses import dataclass
 from domain.interfaces.post_repository import PostRepository
 from domain.entities.post import Post
 from domain.entities.user_id import UserId
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.text_analyzer import TextAnalyzer
+from application.interfaces.tokenizer import Tokenizer
+from application.interfaces.vector_index import VectorIndex
+from application.services.search_index import compact_if_needed
 
 from typing import Optional
 
@@ -10,6 +17,15 @@ from typing import Optional
 @dataclass
 class SavePostsUseCase:
     post_repository: PostRepository
+    index_repository: SearchIndexRepository
+    index_builder: SearchIndexBuilder
+    tokenizer: Tokenizer
+    # Analyzing at ingest caches each post's tokens for search, word cloud and projection
+    text_analyzer: Optional[TextAnalyzer] = None
+    compaction_threshold: float = 0.2  # tombstoned fraction of the index that triggers compaction
+    # Saved posts are embedded for semantic and hybrid search, which only read the vector index
+    post_embedder: Optional[PostEmbedder] = None
+    vector_index: Optional[VectorIndex] = None
 
     def execute(
         self,
@@ -17,4 +33,33 @@ class SavePostsUseCase:
     ) -> None:
         if posts is None:
             return []
-        return self.post_repository.add_posts(posts)
+        self.post_repository.add_posts(posts)
+        if self.text_analyzer is not None:
+            for post in posts:
+                self.text_analyzer.content_tokens(post.text)
+
+        # Merge the batch into indexes that already exist; users without one
+        # get a full build on their first search.
+        posts_by_user: dict[UserId, list[Post]] = {}
+        for post in posts:
+            posts_by_user.setdefault(post.userId, []).append(post)
+        for user_id, user_posts in posts_by_user.items():
+            user_index = self.index_repository.get_index_by_user_id(user_id)
+            if user_index is None:
+                continue
+            self.index_builder.add_posts(user_index, user_posts, self.tokenizer)
+            self.index_repository.save_user_index(user_id, user_index)
+
+    def embed(self, posts: list[Post]) -> None:
+        """Add the embeddings of saved posts to the vector index; slow, so it runs after the response."""
+        if self.post_embedder is None or self.vector_index is None:
+            return
+        posts_by_user: dict[UserId, list[Post]] = {}
+        for post in posts:
+            posts_by_user.setdefault(post.userId, []).append(post)
+        for user_id, user_posts in posts_by_user.items():
+            self.vector_index.add(user_id, [post.id for post in user_posts], self.post_embedder.embed_posts(user_posts))
+
+    def compact(self, user_id: UserId) -> bool:
+        """Compact the user's index if re-indexed posts have tombstoned enough of it."""
+        return compact_if_needed(user_id, self.index_repository, self.index_builder, self.compaction_threshold)
@@ -1,14 +1,27 @@
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from typing import Literal, Optional, Sequence
 
 from domain.interfaces.post_repository import PostRepository
+from domain.entities.post import Post
 from domain.entities.user_id import UserId
-from domain.entities.search import SearchResult
-from domain.entities.post import PostId
-from application.interfaces.search_index_lookup import SearchIndexLookup
+from domain.entities.search import PostFilter, SearchResponse
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.search_index_lookup import RankedMatches, SearchIndexLookup
 from application.interfaces.search_index_repository import SearchIndexRepository
-from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.search_index_builder import SearchIndexBuilder, UserIndex
+from application.interfaces.search_result_cache import CacheStats, SearchResultCache
+from application.interfaces.snippet_builder import SnippetBuilder
 from application.interfaces.tokenizer import Tokenizer
+from application.interfaces.vector_index import VectorIndex
+from application.services.dense_retrieval import dense_search
+from application.services.pagination import decode_cursor, encode_cursor
+from application.services.rank_fusion import reciprocal_rank_fusion
+from application.services.search_index import get_or_build_user_index
+
+
+SearchMode = Literal["keyword", "hybrid"]
+POST_FIELDS = tuple(f.name for f in fields(Post))
 
 
 @dataclass
@@ -18,12 +31,154 @@ class SearchPosts:
     index_builder: SearchIndexBuilder
     tokenizer: Tokenizer
     post_repository: PostRepository
+    snippet_builder: SnippetBuilder
+    # Dense retriever for mode="hybrid"
+    post_embedder: Optional[PostEmbedder] = None
+    vector_index: Optional[VectorIndex] = None
+    hybrid_candidates: int = 100  # ranked candidates taken from each retriever before fusion
+    rrf_k: int = 60
+    result_cache: Optional[SearchResultCache] = None
+    _executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(max_workers=4, thread_name_prefix="dense-search"),
+        init=False,
+        repr=False,
+    )
+
+    def execute(
+        self,
+        query: str,
+        user_id: UserId,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fuzzy: bool = False,
+        mode: SearchMode = "keyword",
+        cursor: Optional[str] = None,
+        include_posts: bool = False,
+        post_fields: Optional[Sequence[str]] = None,
+        filters: Optional[PostFilter] = None,
+    ) -> SearchResponse:
+        """Rank the user's posts for ``query``, restricted to those passing ``filters``.
+
+        ``cursor`` (from a previous response's ``next_cursor``) takes precedence
+        over ``offset``; it is rejected with ``ValueError`` once the posts have
+        changed, or for another query. With ``include_posts`` each result
+        carries the post, restricted to ``post_fields`` when given.
+        """
+        if post_fields is not None:
+            unknown = set(post_fields) - set(POST_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown post fields: {sorted(unknown)}")
+        selected = tuple(post_fields) if post_fields is not None else POST_FIELDS
+        if filters is not None and filters.is_empty:
+            filters = None
+
+        user_index = get_or_build_user_index(
+            user_id,
+            self.index_repository,
+            self.index_builder,
+            self.post_repository,
+            self.tokenizer,
+        )
+        # The generation changes on every ingest or delete; cursors and cached
+        # responses carry the one they were ranked at, so stale ones are never used
+        generation = user_index.generation
+        cursor_key = repr((" ".join(query.split()), fuzzy, mode, filters))
+        if cursor is not None:
+            offset = decode_cursor(cursor, generation, cursor_key)
+        if self.result_cache is not None:
+            cache_key = (
+                " ".join(query.split()), limit, offset, fuzzy, mode, include_posts and selected, filters
+            )
+            cached = self.result_cache.get(user_id, generation, cache_key)
+            if cached is not None:
+                return cached
+
+        if mode == "hybrid":
+            ranked = self._hybrid(query, user_id, user_index, limit, offset, fuzzy, filters)
+        else:
+            ranked = self.index_lookup.lookup(
+                query, user_index, limit=limit, offset=offset, fuzzy=fuzzy, filters=filters
+            )
+
+        # Only the requested page is hydrated, in one batched call for both
+        # snippets and the returned posts
+        post_ids = [post_id for post_id, _ in ranked.matches]
+        posts = {
+            post.id: post
+            for post in self.post_repository.get_posts_by_user_id_and_ids(user_id, post_ids)
+        }
+        results = self.snippet_builder.build(ranked.matches, ranked.highlights, posts)
+        if include_posts:
+            results = [
+                replace(result, post={name: getattr(posts[result.post_id], name) for name in selected})
+                if result.post_id in posts else result
+                for result in results
+            ]
+
+        end = offset + len(ranked.matches)
+        response = SearchResponse(
+            results=results,
+            total=ranked.total,
+            expansions=ranked.expansions,
+            next_cursor=(
+                encode_cursor(end, generation, cursor_key)
+                if limit is not None and ranked.matches and (end < ranked.total or ranked.total_capped)
+                else None
+            ),
+            facets=ranked.facets,
+            total_capped=ranked.total_capped,
+        )
+        if self.result_cache is not None:
+            self.result_cache.put(user_id, generation, cache_key, response)
+        return response
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self.result_cache.stats() if self.result_cache is not None else None
+
+    def _hybrid(
+        self,
+        query: str,
+        user_id: UserId,
+        user_index: UserIndex,
+        limit: Optional[int],
+        offset: int,
+        fuzzy: bool,
+        filters: Optional[PostFilter],
+    ) -> RankedMatches:
+        if self.post_embedder is None or self.vector_index is None:
+            raise ValueError("Hybrid search requires a post embedder and a vector index")
+
+        # Without a page size every candidate of both retrievers is ranked
+        depth = None if limit is None else max(self.hybrid_candidates, offset + limit)
+        # Dense hits are filtered before the depth cut, as lexical ones are
+        allowed = None if filters is None else set(self.index_lookup.filter_posts(filters, user_index))
+        # Query encoding and the vector scan run while BM25 scores on this thread
+        dense = self._executor.submit(
+            dense_search,
+            query,
+            user_id,
+            depth,
+            self.post_embedder,
+            self.vector_index,
+            allowed,
+        )
+        lexical = self.index_lookup.lookup(query, user_index, limit=depth, fuzzy=fuzzy, filters=filters)
+        fused = reciprocal_rank_fusion([lexical.matches, dense.result()], k=self.rrf_k)
+        # Deeper pages raise ``depth``, so posts cut off here are reached by later cursors
+        n_dense = self.vector_index.size(user_id) if allowed is None else len(allowed)
+        capped = depth is not None and (lexical.total > depth or n_dense > depth)
 
-    def execute(self, query: str, user_id: UserId) -> List[PostId]:
-        user_index = self.index_repository.get_index_by_user_id(user_id)
-        if user_index is None:
-            posts = self.post_repository.get_posts_by_user_id(user_id)
-            user_index = self.index_builder.build_index(posts, self.tokenizer)
-            self.index_repository.save_user_index(user_id, user_index)
-        matches = self.index_lookup.lookup(query, user_index)
-        return matches
+        end = None if limit is None else offset + limit
+        page = fused[offset:end]
+        return RankedMatches(
+            matches=page,
+            total=len(fused),
+            total_capped=capped,
+            terms=lexical.terms,
+            expansions=lexical.expansions,
+            facets=lexical.facets,
+            # Posts found only by the dense retriever have no term spans
+            highlights={
+                post_id: lexical.highlights[post_id] for post_id, _ in page if post_id in lexical.highlights
+            },
+        )
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+from domain.interfaces.post_repository import PostRepository
+from domain.entities.user_id import UserId
+from domain.entities.search import SearchResponse
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.snippet_builder import SnippetBuilder
+from application.interfaces.vector_index import VectorIndex
+from application.services.dense_retrieval import dense_search
+
+
+@dataclass
+class SemanticSearchPosts:
+    post_embedder: PostEmbedder
+    vector_index: VectorIndex
+    post_repository: PostRepository
+    snippet_builder: SnippetBuilder
+
+    def execute(self, query: str, user_id: UserId, limit: int = 20, offset: int = 0) -> SearchResponse:
+        matches = dense_search(
+            query,
+            user_id,
+            offset + limit,
+            self.post_embedder,
+            self.vector_index,
+        )[offset:]
+
+        page = self.post_repository.get_posts_by_user_id_and_ids(
+            user_id, [post_id for post_id, _ in matches]
+        )
+        results = self.snippet_builder.build(matches, {}, {post.id: post for post in page})
+        return SearchResponse(results=results, total=self.vector_index.size(user_id))
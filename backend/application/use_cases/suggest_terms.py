@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import List
+
+from domain.interfaces.post_repository import PostRepository
+from domain.entities.user_id import UserId
+from domain.entities.search import TermSuggestion
+from application.interfaces.search_index_repository import SearchIndexRepository
+from application.interfaces.search_index_builder import SearchIndexBuilder
+from application.interfaces.term_suggester import TermSuggester
+from application.interfaces.tokenizer import Tokenizer
+from application.services.search_index import get_or_build_user_index
+
+
+@dataclass
+class SuggestTerms:
+    term_suggester: TermSuggester
+    index_repository: SearchIndexRepository
+    index_builder: SearchIndexBuilder
+    tokenizer: Tokenizer
+    post_repository: PostRepository
+
+    def execute(self, prefix: str, user_id: UserId, limit: int = 10) -> List[TermSuggestion]:
+        user_index = get_or_build_user_index(
+            user_id,
+            self.index_repository,
+            self.index_builder,
+            self.post_repository,
+            self.tokenizer,
+        )
+        return self.term_suggester.suggest(prefix, user_index, limit=limit)
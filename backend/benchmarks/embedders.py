@@ -0,0 +1,93 @@
+"""Compare embedding backends on throughput and projection quality.
+
+Each backend embeds the same labelled synthetic posts. Quality is reported
+two ways: how many of each post's 10 nearest neighbours match those under
+the PyTorch model, and how many of its 10 nearest neighbours in the 2-D
+UMAP projection share its topic. Backends whose dependencies are missing
+are skipped. Run from the backend directory:
+
+    python -m benchmarks.embedders
+"""
+import random
+import time
+
+import numpy as np
+
+from infrastructure.sentence_transformer_embedder import SentenceTransformerEmbedder
+from infrastructure.static_token_embedder import StaticTokenEmbedder
+
+TOPICS = {
+    "ai": "model training transformer inference gpu dataset fine-tuning benchmark llm agents",
+    "hiring": "hiring recruiter interview candidate role offer onboarding talent resume team",
+    "marketing": "brand campaign audience funnel conversion content seo engagement launch growth",
+    "finance": "revenue margin funding investors valuation runway profit quarter cash forecast",
+    "climate": "emissions carbon renewable solar grid energy climate sustainability battery net-zero",
+    "leadership": "leadership culture feedback mentoring managers trust vision decisions coaching teams",
+}
+FILLER = "we our this that today really great new thoughts share learned lessons week about".split()
+
+
+def topical_posts(n_posts: int) -> tuple[list[str], np.ndarray]:
+    """Short posts mixing one topic's vocabulary with common filler words."""
+    rng = random.Random(42)
+    names = list(TOPICS)
+    labels = np.array([i % len(names) for i in range(n_posts)])
+    texts = []
+    for label in labels:
+        words = rng.choices(TOPICS[names[label]].split(), k=12) + rng.choices(FILLER, k=10)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return texts, labels
+
+
+def nearest(points: np.ndarray, k: int) -> np.ndarray:
+    points = points / np.maximum(np.linalg.norm(points, axis=1, keepdims=True), 1e-12)
+    similarity = points @ points.T
+    np.fill_diagonal(similarity, -np.inf)
+    return np.argsort(-similarity, axis=1)[:, :k]
+
+
+def neighbour_agreement(embeddings: np.ndarray, reference: np.ndarray, k: int = 10) -> float:
+    ours, theirs = nearest(embeddings, k), nearest(reference, k)
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(ours, theirs)]))
+
+
+def projection_purity(embeddings: np.ndarray, labels: np.ndarray, k: int = 10) -> float:
+    import umap
+
+    coords = umap.UMAP(n_components=2, random_state=42).fit_transform(embeddings)
+    distances = ((coords[:, None, :] - coords[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(distances, np.inf)
+    neighbours = np.argsort(distances, axis=1)[:, :k]
+    return float(np.mean(labels[neighbours] == labels[:, None]))
+
+
+def main(n_posts: int = 2_000, threads: int = 0):
+    texts, labels = topical_posts(n_posts)
+    backends = {
+        "torch": SentenceTransformerEmbedder(threads=threads),
+        "onnx-int8": SentenceTransformerEmbedder(backend="onnx", threads=threads),
+        "static": StaticTokenEmbedder(),
+    }
+    reference = None
+    print(f"{'backend':>10} {'posts/s':>9} {'kNN vs torch':>13} {'2-D purity':>11}")
+    for name, embedder in backends.items():
+        try:
+            embedder.load()
+        except ImportError as e:
+            print(f"{name:>10} skipped: {e}")
+            continue
+        embedder.encode(texts[:32])  # warm up
+        start = time.perf_counter()
+        embeddings = embedder.encode(texts)
+        throughput = len(texts) / (time.perf_counter() - start)
+        if reference is None:
+            reference = embeddings
+        print(
+            f"{name:>10} {throughput:>9.0f} {neighbour_agreement(embeddings, reference):>13.2f} "
+            f"{projection_purity(embeddings, labels):>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
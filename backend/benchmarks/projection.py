@@ -0,0 +1,100 @@
+"""Compare full and landmark projections of large corpora on time, memory and quality.
+
+Posts are the topical synthetic posts of ``benchmarks.embedders``, embedded
+as noisy copies of one centre per topic so no model has to be loaded. Each
+run happens in a fresh process, whose peak resident memory is reported,
+along with how many of each post's 10 nearest neighbours in the 2-D layout
+share its topic. Full fits above ``full_max_posts`` are skipped; UMAP and
+HDBSCAN on 100k posts take a long time. Run from the backend directory:
+
+    python -m benchmarks.projection
+"""
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List
+
+import numpy as np
+
+from application.interfaces.text_embedder import TextEmbedder
+from benchmarks.embedders import topical_posts
+from domain.entities.post import Post, PostId
+from domain.entities.user_id import UserId
+from infrastructure.bertopic_post_projector import BertopicPostProjector
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
+
+
+@dataclass
+class TopicEmbedder(TextEmbedder):
+    """Embeds each post near the centre of its topic."""
+    labels: dict
+    dim: int = 384
+
+    @property
+    def name(self) -> str:
+        return "topic-centres"
+
+    def load(self) -> None:
+        pass
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        centres = np.random.default_rng(42).standard_normal((max(self.labels.values()) + 1, self.dim))
+        labels = np.array([self.labels[text] for text in texts])
+        return (centres[labels] + 0.8 * rng.standard_normal((len(texts), self.dim))).astype(np.float32)
+
+
+def run(n_posts: int, landmarks: bool) -> tuple:
+    texts, labels = topical_posts(n_posts)
+    posts = [
+        Post(
+            author="", profileUrl="", authorImage="", authorHeadline="", timestamp="", text=text,
+            postUrl="", meta={}, postImage="", userId=UserId("bench"), id=PostId(str(i)),
+        )
+        for i, text in enumerate(texts)
+    ]
+    analyzer = NltkTextAnalyzer()
+    projector = BertopicPostProjector(
+        embedder=TopicEmbedder(labels={" ".join(analyzer.content_tokens(t)): label for t, label in zip(texts, labels)}),
+        analyzer=analyzer,
+        landmark_threshold=1_000 if landmarks else n_posts,
+        minibatch_threshold=10_000 if landmarks else n_posts,
+    )
+    projector.warm_up()
+    # Compile UMAP's numba code outside the timing, on another user's posts
+    warm_up_posts = [replace(post, userId=UserId("warm-up")) for post in posts[:1_500]]
+    projector.project(warm_up_posts)
+
+    start = time.perf_counter()
+    projections = projector.project(posts)
+    seconds = time.perf_counter() - start
+
+    coords = np.array([(p.x, p.y) for p in projections])
+    sample = np.random.default_rng(0).choice(len(coords), size=min(len(coords), 2_000), replace=False)
+    distances = ((coords[sample, None, :] - coords[None, :, :]) ** 2).sum(axis=2)
+    distances[np.arange(len(sample)), sample] = np.inf
+    neighbours = np.argpartition(distances, 10, axis=1)[:, :10]
+    purity = float(np.mean(labels[neighbours] == labels[sample, None]))
+    topics = len({p.topic_id for p in projections})
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return seconds, peak_mb, purity, topics
+
+
+def main(sizes=(1_000, 10_000, 100_000), full_max_posts: int = 10_000):
+    print(f"{'posts':>8} {'mode':>9} {'seconds':>8} {'peak MB':>8} {'10-NN purity':>13} {'topics':>7}")
+    for n_posts in sizes:
+        for landmarks in (False, True):
+            mode = "landmark" if landmarks else "full"
+            if not landmarks and n_posts > full_max_posts:
+                print(f"{n_posts:>8} {mode:>9} skipped")
+                continue
+            # A fresh process per run, so peak memory is the run's own
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                seconds, peak_mb, purity, topics = pool.submit(run, n_posts, landmarks).result()
+            print(f"{n_posts:>8} {mode:>9} {seconds:>8.1f} {peak_mb:>8.0f} {purity:>13.2f} {topics:>7}")
+
+
+if __name__ == "__main__":
+    main()
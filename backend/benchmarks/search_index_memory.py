@@ -0,0 +1,43 @@
+"""Compare search index memory against the legacy set-of-strings layout.
+
+Run from the backend directory:
+
+    python -m benchmarks.search_index_memory
+"""
+import random
+from itertools import accumulate
+from uuid import uuid4
+
+from domain.entities.search import Post
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_memory import memory_report
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+def synthetic_posts(n_posts: int, vocabulary_size: int = 20_000, words_per_post: int = 80) -> list[Post]:
+    """Posts with Zipf-distributed vocabulary, mimicking natural text."""
+    rng = random.Random(42)
+    vocabulary = [f"term{i}" for i in range(vocabulary_size)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(vocabulary_size)))
+    return [
+        Post(id=uuid4().hex, text=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=words_per_post)))
+        for _ in range(n_posts)
+    ]
+
+
+def main():
+    builder = InMemorySearchIndexBuilder()
+    tokenizer = SimpleTokenizer()
+    print(f"{'posts':>8} {'tokens':>8} {'postings':>10} {'legacy B/post':>14} {'compact B/post':>15} {'ratio':>6}")
+    for n_posts in (1_000, 5_000, 20_000):
+        index = builder.build_index(synthetic_posts(n_posts), tokenizer)
+        report = memory_report(index)
+        print(
+            f"{report.n_posts:>8} {report.n_tokens:>8} {report.n_postings:>10} "
+            f"{report.legacy_bytes_per_post:>14.0f} {report.compact_bytes_per_post:>15.0f} "
+            f"{report.savings_ratio:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
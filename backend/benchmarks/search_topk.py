@@ -0,0 +1,51 @@
+"""Compare paged lookup latency with and without MaxScore top-k pruning.
+
+Both lookups run the same queries over the same index and must return the
+same page. Run from the backend directory:
+
+    python -m benchmarks.search_topk
+"""
+import random
+import time
+
+from benchmarks.search_index_memory import synthetic_posts
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+def sample_queries(n_queries: int, vocabulary_size: int = 20_000) -> list[str]:
+    """Free-text queries mixing frequent and rare terms."""
+    rng = random.Random(7)
+    queries = []
+    for _ in range(n_queries):
+        frequent = [f"term{rng.randrange(50)}" for _ in range(rng.randint(1, 2))]
+        rare = [f"term{rng.randrange(50, vocabulary_size)}" for _ in range(rng.randint(1, 2))]
+        queries.append(" ".join(frequent + rare))
+    return queries
+
+
+def mean_latency_ms(lookup: SimpleSearchIndexLookup, index, queries: list[str], limit: int) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        lookup.lookup(query, index, limit=limit)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main(limit: int = 20, n_queries: int = 50):
+    tokenizer = SimpleTokenizer()
+    exhaustive = SimpleSearchIndexLookup(tokenizer=tokenizer, top_k_pruning=False)
+    pruned = SimpleSearchIndexLookup(tokenizer=tokenizer)
+    queries = sample_queries(n_queries)
+    print(f"{'posts':>8} {'exhaustive ms':>14} {'top-k ms':>9} {'speedup':>8}")
+    for n_posts in (1_000, 10_000, 50_000, 100_000):
+        index = InMemorySearchIndexBuilder().build_index(synthetic_posts(n_posts), tokenizer)
+        for query in queries:
+            assert pruned.lookup(query, index, limit=limit) == exhaustive.lookup(query, index, limit=limit), query
+        slow = mean_latency_ms(exhaustive, index, queries, limit)
+        fast = mean_latency_ms(pruned, index, queries, limit)
+        print(f"{n_posts:>8} {slow:>14.2f} {fast:>9.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
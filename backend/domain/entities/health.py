@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import Dict, Literal
+
+
+ModelState = Literal["cold", "loading", "ready", "failed"]
+
+
+@dataclass(frozen=True)
+class Readiness:
+    ready: bool
+    models: Dict[str, ModelState]
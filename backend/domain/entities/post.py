@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import NewType, Optional
 
+from domain.entities.search import Facets
 from domain.entities.user_id import UserId
 
 
@@ -22,6 +23,12 @@ class Post:
     id: PostId
 
 
+@dataclass(frozen=True)
+class PostsResponse:
+    posts: list[Post]
+    facets: Facets  # counts over the returned posts
+
+
 @dataclass(frozen=True)
 class KeywordRelevance:
     keyword: str
@@ -34,3 +41,20 @@ class PostProjection:
     x: float
     y: float
     keywords: list[KeywordRelevance]
+    topic_id: Optional[int] = None  # None before topics are fitted; -1 for posts outside every topic
+
+
+@dataclass(frozen=True)
+class ProjectionTopic:
+    id: int
+    keywords: list[KeywordRelevance]
+
+
+@dataclass(frozen=True)
+class ProjectionTable:
+    """Projections as parallel columns, with each topic's keywords listed once."""
+    topics: list[ProjectionTopic]
+    post_id: list[PostId]
+    x: list[float]
+    y: list[float]
+    topic_id: list[Optional[int]]
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional
+
+from domain.entities.post import PostProjection
+
+
+JobStatus = Literal["pending", "running", "done", "failed"]
+# "timeout": the refined projection missed its budget, so the preview is final for this request
+ProjectionStage = Literal["preview", "refined", "timeout", "failed"]
+
+
+@dataclass(frozen=True)
+class ProjectionJob:
+    id: str
+    generation: int  # search index generation of the posts being projected
+    status: JobStatus
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ProjectionUpdate:
+    stage: ProjectionStage
+    job: ProjectionJob  # the refined projection's job, which keeps running after a timeout
+    projections: List[PostProjection] = field(default_factory=list)
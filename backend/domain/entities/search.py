@@ -1,12 +1,47 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional
 
 @dataclass(frozen=True)
 class Post:
     id: str
     text: str
+    author: str = ""
+    timestamp: str = ""
+
+@dataclass(frozen=True)
+class PostFilter:
+    authors: tuple[str, ...] = ()  # exact author names; a post matches any of them
+    since: Optional[date] = None  # inclusive
+    until: Optional[date] = None  # inclusive
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.authors and self.since is None and self.until is None
+
+@dataclass(frozen=True)
+class Facets:
+    authors: dict[str, int] = field(default_factory=dict)  # author -> matching posts, most first
+    months: dict[str, int] = field(default_factory=dict)  # "YYYY-MM" -> matching posts, oldest first
 
 @dataclass(frozen=True)
 class SearchResult:
     post_id: str
     score: float
     snippet: str
+    post: Optional[dict[str, Any]] = None  # requested fields of the post, when hydrated
+    highlights: list[tuple[int, int]] = field(default_factory=list)  # (start, end) query term spans in ``snippet``
+
+@dataclass(frozen=True)
+class SearchResponse:
+    results: list[SearchResult]
+    total: int
+    expansions: dict[str, list[str]] = field(default_factory=dict)  # query term -> fuzzy matches used
+    total_capped: bool = False  # ``total`` counts only the candidates ranked so far; more posts match
+    next_cursor: Optional[str] = None  # pass back as ``cursor`` for the following page
+    facets: Facets = field(default_factory=Facets)  # counts over all matching posts
+
+@dataclass(frozen=True)
+class TermSuggestion:
+    term: str
+    doc_freq: int
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Dict
+
+from domain.entities.post import KeywordRelevance, PostId
+
+
+@dataclass(frozen=True)
+class TopicSummary:
+    id: int  # -1 gathers the posts outside every topic
+    keywords: list[KeywordRelevance]
+    size: int
+
+
+@dataclass(frozen=True)
+class Topic:
+    id: int
+    keywords: list[KeywordRelevance]
+    post_ids: list[PostId]
+    representative_post_ids: list[PostId]  # the posts that best represent the topic, best first
+
+    @property
+    def summary(self) -> TopicSummary:
+        return TopicSummary(id=self.id, keywords=self.keywords, size=len(self.post_ids))
+
+
+@dataclass(frozen=True)
+class UserTopics:
+    """The topics of a user's fitted projection at one search index generation."""
+    generation: int
+    topics: Dict[int, Topic]
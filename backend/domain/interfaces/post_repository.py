@@ -26,3 +26,6 @@ class PostRepository:
 
     def add_posts(self, posts: list[Post]) -> None:
         pass
+
+    def remove_posts(self, user_id: UserId, post_ids: list[PostId]) -> list[PostId]:
+        pass
@@ -1,27 +1,46 @@
-from dataclasses import dataclass, field
-import re
-from typing import List
-from hashlib import sha256
-
-from bertopic import BERTopic
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer
-import umap
-
-from domain.entities.post import Post, PostProjection, KeywordRelevance
+from domain.entities.post import Post, PostId, PostProjection, KeywordRelevance
+from domain.entities.user_id import UserId
 from application.interfaces.post_projector import PostProjector
 
 
 import math
-import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from hashlib import sha256
-from typing import List
-
-import umap
-from bertopic import BERTopic
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer
+from threading import Lock, RLock
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.health import ModelState
+from domain.entities.topic import Topic
+from application.interfaces.embedding_store import EmbeddingStore
+from application.interfaces.fitted_topics import FittedTopics
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.text_analyzer import TextAnalyzer
+from application.interfaces.text_embedder import TextEmbedder
+from application.interfaces.vector_index import VectorIndex
+from application.interfaces.warm_up import WarmUp
+from application.services.embedding_cache import cached_embeddings, stored_embeddings
+from application.services.layout_alignment import procrustes_alignment
+from infrastructure.landmark_umap import LandmarkUMAP
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
+from infrastructure.sentence_transformer_embedder import SentenceTransformerEmbedder
+
+# Importing these takes seconds and hundreds of MB, so it waits for the
+# first projection; see _import_topic_modelling
+BERTopic = None
+umap = None
+hdbscan_delegator = None
+
+
+def _import_topic_modelling() -> None:
+    global BERTopic, umap, hdbscan_delegator
+    if BERTopic is None:
+        from bertopic import BERTopic
+    if umap is None:
+        import umap
+    if hdbscan_delegator is None:
+        from bertopic.cluster._utils import hdbscan_delegator
 
 
 # @dataclass
@@ -95,13 +114,93 @@ from sentence_transformers import SentenceTransformer
 #         return projections
 
 @dataclass
-class BertopicPostProjector(PostProjector):
-    embedder: SentenceTransformer = SentenceTransformer("all-MiniLM-L6-v2")
+class _UserProjection:
+    """Models of a user's last full fit, with every post projected since."""
+    topic_model: "BERTopic"
+    fitted_size: int
+    texts: Dict[PostId, str]  # preprocessed text of each projected post
+    projections: Dict[PostId, PostProjection]
+    changes: int = 0  # posts placed, edited or removed since the fit
+    outliers: int = 0  # placed posts that matched no topic
+    # (matrix, offset) taking the fit's UMAP coordinates onto the layout before it
+    alignment: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+@dataclass
+class BertopicPostProjector(PostProjector, PostEmbedder, WarmUp, FittedTopics):
+    # Loads its model on first use, or on ``warm_up``
+    embedder: TextEmbedder = field(default_factory=SentenceTransformerEmbedder)
     umap_n_components: int = 2
-    _cache: dict[str, List[PostProjection]] = field(default_factory=dict, init=False, repr=False)
+    # Posts are embedded without URLs and stopwords
+    analyzer: TextAnalyzer = field(default_factory=NltkTextAnalyzer)
+    # Receives the embeddings computed for projections so semantic search can reuse them
+    vector_index: Optional[VectorIndex] = None
+    # Post embeddings are looked up here by text, so only new or edited posts are encoded
+    embedding_store: Optional[EmbeddingStore] = None
+    # Share of the fitted corpus that may change, or be placed outside every topic, before a refit
+    refit_growth: float = 0.25
+    refit_drift: float = 0.1
+    # Fits of more posts than landmark_threshold run UMAP on a sample of ``landmarks``
+    # posts and place the rest with transform, transform_chunk_size at a time
+    landmark_threshold: int = 5000
+    landmarks: int = 2000
+    transform_chunk_size: int = 4096
+    # Fits of more posts than minibatch_threshold cluster them into minibatch_clusters
+    # topics with mini-batch k-means instead of HDBSCAN
+    minibatch_threshold: int = 20000
+    minibatch_clusters: int = 50
+    # "deterministic" seeds UMAP, which keeps it on one thread. "fast" drops the seed so
+    # UMAP runs on n_jobs threads, with numba_threads for numba (0 keeps its default of
+    # every core); each refit starts from the previous layout and is aligned to it, so
+    # posts stay roughly in place
+    umap_mode: Literal["deterministic", "fast"] = "deterministic"
+    n_jobs: int = -1
+    numba_threads: int = 0
+    # Fitted models are kept for the max_users users who projected last; the others
+    # get a full fit on their next projection
+    max_users: int = 64
+    # Whether warm_up imports BERTopic and UMAP too; a process that only embeds
+    # posts and queries loads the embedder alone and reports ready once it has
+    warm_up_topic_modelling: bool = True
+    _states: "OrderedDict[UserId, _UserProjection]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False)
+    _load_lock: Lock = field(default_factory=Lock, init=False, repr=False)
+    _model_state: ModelState = field(default="cold", init=False, repr=False)
+    _embedder_loaded: bool = field(default=False, init=False, repr=False)
+    _topic_modelling_loaded: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self):
-        self.languages: List[str] | None = None
+        if self.umap_mode not in ("deterministic", "fast"):
+            raise ValueError(f"Unknown UMAP mode '{self.umap_mode}'")
+
+    def warm_up(self) -> None:
+        self._load(topic_modelling=self.warm_up_topic_modelling)
+
+    def model_state(self) -> ModelState:
+        return self._model_state
+
+    def _load(self, topic_modelling: bool) -> None:
+        """Load the embedder, and BERTopic and UMAP if asked for, on first use."""
+        if self._embedder_loaded and (self._topic_modelling_loaded or not topic_modelling):
+            return
+        with self._load_lock:
+            self._model_state = "loading"
+            try:
+                self.embedder.load()
+                self._embedder_loaded = True
+                if topic_modelling:
+                    _import_topic_modelling()
+                    if self.umap_mode == "fast" and self.numba_threads > 0:
+                        import numba  # already loaded by UMAP
+
+                        numba.set_num_threads(self.numba_threads)
+                    self._topic_modelling_loaded = True
+            except Exception:
+                self._model_state = "failed"
+                raise
+            # Until BERTopic and UMAP are in too, only semantic search is warm
+            warm = self._topic_modelling_loaded or not self.warm_up_topic_modelling
+            self._model_state = "ready" if warm else "cold"
 
     def _compute_n_neighbors(self, n_posts: int) -> int:
         """
@@ -124,83 +223,225 @@ class BertopicPostProjector(PostProjector):
             return 5
         return 8
 
-    @staticmethod
-    def _compute_stopwords(languages: list[str] | None) -> set[str]:
-        all_stopwords = set()
-        langs = languages if languages is not None else stopwords.fileids()
-        for lang in langs:
-            try:
-                all_stopwords.update(stopwords.words(lang))
-            except OSError:
-                raise ValueError(
-                    f"Stopwords for language '{lang}' not found in NLTK corpus."
-                )
-        return all_stopwords
-
     def preprocess_text(self, text: str) -> str:
-        text = text.lower()
-        text = re.sub(r"https?://\S+|www\.\S+", "", text)
-        stop_words = self._compute_stopwords(self.languages)
-        return " ".join(word for word in text.split() if word not in stop_words)
+        return " ".join(self.analyzer.content_tokens(text))
 
-    def _cache_key(self, posts: List[Post], n_neighbors: int) -> str:
-        """
-        Generate a cache key based on post IDs and UMAP configuration.
-        """
-        post_ids = "-".join(sorted(str(post.id) for post in posts))
-        key_str = (
-            f"{post_ids}"
-            f"-umap{self.umap_n_components}"
-            f"-neighbors{n_neighbors}"
-        )
-        return sha256(key_str.encode("utf-8")).hexdigest()
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        self._load(topic_modelling=False)
+        return np.asarray(self.embedder.encode(texts), dtype=np.float32)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed preprocessed post texts, reusing the stored embeddings of texts seen before."""
+        if self.embedding_store is None:
+            return self._encode(texts)
+        return cached_embeddings(texts, self.embedder.name, self._encode, self.embedding_store)
+
+    def embed_posts(self, posts: List[Post]) -> np.ndarray:
+        return self._embed([self.preprocess_text(post.text) for post in posts])
+
+    def stored_post_embeddings(self, posts: List[Post]) -> Tuple[List[int], np.ndarray]:
+        if self.embedding_store is None:
+            return [], np.empty((0, 0), dtype=np.float32)
+        texts = [self.preprocess_text(post.text) for post in posts]
+        return stored_embeddings(texts, self.embedder.name, self.embedding_store)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        # Queries are one-off, so they are not worth a row in the store
+        return self._encode([self.preprocess_text(query)])[0]
 
     def project(self, posts: List[Post]) -> List[PostProjection]:
+        """Project the user's posts, placing new ones on the last fit when possible.
+
+        Posts added, edited or removed since the last full fit are placed with
+        the fitted UMAP and topic model, so every other post keeps its
+        coordinates. The models are refit once those changes exceed
+        ``refit_growth`` of the fitted corpus, or once the placed posts that
+        match no topic exceed ``refit_drift`` of it.
+        """
         if not posts:
             return []
 
-        n_neighbors = self._compute_n_neighbors(len(posts))
+        user_id = posts[0].userId
+        texts = {post.id: self.preprocess_text(post.text) for post in posts}
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is not None:
+                self._states.move_to_end(user_id)
+                new_ids = [post_id for post_id, text in texts.items() if state.texts.get(post_id) != text]
+                removed = [post_id for post_id in state.texts if post_id not in texts]
+                if state.changes + len(new_ids) + len(removed) <= self.refit_growth * state.fitted_size:
+                    self._place(state, user_id, new_ids, texts, removed)
+                    if state.outliers <= self.refit_drift * state.fitted_size:
+                        return [state.projections[post.id] for post in posts]
+
+            state = self._states[user_id] = self._fit(user_id, texts, previous=state)
+            self._states.move_to_end(user_id)
+            while len(self._states) > self.max_users:
+                self._states.popitem(last=False)
+            return [state.projections[post.id] for post in posts]
+
+    def fitted_topics(self, user_id: UserId) -> Optional[Dict[int, Topic]]:
+        """The topics of the user's last fit, with the posts placed on it since."""
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                return None
+            members: Dict[int, List[PostId]] = {}
+            for post_id, projection in state.projections.items():
+                members.setdefault(projection.topic_id, []).append(post_id)
+            # BERTopic keeps representative documents as text; posts sharing a text share a document
+            post_by_text: Dict[str, PostId] = {}
+            for post_id, text in state.texts.items():
+                post_by_text.setdefault(text, post_id)
+            return {
+                topic_id: Topic(
+                    id=topic_id,
+                    keywords=state.projections[post_ids[0]].keywords,
+                    post_ids=post_ids,
+                    representative_post_ids=[
+                        post_by_text[doc]
+                        for doc in state.topic_model.get_representative_docs(topic_id) or []
+                        if doc in post_by_text
+                    ],
+                )
+                for topic_id, post_ids in members.items()
+            }
+
+    def _fit(
+        self, user_id: UserId, texts: Dict[PostId, str], previous: Optional[_UserProjection] = None
+    ) -> _UserProjection:
+        self._load(topic_modelling=True)
+        post_ids, docs = list(texts), list(texts.values())
 
-        cache_key = self._cache_key(posts, n_neighbors)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        # Encode embeddings
+        embeddings = self._embed(docs)
+        if self.vector_index is not None:
+            self.vector_index.add(user_id, post_ids, embeddings)
 
         # Build UMAP dynamically
+        large = len(docs) > self.landmark_threshold
+        if self.umap_mode == "fast":
+            umap_settings = {"random_state": None, "n_jobs": self.n_jobs}
+            if previous is not None and not large and self.umap_n_components == 2:
+                umap_settings["init"] = self._previous_layout(previous, post_ids, embeddings)
+        else:
+            umap_settings = {"random_state": 42}
         umap_model = umap.UMAP(
             n_components=self.umap_n_components,
-            n_neighbors=n_neighbors,
-            random_state=42,
+            n_neighbors=self._compute_n_neighbors(min(len(docs), self.landmarks) if large else len(docs)),
+            **umap_settings,
         )
+        if large:
+            umap_model = LandmarkUMAP(umap_model, n_landmarks=self.landmarks, chunk_size=self.transform_chunk_size)
 
-        topic_model = BERTopic(umap_model=umap_model)
-
-        # Preprocess texts
-        texts = [self.preprocess_text(post.text) for post in posts]
-
-        # Encode embeddings
-        embeddings = self.embedder.encode(texts, convert_to_numpy=True)
+        topic_model = BERTopic(umap_model=umap_model, **self._clustering(len(docs)))
 
         # Fit topic model
-        topics, probs = topic_model.fit_transform(texts, embeddings=embeddings)
+        topics, probs = topic_model.fit_transform(docs, embeddings=embeddings)
 
         # Retrieve reduced embeddings
         umap_embeddings = topic_model.umap_model.embedding_
+        alignment = None
+        if self.umap_mode == "fast" and previous is not None:
+            alignment = self._alignment(previous, post_ids, umap_embeddings)
+        umap_embeddings = self._aligned(alignment, umap_embeddings)
+
+        return _UserProjection(
+            topic_model=topic_model,
+            fitted_size=len(docs),
+            texts=dict(texts),
+            projections={
+                post_id: self._projection(topic_model, post_id, topic_id, coords)
+                for post_id, topic_id, coords in zip(post_ids, topics, umap_embeddings)
+            },
+            alignment=alignment,
+        )
 
-        projections: List[PostProjection] = []
-        for post, topic_id, coords in zip(posts, topics, umap_embeddings):
-            keywords = topic_model.get_topic(topic_id) or []
-            kw_objs = [
-                KeywordRelevance(keyword=k, score=s) for k, s in keywords
-            ]
-
-            projections.append(
-                PostProjection(
-                    post_id=post.id,
-                    x=float(coords[0]),
-                    y=float(coords[1]),
-                    keywords=kw_objs,
-                )
+    def _previous_layout(self, previous: _UserProjection, post_ids: List[PostId], embeddings: np.ndarray) -> np.ndarray:
+        """Where the previous fit has or would have placed each post, to start an unseeded UMAP from."""
+        layout = np.empty((len(post_ids), 2))
+        new = [i for i, post_id in enumerate(post_ids) if post_id not in previous.projections]
+        for i, post_id in enumerate(post_ids):
+            if post_id in previous.projections:
+                layout[i] = previous.projections[post_id].x, previous.projections[post_id].y
+        if new:
+            placed = previous.topic_model.umap_model.transform(embeddings[new])
+            layout[new] = self._aligned(previous.alignment, placed)[:, :2]
+        return layout
+
+    @staticmethod
+    def _alignment(
+        previous: _UserProjection, post_ids: List[PostId], coords: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Rotate, scale and shift an unseeded fit onto the previous layout of the posts both share."""
+        shared = [i for i, post_id in enumerate(post_ids) if post_id in previous.projections]
+        if len(shared) < 3:
+            return None
+        target = np.array([
+            (previous.projections[post_ids[i]].x, previous.projections[post_ids[i]].y) for i in shared
+        ])
+        return procrustes_alignment(np.asarray(coords)[shared, :2], target)
+
+    @staticmethod
+    def _aligned(alignment: Optional[Tuple[np.ndarray, np.ndarray]], coords) -> np.ndarray:
+        coords = np.array(coords, dtype=np.float64)
+        if alignment is not None:
+            matrix, offset = alignment
+            coords[:, :2] = coords[:, :2] @ matrix + offset
+        return coords
+
+    def _clustering(self, n_posts: int) -> dict:
+        """BERTopic's clustering arguments: its default HDBSCAN, or mini-batch k-means for large fits."""
+        if n_posts <= self.minibatch_threshold:
+            return {}
+        from sklearn.cluster import MiniBatchKMeans  # loaded with BERTopic, which depends on it
+
+        return {
+            "hdbscan_model": MiniBatchKMeans(
+                n_clusters=min(self.minibatch_clusters, n_posts), n_init=3, random_state=42
             )
+        }
+
+    def _place(
+        self,
+        state: _UserProjection,
+        user_id: UserId,
+        new_ids: List[PostId],
+        texts: Dict[PostId, str],
+        removed: List[PostId],
+    ) -> None:
+        for post_id in removed:
+            del state.texts[post_id]
+            del state.projections[post_id]
+        state.changes += len(new_ids) + len(removed)
+        if not new_ids:
+            return
+
+        docs = [texts[post_id] for post_id in new_ids]
+        embeddings = self._embed(docs)
+        if self.vector_index is not None:
+            self.vector_index.add(user_id, new_ids, embeddings)
+        # topic_model.transform would run UMAP again, so the posts are reduced
+        # once and the reduction is clustered here, as BERTopic clusters it
+        reduced = state.topic_model.umap_model.transform(embeddings)
+        coords = self._aligned(state.alignment, reduced)
+        predictions, _ = hdbscan_delegator(state.topic_model.hdbscan_model, "approximate_predict", reduced)
+        topics = state.topic_model._map_predictions(predictions)
+        for post_id, doc, topic_id, xy in zip(new_ids, docs, topics, coords):
+            state.texts[post_id] = doc
+            state.projections[post_id] = self._projection(state.topic_model, post_id, topic_id, xy)
+            state.outliers += int(topic_id == -1)
 
-        self._cache[cache_key] = projections
-        return projections
+    @staticmethod
+    def _projection(topic_model: "BERTopic", post_id: PostId, topic_id: int, coords) -> PostProjection:
+        keywords = topic_model.get_topic(topic_id) or []
+        kw_objs = [
+            KeywordRelevance(keyword=k, score=s) for k, s in keywords
+        ]
+        return PostProjection(
+            post_id=post_id,
+            x=float(coords[0]),
+            y=float(coords[1]),
+            keywords=kw_objs,
+            topic_id=int(topic_id),
+        )
@@ -1,17 +1,35 @@
+import json
 from abc import ABC, abstractmethod
-from fastapi import Depends
-from typing import List
+from fastapi import Depends, Header, HTTPException, Path, Query
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, AsyncIterator, Optional
 from dataclasses import dataclass
 
 from domain.entities.user_id import UserId
-from domain.entities.post import PostProjection
+from domain.entities.projection_job import ProjectionJob, ProjectionUpdate
+from application.services.projection_table import projection_table
 from application.use_cases.compute_projection import ComputeProjection
 from infrastructure.fastapi.common import get_anonymous_user
+from infrastructure.fastapi.projection_encoding import JSON, encode_table, negotiate
 
 
 class ComputeProjectionAPIBase(ABC):
     @abstractmethod
-    async def compute_projection(self, user_id: UserId) -> List[PostProjection]:
+    async def compute_projection(self, user_id: UserId) -> ProjectionJob:
+        pass
+
+    @abstractmethod
+    async def compute_projection_stream(self, user_id: UserId, columnar: bool) -> StreamingResponse:
+        pass
+
+    @abstractmethod
+    async def projection_job(self, user_id: UserId, job_id: str) -> ProjectionJob:
+        pass
+
+    @abstractmethod
+    async def projection_result(self, user_id: UserId, job_id: str, columnar: bool, accept: Optional[str]) -> Any:
         pass
 
 
@@ -19,6 +37,58 @@ class ComputeProjectionAPIBase(ABC):
 class ComputeProjectionAPIImpl(ComputeProjectionAPIBase):
     compute_projection_use_case: ComputeProjection
 
-    async def compute_projection(self, user_id: UserId = Depends(get_anonymous_user)) -> List[PostProjection]:
-        projections = self.compute_projection_use_case.compute(user_id=user_id)
-        return projections
+    async def compute_projection(self, user_id: UserId = Depends(get_anonymous_user)) -> ProjectionJob:
+        # Building a missing search index to read the generation can take a while
+        return await run_in_threadpool(self.compute_projection_use_case.submit, user_id=user_id)
+
+    async def compute_projection_stream(
+        self, user_id: UserId = Depends(get_anonymous_user), columnar: bool = Query(False)
+    ) -> StreamingResponse:
+        # Server-Sent Events: a "preview" layout of the posts already embedded, then "refined", "timeout" or "failed"
+        updates = iterate_in_threadpool(self.compute_projection_use_case.progressive(user_id=user_id))
+        return StreamingResponse(
+            self._events(updates, columnar),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @staticmethod
+    async def _events(updates: AsyncIterator[ProjectionUpdate], columnar: bool) -> AsyncIterator[str]:
+        async for update in updates:
+            data = jsonable_encoder(update)
+            if columnar:
+                data["projections"] = jsonable_encoder(projection_table(update.projections))
+            yield f"event: {update.stage}\ndata: {json.dumps(data)}\n\n"
+
+    async def projection_job(
+        self, user_id: UserId = Depends(get_anonymous_user), job_id: str = Path(...)
+    ) -> ProjectionJob:
+        job = self.compute_projection_use_case.job(user_id=user_id, job_id=job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Projection job not found")
+        return job
+
+    async def projection_result(
+        self,
+        user_id: UserId = Depends(get_anonymous_user),
+        job_id: str = Path(...),
+        columnar: bool = Query(False),
+        accept: Optional[str] = Header(None),
+    ) -> Any:
+        # JSON keeps the list of projections unless ``columnar`` asks for the table;
+        # MessagePack and Arrow only carry the table
+        media_type = negotiate(accept)
+        if media_type is None:
+            raise HTTPException(status_code=406, detail="Projections are served as JSON, MessagePack or Arrow IPC")
+        job = await self.projection_job(user_id=user_id, job_id=job_id)
+        if job.status == "failed":
+            raise HTTPException(status_code=500, detail=f"Projection job failed: {job.error}")
+        if job.status != "done":
+            raise HTTPException(status_code=409, detail=f"Projection job is {job.status}")
+        projections = self.compute_projection_use_case.result(user_id=user_id, job_id=job_id)
+        if media_type == JSON and not columnar:
+            return projections
+        table = projection_table(projections)
+        if media_type == JSON:
+            return table
+        return Response(content=encode_table(table, media_type), media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import List
+from dataclasses import dataclass
+
+from fastapi import BackgroundTasks, Depends, Path, Query
+
+from application.use_cases.delete_posts import DeletePostsUseCase
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+from infrastructure.fastapi.common import get_anonymous_user
+
+
+class DeletePostsAPIBase(ABC):
+    @abstractmethod
+    async def delete_posts(self, background_tasks: BackgroundTasks, user_id: UserId, ids: List[PostId]) -> List[PostId]:
+        pass
+
+    @abstractmethod
+    async def delete_post(self, background_tasks: BackgroundTasks, user_id: UserId, id: PostId) -> List[PostId]:
+        pass
+
+
+@dataclass
+class DeletePostsAPIImpl(DeletePostsAPIBase):
+    delete_posts_use_case: DeletePostsUseCase
+
+    async def delete_posts(
+        self,
+        background_tasks: BackgroundTasks,
+        user_id: UserId = Depends(get_anonymous_user),
+        ids: List[PostId] = Query(...),
+    ) -> List[PostId]:
+        removed = self.delete_posts_use_case.execute(user_id=user_id, post_ids=ids)
+        # Tombstones make the delete visible immediately; compaction runs after the response
+        background_tasks.add_task(self.delete_posts_use_case.compact, user_id)
+        return removed
+
+    async def delete_post(
+        self,
+        background_tasks: BackgroundTasks,
+        user_id: UserId = Depends(get_anonymous_user),
+        id: PostId = Path(...),
+    ) -> List[PostId]:
+        return await self.delete_posts(background_tasks, user_id=user_id, ids=[id])
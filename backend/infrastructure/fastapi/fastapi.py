@@ -1,14 +1,20 @@
 from dataclasses import dataclass
+from typing import AsyncContextManager, Callable, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from infrastructure.fastapi.get_most_popular_authors_api import GetPopularAuthorsAPIBase
 from infrastructure.fastapi.search_posts_api import SearchPostsAPIBase
+from infrastructure.fastapi.suggest_terms_api import SuggestTermsAPIBase
+from infrastructure.fastapi.semantic_search_posts_api import SemanticSearchPostsAPIBase
 from infrastructure.fastapi.compute_projection_api import ComputeProjectionAPIBase
 from infrastructure.fastapi.compute_word_cloud_api import ComputeWordCloudAPIBase
 from infrastructure.fastapi.save_posts_api import SavePostsAPIBase
 from infrastructure.fastapi.get_posts_api import GetPostsAPIBase
+from infrastructure.fastapi.delete_posts_api import DeletePostsAPIBase
+from infrastructure.fastapi.get_topics_api import GetTopicsAPIBase
+from infrastructure.fastapi.health_api import HealthAPIBase
 from typing import Any
 
 
@@ -16,10 +22,17 @@ from typing import Any
 class AppBuilder:
     get_popular_authors_api: GetPopularAuthorsAPIBase = None
     search_posts_api: SearchPostsAPIBase = None
+    suggest_terms_api: SuggestTermsAPIBase = None
+    semantic_search_posts_api: SemanticSearchPostsAPIBase = None
     compute_projection_api: ComputeProjectionAPIBase = None
     compute_word_cloud_api: ComputeWordCloudAPIBase = None
     save_posts_api: SavePostsAPIBase = None
     get_posts_api: GetPostsAPIBase = None
+    delete_posts_api: DeletePostsAPIBase = None
+    get_topics_api: GetTopicsAPIBase = None
+    health_api: HealthAPIBase = None
+    # Starts and stops what the app runs beside its routes, such as model warm-ups
+    lifespan: Optional[Callable[[FastAPI], AsyncContextManager[None]]] = None
 
     def register_popular_authors_routes(self, app: FastAPI):
         """Register popular authors routes."""
@@ -27,9 +40,24 @@ class AppBuilder:
 
     def register_search_posts_routes(self, app: FastAPI):
         app.get("/search")(self.search_posts_api.search_posts)
+        app.get("/search/cache")(self.search_posts_api.search_cache_stats)
+
+    def register_suggest_terms_routes(self, app: FastAPI):
+        app.get("/search/suggest")(self.suggest_terms_api.suggest_terms)
+
+    def register_semantic_search_posts_routes(self, app: FastAPI):
+        app.get("/search/semantic")(self.semantic_search_posts_api.semantic_search_posts)
 
     def register_projection_routes(self, app: FastAPI):
-        app.get("/projection")(self.compute_projection_api.compute_projection)
+        app.get("/projection", status_code=202)(self.compute_projection_api.compute_projection)
+        app.get("/projection/stream")(self.compute_projection_api.compute_projection_stream)
+        app.get("/projection/jobs/{job_id}")(self.compute_projection_api.projection_job)
+        app.get("/projection/jobs/{job_id}/result")(self.compute_projection_api.projection_result)
+
+    def register_topics_routes(self, app: FastAPI):
+        app.get("/topics")(self.get_topics_api.get_topics)
+        app.get("/topics/{topic_id}/posts")(self.get_topics_api.get_topic_posts)
+        app.get("/topics/{topic_id}/representative")(self.get_topics_api.get_representative_posts)
 
     def register_word_cloud_routes(self, app: FastAPI):
         app.get("/wordcloud")(self.compute_word_cloud_api.compute_word_cloud)
@@ -43,10 +71,18 @@ class AppBuilder:
     def register_get_posts_routes(self, app: FastAPI):
         app.get("/users/me/posts")(self.get_posts_api.get_posts)
 
+    def register_delete_posts_routes(self, app: FastAPI):
+        app.delete("/users/me/posts")(self.delete_posts_api.delete_posts)
+        app.delete("/users/me/posts/{id}")(self.delete_posts_api.delete_post)
+
+    def register_health_routes(self, app: FastAPI):
+        app.get("/healthz")(self.health_api.healthz)
+        app.get("/readyz")(self.health_api.readyz)
+
     def create_app(self) -> FastAPI:
         """Create and configure the FastAPI app with the given agent caller use case."""
         # Create the FastAPI instance
-        app = FastAPI(title="LinkedIn Saved Posts Analyzer", version="1.0.0")
+        app = FastAPI(title="LinkedIn Saved Posts Analyzer", version="1.0.0", lifespan=self.lifespan)
 
         # Register exception handlers
         # @app.exception_handler(SessionAlreadyExistsError)
@@ -74,8 +110,14 @@ class AppBuilder:
             self.register_popular_authors_routes(app)
         if self.search_posts_api:
             self.register_search_posts_routes(app)
+        if self.suggest_terms_api:
+            self.register_suggest_terms_routes(app)
+        if self.semantic_search_posts_api:
+            self.register_semantic_search_posts_routes(app)
         if self.compute_projection_api:
             self.register_projection_routes(app)
+        if self.get_topics_api:
+            self.register_topics_routes(app)
         if self.compute_word_cloud_api:
             self.register_word_cloud_routes(app)
         if self.save_posts_api:
@@ -84,6 +126,10 @@ class AppBuilder:
             self.register_get_posts_routes(app)
         if self.get_posts_api:
             self.register_get_post_routes(app)
+        if self.delete_posts_api:
+            self.register_delete_posts_routes(app)
+        if self.health_api:
+            self.register_health_routes(app)
 
 
         app.add_middleware(
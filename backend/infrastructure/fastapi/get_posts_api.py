@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from typing import Any, List, Optional
 from dataclasses import dataclass
 
-from fastapi import Path, Depends, Query
+from fastapi import Path, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
 from application.use_cases.get_posts import GetPostsUseCase
 from domain.entities.post import Post, PostId
+from domain.entities.search import PostFilter
 from domain.entities.user_id import UserId
 from infrastructure.fastapi.common import get_anonymous_user
 
@@ -24,11 +27,26 @@ class GetPostsAPIBase(ABC):
 class GetPostsAPIImpl(GetPostsAPIBase):
     get_posts_use_case: GetPostsUseCase
 
-    async def get_posts(self, user_id: UserId = Depends(get_anonymous_user), ids: Optional[List[PostId]] = Query(None)) -> List[Post]:
-        return self.get_posts_use_case.execute(
-            user_id=user_id,
-            post_ids=ids if ids else None
-        )
+    async def get_posts(
+        self,
+        user_id: UserId = Depends(get_anonymous_user),
+        ids: Optional[List[PostId]] = Query(None),
+        author: Optional[List[str]] = Query(None, description="Only posts by these authors"),
+        since: Optional[date] = Query(None, description="Only posts from this date on"),
+        until: Optional[date] = Query(None, description="Only posts up to this date"),
+        facets: bool = Query(False, description="Return {posts, facets}, with author and month counts over the posts"),
+    ) -> Any:
+        execute = self.get_posts_use_case.execute_with_facets if facets else self.get_posts_use_case.execute
+        try:
+            # Filters and facets may build the search index first, off the event loop
+            return await run_in_threadpool(
+                execute,
+                user_id=user_id,
+                post_ids=ids if ids else None,
+                filters=PostFilter(authors=tuple(author or ()), since=since, until=until),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     async def get_post(self, user_id: UserId = Depends(get_anonymous_user), id: PostId = Path(...)) -> Optional[Post]:
         print(f"Fetching post with id: {id} for user: {user_id}")
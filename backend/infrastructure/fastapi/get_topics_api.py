@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List
+
+from fastapi import Depends, HTTPException, Path, Query
+from fastapi.concurrency import run_in_threadpool
+
+from domain.entities.post import Post
+from domain.entities.topic import TopicSummary
+from domain.entities.user_id import UserId
+from application.use_cases.get_topics import GetTopics
+from infrastructure.fastapi.common import get_anonymous_user
+
+NO_TOPICS = "No topics for the current posts; they are fitted by GET /projection"
+
+
+class GetTopicsAPIBase(ABC):
+    @abstractmethod
+    async def get_topics(self, user_id: UserId) -> List[TopicSummary]:
+        pass
+
+    @abstractmethod
+    async def get_topic_posts(self, user_id: UserId, topic_id: int, limit: int, offset: int) -> List[Post]:
+        pass
+
+    @abstractmethod
+    async def get_representative_posts(self, user_id: UserId, topic_id: int) -> List[Post]:
+        pass
+
+
+@dataclass
+class GetTopicsAPIImpl(GetTopicsAPIBase):
+    get_topics_use_case: GetTopics
+
+    async def get_topics(self, user_id: UserId = Depends(get_anonymous_user)) -> List[TopicSummary]:
+        # Building a missing search index to read the generation can take a while
+        topics = await run_in_threadpool(self.get_topics_use_case.topics, user_id=user_id)
+        if topics is None:
+            raise HTTPException(status_code=404, detail=NO_TOPICS)
+        return topics
+
+    async def get_topic_posts(
+        self,
+        user_id: UserId = Depends(get_anonymous_user),
+        topic_id: int = Path(...),
+        limit: int = Query(100, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+    ) -> List[Post]:
+        posts = await run_in_threadpool(
+            self.get_topics_use_case.topic_posts, user_id=user_id, topic_id=topic_id, limit=limit, offset=offset
+        )
+        if posts is None:
+            raise HTTPException(status_code=404, detail=NO_TOPICS)
+        return posts
+
+    async def get_representative_posts(
+        self, user_id: UserId = Depends(get_anonymous_user), topic_id: int = Path(...)
+    ) -> List[Post]:
+        posts = await run_in_threadpool(
+            self.get_topics_use_case.representative_posts, user_id=user_id, topic_id=topic_id
+        )
+        if posts is None:
+            raise HTTPException(status_code=404, detail=NO_TOPICS)
+        return posts
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict
+
+from fastapi import Response
+
+from domain.entities.health import Readiness
+from application.use_cases.check_health import CheckHealth
+
+
+class HealthAPIBase(ABC):
+    @abstractmethod
+    async def healthz(self) -> Dict[str, str]:
+        pass
+
+    @abstractmethod
+    async def readyz(self, response: Response) -> Readiness:
+        pass
+
+
+@dataclass
+class HealthAPIImpl(HealthAPIBase):
+    check_health_use_case: CheckHealth
+
+    async def healthz(self) -> Dict[str, str]:
+        # The process is serving requests; models may still be loading
+        return {"status": "ok"}
+
+    async def readyz(self, response: Response) -> Readiness:
+        readiness = self.check_health_use_case.readiness()
+        if not readiness.ready:
+            response.status_code = 503
+        return readiness
@@ -0,0 +1,81 @@
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from domain.entities.post import ProjectionTable
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+_ALIASES = {
+    "*/*": JSON,
+    "application/*": JSON,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """The supported media type the Accept header prefers, or None if it accepts none of them.
+
+    Ties in quality go to the type listed first; no header means JSON.
+    """
+    if not accept:
+        return JSON
+    ranges = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(ranges):
+        media_type = _ALIASES.get(media_type, media_type)
+        if media_type in (JSON, MSGPACK, ARROW):
+            return media_type
+    return None
+
+
+def encode_table(table: ProjectionTable, media_type: str) -> bytes:
+    """Encode a projection table as MessagePack or as an Arrow IPC stream.
+
+    Coordinates are sent as 32-bit floats. The Arrow stream holds one record
+    batch of the post columns, with the topic table as JSON under the
+    ``topics`` key of the schema metadata.
+    """
+    if media_type == MSGPACK:
+        try:
+            import msgpack
+        except ImportError:
+            raise _not_installed("msgpack", media_type)
+        return msgpack.packb(jsonable_encoder(table), use_single_float=True)
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise _not_installed("pyarrow", media_type)
+    batch = pa.RecordBatch.from_pydict(
+        {
+            "post_id": pa.array(table.post_id, pa.string()),
+            "x": pa.array(table.x, pa.float32()),
+            "y": pa.array(table.y, pa.float32()),
+            "topic_id": pa.array(table.topic_id, pa.int32()),
+        },
+        metadata={"topics": json.dumps(jsonable_encoder(table.topics))},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _not_installed(package: str, media_type: str) -> HTTPException:
+    return HTTPException(status_code=406, detail=f"{media_type} responses need the {package} package installed")
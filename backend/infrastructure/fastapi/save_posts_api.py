@@ -3,7 +3,7 @@ from typing import List
 from dataclasses import dataclass, asdict
 from uuid import uuid4
 
-from fastapi import Body, Depends
+from fastapi import BackgroundTasks, Body, Depends
 
 from application.use_cases.save_posts import SavePostsUseCase
 from domain.entities.post import Post
@@ -14,7 +14,12 @@ from infrastructure.fastapi.common import get_anonymous_user
 
 class SavePostsAPIBase(ABC):
     @abstractmethod
-    async def save_posts(self, user_id: UserId = Depends(get_anonymous_user), posts: List[PostRequest] = Body(...)) -> None:
+    async def save_posts(
+        self,
+        background_tasks: BackgroundTasks,
+        user_id: UserId = Depends(get_anonymous_user),
+        posts: List[PostRequest] = Body(...),
+    ) -> None:
         pass
 
 
@@ -22,7 +27,12 @@ class SavePostsAPIBase(ABC):
 class SavePostsAPIImpl(SavePostsAPIBase):
     save_posts_use_case: SavePostsUseCase
 
-    async def save_posts(self, user_id: UserId = Depends(get_anonymous_user), posts: List[PostRequest] = Body(...)) -> None:
+    async def save_posts(
+        self,
+        background_tasks: BackgroundTasks,
+        user_id: UserId = Depends(get_anonymous_user),
+        posts: List[PostRequest] = Body(...),
+    ) -> None:
         # "zip" user id and post request to create Post entities
         posts = [
             Post(
@@ -32,4 +42,8 @@ class SavePostsAPIImpl(SavePostsAPIBase):
             ) for post_request in posts
         ]
 
-        return self.save_posts_use_case.execute(posts)
+        result = self.save_posts_use_case.execute(posts)
+        background_tasks.add_task(self.save_posts_use_case.embed, posts)
+        # Re-indexed posts leave tombstones behind, as deletes do; compaction runs after the response
+        background_tasks.add_task(self.save_posts_use_case.compact, user_id)
+        return result
@@ -1,23 +1,79 @@
 from abc import ABC, abstractmethod
-from typing import List
 from dataclasses import dataclass
+from datetime import date
+from typing import List, Literal, Optional
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
-from domain.entities.post import PostId, UserId
-from application.use_cases.search_posts import SearchPosts
+from domain.entities.post import UserId
+from domain.entities.search import PostFilter, SearchResponse
+from application.interfaces.search_result_cache import CacheStats
+from application.use_cases.search_posts import POST_FIELDS, SearchMode, SearchPosts
 from infrastructure.fastapi.common import get_anonymous_user
 
 
+PostField = Literal[POST_FIELDS]
+
+
 class SearchPostsAPIBase(ABC):
     @abstractmethod
-    async def search_posts(self, query: str, user_id: UserId) -> List[PostId]:
+    async def search_posts(
+        self,
+        query: str,
+        user_id: UserId,
+        limit: int,
+        offset: int,
+        fuzzy: bool,
+        mode: SearchMode,
+        cursor: Optional[str],
+        include_posts: bool,
+        fields: Optional[List[PostField]],
+        author: Optional[List[str]],
+        since: Optional[date],
+        until: Optional[date],
+    ) -> SearchResponse:
         pass
 
+    async def search_cache_stats(self) -> Optional[CacheStats]:
+        return None
+
 
 @dataclass
 class SearchPostsAPIImpl(SearchPostsAPIBase):
     search_posts_use_case: SearchPosts
 
-    async def search_posts(self, query: str, user_id: UserId = Depends(get_anonymous_user)) -> List[PostId]:
-        return self.search_posts_use_case.execute(query=query, user_id=user_id)
\ No newline at end of file
+    async def search_posts(
+        self,
+        query: str,
+        user_id: UserId = Depends(get_anonymous_user),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        fuzzy: bool = Query(False, description="Also match terms within a few typos of the query terms"),
+        mode: SearchMode = Query("keyword", description="'hybrid' fuses keyword and semantic rankings"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides offset"),
+        include_posts: bool = Query(False, description="Return the matching posts alongside the results"),
+        fields: Optional[List[PostField]] = Query(None, description="Post fields to include; all by default"),
+        author: Optional[List[str]] = Query(None, description="Only posts by these authors"),
+        since: Optional[date] = Query(None, description="Only posts from this date on"),
+        until: Optional[date] = Query(None, description="Only posts up to this date"),
+    ) -> SearchResponse:
+        try:
+            return await run_in_threadpool(
+                self.search_posts_use_case.execute,
+                query=query,
+                user_id=user_id,
+                limit=limit,
+                offset=offset,
+                fuzzy=fuzzy,
+                mode=mode,
+                cursor=cursor,
+                include_posts=include_posts,
+                post_fields=fields,
+                filters=PostFilter(authors=tuple(author or ()), since=since, until=until),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def search_cache_stats(self) -> Optional[CacheStats]:
+        return self.search_posts_use_case.cache_stats()
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from fastapi import Depends, Query
+from fastapi.concurrency import run_in_threadpool
+
+from domain.entities.post import UserId
+from domain.entities.search import SearchResponse
+from application.use_cases.semantic_search_posts import SemanticSearchPosts
+from infrastructure.fastapi.common import get_anonymous_user
+
+
+class SemanticSearchPostsAPIBase(ABC):
+    @abstractmethod
+    async def semantic_search_posts(self, query: str, user_id: UserId, limit: int, offset: int) -> SearchResponse:
+        pass
+
+
+@dataclass
+class SemanticSearchPostsAPIImpl(SemanticSearchPostsAPIBase):
+    semantic_search_posts_use_case: SemanticSearchPosts
+
+    async def semantic_search_posts(
+        self,
+        query: str,
+        user_id: UserId = Depends(get_anonymous_user),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+    ) -> SearchResponse:
+        # Encoding is CPU-bound; keep it off the event loop
+        return await run_in_threadpool(
+            self.semantic_search_posts_use_case.execute,
+            query=query, user_id=user_id, limit=limit, offset=offset,
+        )
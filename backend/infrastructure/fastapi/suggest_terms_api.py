@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import List
+from dataclasses import dataclass
+
+from fastapi import Depends, Query
+from fastapi.concurrency import run_in_threadpool
+
+from domain.entities.user_id import UserId
+from domain.entities.search import TermSuggestion
+from application.use_cases.suggest_terms import SuggestTerms
+from infrastructure.fastapi.common import get_anonymous_user
+
+
+class SuggestTermsAPIBase(ABC):
+    @abstractmethod
+    async def suggest_terms(self, prefix: str, user_id: UserId, limit: int) -> List[TermSuggestion]:
+        pass
+
+
+@dataclass
+class SuggestTermsAPIImpl(SuggestTermsAPIBase):
+    suggest_terms_use_case: SuggestTerms
+
+    async def suggest_terms(
+        self,
+        prefix: str,
+        user_id: UserId = Depends(get_anonymous_user),
+        limit: int = Query(10, ge=1, le=50),
+    ) -> List[TermSuggestion]:
+        # Loading or building a cold user's index must not block the event loop
+        return await run_in_threadpool(
+            self.suggest_terms_use_case.execute, prefix=prefix, user_id=user_id, limit=limit
+        )
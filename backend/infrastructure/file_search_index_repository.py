@@ -0,0 +1,318 @@
+import json
+import logging
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from hashlib import sha256
+from threading import RLock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from application.interfaces.search_index_repository import (
+    SearchIndexRepository, UserIndex, Index
+)
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+from infrastructure.index_segment import (
+    IndexSegment, SegmentDocTerms, SegmentPostings, as_term_postings, write_segment
+)
+from infrastructure.trigram_term_expander import trigrams
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class _SegmentEntry:
+    file: str
+    docs: int
+
+
+@dataclass
+class _Manifest:
+    """Which segments make up a user's index, in doc ID order."""
+    user_id: UserId
+    epoch: int = 0
+    generation: int = 0
+    next_segment: int = 0
+    segments: List[_SegmentEntry] = field(default_factory=list)
+    tombstones: List[int] = field(default_factory=list)
+
+    @property
+    def docs(self) -> int:
+        return sum(segment.docs for segment in self.segments)
+
+
+@dataclass
+class FileSearchIndexRepository(SearchIndexRepository):
+    """Stores each user's index as immutable, memory-mapped segment files.
+
+    Saving writes a new segment with only the docs added since the last save;
+    deletions only rewrite the manifest's tombstone list, and a compaction
+    (which renumbers doc IDs) rewrites the index as a single segment. Loading
+    decodes the term dictionary and doc table but leaves the postings on disk
+    until a query touches them. Once ``merge_factor`` segments of fewer than
+    ``small_segment_docs`` docs pile up they are merged in the background.
+    """
+    root: str
+    merge_factor: int = 4
+    small_segment_docs: int = 1000
+    _indexes: Index = field(default_factory=dict, init=False, repr=False)
+    _manifests: Dict[UserId, _Manifest] = field(default_factory=dict, init=False, repr=False)
+    _segments: Dict[str, IndexSegment] = field(default_factory=dict, init=False, repr=False)
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False)
+    _merger: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-merge"),
+        init=False,
+        repr=False,
+    )
+    _pending_merges: List[Future] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        os.makedirs(self.root, exist_ok=True)
+
+    def save_user_index(self, user_id: UserId, index: UserIndex) -> None:
+        """Persist the changes to ``index`` since it was last saved or loaded."""
+        with self._lock, index.lock:
+            manifest = self._manifest(user_id)
+            full = manifest is None or self._indexes.get(user_id) is not index or manifest.epoch != index.epoch
+            if manifest is None:
+                manifest = _Manifest(user_id=user_id)
+            old_segments = list(manifest.segments)
+            if full:
+                manifest.segments = []
+
+            doc_start = manifest.docs
+            if len(index.post_ids) > doc_start:
+                manifest.segments.append(self._write_delta(user_id, manifest, index, doc_start, full))
+
+            manifest.epoch = index.epoch
+            manifest.generation = index.generation
+            manifest.tombstones = sorted(index.tombstones)
+            self._write_manifest(manifest)
+            self._indexes[user_id] = index
+
+            segments = [self._open(user_id, segment.file) for segment in manifest.segments]
+            if full:
+                for segment in old_segments:
+                    self._remove_segment(user_id, segment.file)
+                # Postings now live in the file; drop the in-memory copies
+                index.postings = SegmentPostings(segments)
+            index.doc_terms = SegmentDocTerms(segments)
+            self._schedule_merge(user_id, manifest)
+
+    def update_index(self, index: Index) -> None:
+        """Update the storage with the provided index data."""
+        for user_id, user_index in index.items():
+            self.save_user_index(user_id, user_index)
+
+    def get_index_by_user_id(self, user_id: UserId) -> Optional[UserIndex]:
+        """Retrieve the index for a given user, loading it from disk on first use."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                manifest = self._manifest(user_id)
+                if manifest is None:
+                    return None
+                index = self._indexes[user_id] = self._load(user_id, manifest)
+            return index
+
+    def get_post_ids_by_token(self, user_id: UserId, token: str) -> Optional[list[PostId]]:
+        """Retrieve the list of post IDs for a given user and token, or None if not exists."""
+        user_index = self.get_index_by_user_id(user_id)
+        if user_index is None or token not in user_index.postings:
+            return None
+        return [
+            user_index.post_ids[doc_id]
+            for doc_id in user_index.postings[token].doc_ids
+            if doc_id not in user_index.tombstones
+        ]
+
+    def list_all_indexes(self) -> Dict[UserId, UserIndex]:
+        """Return all user indexes (for debugging or admin purposes)."""
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name, MANIFEST)
+            if os.path.exists(path):
+                with open(path) as f:
+                    self.get_index_by_user_id(json.load(f)["user_id"])
+        return dict(self._indexes)
+
+    def wait_for_merges(self) -> None:
+        """Block until the background merges scheduled so far have finished."""
+        while self._pending_merges:
+            self._pending_merges.pop().result()
+
+    def _user_dir(self, user_id: UserId) -> str:
+        return os.path.join(self.root, sha256(user_id.encode("utf-8")).hexdigest()[:32])
+
+    def _manifest(self, user_id: UserId) -> Optional[_Manifest]:
+        manifest = self._manifests.get(user_id)
+        if manifest is None:
+            path = os.path.join(self._user_dir(user_id), MANIFEST)
+            if not os.path.exists(path):
+                return None
+            with open(path) as f:
+                data = json.load(f)
+            data["segments"] = [_SegmentEntry(**segment) for segment in data["segments"]]
+            manifest = self._manifests[user_id] = _Manifest(**data)
+        return manifest
+
+    def _write_manifest(self, manifest: _Manifest) -> None:
+        user_dir = self._user_dir(manifest.user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        tmp_path = os.path.join(user_dir, f"{MANIFEST}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(manifest), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(user_dir, MANIFEST))
+        self._manifests[manifest.user_id] = manifest
+
+    def _new_segment_file(self, manifest: _Manifest) -> str:
+        manifest.next_segment += 1
+        return f"{manifest.next_segment:08d}.seg"
+
+    def _open(self, user_id: UserId, file: str) -> IndexSegment:
+        path = os.path.join(self._user_dir(user_id), file)
+        segment = self._segments.get(path)
+        if segment is None:
+            segment = self._segments[path] = IndexSegment(path)
+        return segment
+
+    def _remove_segment(self, user_id: UserId, file: str) -> None:
+        path = os.path.join(self._user_dir(user_id), file)
+        # Open maps stay readable after the unlink, so live views remain valid
+        self._segments.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _write_delta(
+        self, user_id: UserId, manifest: _Manifest, index: UserIndex, doc_start: int, full: bool
+    ) -> _SegmentEntry:
+        if not full and isinstance(index.postings, SegmentPostings):
+            # Only postings touched since loading can contain new docs
+            items = index.postings.loaded_items()
+        else:
+            items = index.postings.items()
+        postings = [(term, as_term_postings(p, doc_start)) for term, p in items]
+
+        authors = []
+        for name, doc_ids in index.author_postings.items():
+            authors.append((name, np.frombuffer(doc_ids, dtype=np.uint32)[bisect_left(doc_ids, doc_start):]))
+
+        os.makedirs(self._user_dir(user_id), exist_ok=True)
+        file = self._new_segment_file(manifest)
+        write_segment(
+            os.path.join(self._user_dir(user_id), file),
+            doc_start,
+            index.post_ids[doc_start:],
+            np.frombuffer(index.doc_lengths, dtype=np.uint32)[doc_start:],
+            [index.authors[ordinal] for ordinal in index.doc_authors[doc_start:]],
+            np.frombuffer(index.doc_days, dtype=np.int32)[doc_start:],
+            postings,
+            authors,
+        )
+        return _SegmentEntry(file=file, docs=len(index.post_ids) - doc_start)
+
+    def _load(self, user_id: UserId, manifest: _Manifest) -> UserIndex:
+        segments = [self._open(user_id, segment.file) for segment in manifest.segments]
+        index = UserIndex(postings=SegmentPostings(segments), doc_terms=SegmentDocTerms(segments))
+        for segment in segments:
+            index.post_ids.extend(segment.post_ids())
+            index.doc_lengths.frombytes(segment.doc_lengths().tobytes())
+            index.doc_days.frombytes(segment.doc_days().tobytes())
+            for doc_id, author in enumerate(segment.doc_authors(), start=segment.doc_start):
+                ordinal = index.author_ordinals.get(author)
+                if ordinal is None:
+                    ordinal = index.author_ordinals[author] = len(index.authors)
+                    index.authors.append(author)
+                    index.author_docs.append(array("I"))
+                index.author_docs[ordinal].append(doc_id)
+                index.doc_authors.append(ordinal)
+            for name, doc_ids in segment.author_postings().items():
+                index.author_postings.setdefault(name, array("I")).extend(doc_ids)
+            for term, doc_freq in zip(segment.terms(), segment.doc_freqs().tolist()):
+                index.doc_freqs[term] = index.doc_freqs.get(term, 0) + doc_freq
+
+        index.terms = sorted(index.postings)
+        for term in index.terms:
+            for gram in trigrams(term):
+                index.trigrams.setdefault(gram, []).append(term)
+
+        index.tombstones = set(manifest.tombstones)
+        for doc_id in index.tombstones:
+            for term in index.doc_terms[doc_id]:
+                index.doc_freqs[term] -= 1
+        index.doc_id_by_post = {
+            post_id: doc_id
+            for doc_id, post_id in enumerate(index.post_ids)
+            if doc_id not in index.tombstones
+        }
+        doc_lengths = np.frombuffer(index.doc_lengths, dtype=np.uint32)
+        index.total_length = int(doc_lengths.sum()) - int(doc_lengths[list(index.tombstones)].sum())
+        index.generation = manifest.generation
+        index.epoch = manifest.epoch
+        return index
+
+    def _schedule_merge(self, user_id: UserId, manifest: _Manifest) -> None:
+        if len(self._small_tail(manifest)) >= self.merge_factor:
+            self._pending_merges.append(self._merger.submit(self._merge, user_id))
+
+    def _small_tail(self, manifest: _Manifest) -> List[_SegmentEntry]:
+        """The trailing run of small segments, which new saves keep extending."""
+        tail = []
+        for segment in reversed(manifest.segments):
+            if segment.docs >= self.small_segment_docs:
+                break
+            tail.insert(0, segment)
+        return tail
+
+    def _merge(self, user_id: UserId) -> None:
+        with self._lock:
+            manifest = self._manifest(user_id)
+            run = self._small_tail(manifest)
+            if len(run) < self.merge_factor:
+                return
+            epoch = manifest.epoch
+            file = self._new_segment_file(manifest)
+            segments = [self._open(user_id, segment.file) for segment in run]
+
+        # Segments are immutable, so the merge itself runs without the lock
+        postings = SegmentPostings(segments)
+        authors: Dict[str, array] = {}
+        for segment in segments:
+            for name, doc_ids in segment.author_postings().items():
+                authors.setdefault(name, array("I")).extend(doc_ids)
+        write_segment(
+            os.path.join(self._user_dir(user_id), file),
+            segments[0].doc_start,
+            [post_id for segment in segments for post_id in segment.post_ids()],
+            np.concatenate([segment.doc_lengths() for segment in segments]),
+            [author for segment in segments for author in segment.doc_authors()],
+            np.concatenate([segment.doc_days() for segment in segments]),
+            ((term, as_term_postings(postings[term])) for term in postings),
+            ((name, np.frombuffer(doc_ids, dtype=np.uint32)) for name, doc_ids in authors.items()),
+        )
+
+        with self._lock:
+            manifest = self._manifest(user_id)
+            n = len(run)
+            start = next(
+                (i for i in range(len(manifest.segments) - n + 1) if manifest.segments[i:i + n] == run),
+                None,
+            )
+            if manifest.epoch != epoch or start is None:
+                # A compaction replaced the segments meanwhile
+                self._remove_segment(user_id, file)
+                return
+            manifest.segments[start:start + n] = [_SegmentEntry(file=file, docs=sum(s.docs for s in run))]
+            self._write_manifest(manifest)
+            for segment in run:
+                self._remove_segment(user_id, segment.file)
+        logger.info("[FileSearchIndexRepository] Merged %d segments for user %s", n, user_id)
@@ -0,0 +1,372 @@
+"""Immutable on-disk search index segments, read through ``mmap``.
+
+A segment holds the postings of a contiguous range of doc IDs. Its layout is
+a fixed header followed by 8-byte aligned sections of native-endian integers:
+
+    post ID offsets (u64) + blob     doc ID -> post ID
+    doc lengths (u32)
+    term offsets (u64) + blob        sorted term dictionary
+    term pointers (u64)              term -> slice of doc IDs / term freqs
+    doc IDs, term freqs (u32)
+    position pointers (u64)          term -> slice of positions
+    positions (u32)
+    char offsets (u32)               text offset of each position, for highlighting
+    char ends (u32)                  text offset where the token at each position ends
+    position offsets (u32)           per term, ``df + 1`` entries starting at 0
+    author offsets (u64) + blob, author pointers (u64), author doc IDs (u32)
+    doc author offsets (u64) + blob  doc ID -> author name, for facets
+    doc days (i32)                   doc ID -> post date
+    doc term pointers (u64)          doc ID -> slice of doc terms
+    doc terms (u32)                  dictionary ordinals of each doc's distinct terms
+
+Posting lists are handed out as zero-copy ``memoryview`` slices, so only the
+pages of the terms a query touches are ever read. Doc frequencies come from
+the term pointers alone, and the doc terms let a deletion update them
+without reading any posting list.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from domain.entities.post import PostId
+from application.interfaces.search_index_builder import Postings
+
+MAGIC = b"LISG"
+VERSION = 5
+N_SECTIONS = 22
+_HEADER = struct.Struct(f"<4sIIIII{2 * N_SECTIONS}Q")
+
+# Section numbers
+(
+    POST_ID_OFFSETS, POST_ID_BLOB, DOC_LENGTHS,
+    TERM_OFFSETS, TERM_BLOB, TERM_PTR, DOC_IDS, TERM_FREQS,
+    POSITION_PTR, POSITIONS, CHAR_OFFSETS, CHAR_ENDS, POSITION_OFFSETS,
+    AUTHOR_OFFSETS, AUTHOR_BLOB, AUTHOR_PTR, AUTHOR_DOC_IDS,
+    DOC_AUTHOR_OFFSETS, DOC_AUTHOR_BLOB, DOC_DAYS,
+    DOC_TERM_PTR, DOC_TERMS,
+) = range(N_SECTIONS)
+
+# (doc IDs, term freqs, positions, position offsets, char offsets, char ends) of one term
+TermPostings = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _u32(values) -> np.ndarray:
+    if not isinstance(values, np.ndarray):
+        values = np.frombuffer(values, dtype=np.uint32)
+    return np.ascontiguousarray(values, dtype=np.uint32)
+
+
+def _strings(values: Sequence[str]) -> Tuple[np.ndarray, bytes]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def write_segment(
+    path: str,
+    doc_start: int,
+    post_ids: Sequence[PostId],
+    doc_lengths: np.ndarray,
+    doc_authors: Sequence[str],
+    doc_days: np.ndarray,
+    postings: Iterable[Tuple[str, TermPostings]],
+    author_postings: Iterable[Tuple[str, np.ndarray]],
+) -> None:
+    """Write a segment for docs ``[doc_start, doc_start + len(post_ids))``.
+
+    ``postings`` and ``author_postings`` may come in any order and must only
+    contain doc IDs of that range. The file is written under a temporary
+    name and renamed into place, so readers never see a partial segment.
+    """
+    postings = sorted(((term, p) for term, p in postings if len(p[0])), key=lambda item: item[0])
+    authors = sorted(((name, doc_ids) for name, doc_ids in author_postings if len(doc_ids)), key=lambda item: item[0])
+
+    def pointers(lengths: List[int]) -> np.ndarray:
+        out = np.zeros(len(lengths) + 1, dtype=np.uint64)
+        np.cumsum(lengths, out=out[1:])
+        return out
+
+    empty = np.zeros(0, dtype=np.uint32)
+
+    def concat(parts: List[np.ndarray]) -> np.ndarray:
+        return np.concatenate([_u32(part) for part in parts]) if parts else empty
+
+    # The forward index lists each doc's term ordinals, in dictionary order
+    doc_ids = concat([p[0] for _, p in postings])
+    term_ordinals = np.repeat(np.arange(len(postings), dtype=np.uint32), [len(p[0]) for _, p in postings])
+    by_doc = np.argsort(doc_ids, kind="stable")
+    doc_term_counts = np.bincount(doc_ids.astype(np.int64) - doc_start, minlength=len(post_ids))
+
+    post_id_offsets, post_id_blob = _strings(post_ids)
+    term_offsets, term_blob = _strings([term for term, _ in postings])
+    author_offsets, author_blob = _strings([name for name, _ in authors])
+    doc_author_offsets, doc_author_blob = _strings(doc_authors)
+    sections = [
+        post_id_offsets,
+        post_id_blob,
+        _u32(doc_lengths),
+        term_offsets,
+        term_blob,
+        pointers([len(p[0]) for _, p in postings]),
+        doc_ids,
+        concat([p[1] for _, p in postings]),
+        pointers([len(p[2]) for _, p in postings]),
+        concat([p[2] for _, p in postings]),
+        concat([p[4] for _, p in postings]),
+        concat([p[5] for _, p in postings]),
+        concat([p[3] for _, p in postings]),
+        author_offsets,
+        author_blob,
+        pointers([len(doc_ids) for _, doc_ids in authors]),
+        concat([doc_ids for _, doc_ids in authors]),
+        doc_author_offsets,
+        doc_author_blob,
+        np.ascontiguousarray(doc_days, dtype=np.int32),
+        pointers(doc_term_counts.tolist()),
+        term_ordinals[by_doc],
+    ]
+
+    table = []
+    offset = _HEADER.size
+    for section in sections:
+        offset += -offset % 8
+        nbytes = len(section) if isinstance(section, bytes) else section.nbytes
+        table += [offset, nbytes]
+        offset += nbytes
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, doc_start, len(post_ids), len(postings), len(authors), *table))
+        for section, section_offset in zip(sections, table[::2]):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(section if isinstance(section, bytes) else section.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class IndexSegment:
+    """Read-only view of a segment file."""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Index segments are stored little-endian")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mmap)
+        magic, version, self.doc_start, self.n_docs, self.n_terms, self.n_authors = header[:6]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} index segment")
+        self._table = header[6:]
+        self._view = memoryview(self._mmap)
+
+        self._term_ptr = self._section(TERM_PTR, "Q")
+        self._position_ptr = self._section(POSITION_PTR, "Q")
+        self._doc_ids = self._section(DOC_IDS, "I")
+        self._term_freqs = self._section(TERM_FREQS, "I")
+        self._positions = self._section(POSITIONS, "I")
+        self._char_offsets = self._section(CHAR_OFFSETS, "I")
+        self._char_ends = self._section(CHAR_ENDS, "I")
+        self._position_offsets = self._section(POSITION_OFFSETS, "I")
+        self._doc_term_ptr = self._section(DOC_TERM_PTR, "Q")
+        self._doc_terms = self._section(DOC_TERMS, "I")
+        self._terms: Optional[List[str]] = None
+
+    @property
+    def doc_end(self) -> int:
+        return self.doc_start + self.n_docs
+
+    def _section(self, number: int, fmt: Optional[str] = None) -> memoryview:
+        offset, nbytes = self._table[2 * number], self._table[2 * number + 1]
+        view = self._view[offset:offset + nbytes]
+        return view.cast(fmt) if fmt else view
+
+    def _decode(self, offsets_section: int, blob_section: int) -> List[str]:
+        offsets = self._section(offsets_section, "Q").tolist()
+        blob = self._section(blob_section).tobytes()
+        return [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def post_ids(self) -> List[PostId]:
+        return self._decode(POST_ID_OFFSETS, POST_ID_BLOB)
+
+    def doc_lengths(self) -> np.ndarray:
+        return np.frombuffer(self._section(DOC_LENGTHS), dtype=np.uint32)
+
+    def doc_authors(self) -> List[str]:
+        return self._decode(DOC_AUTHOR_OFFSETS, DOC_AUTHOR_BLOB)
+
+    def doc_days(self) -> np.ndarray:
+        return np.frombuffer(self._section(DOC_DAYS), dtype=np.int32)
+
+    def terms(self) -> List[str]:
+        # Decoded once, so every view of the dictionary shares the strings
+        if self._terms is None:
+            self._terms = self._decode(TERM_OFFSETS, TERM_BLOB)
+        return self._terms
+
+    def doc_freqs(self) -> np.ndarray:
+        """Number of docs of the segment containing each dictionary term, deleted ones included."""
+        return np.diff(np.frombuffer(self._section(TERM_PTR), dtype=np.uint64)).astype(np.int64)
+
+    def doc_terms(self, i: int) -> Tuple[str, ...]:
+        """Distinct terms of the segment's i-th doc."""
+        terms = self.terms()
+        return tuple(terms[t] for t in self._doc_terms[self._doc_term_ptr[i]:self._doc_term_ptr[i + 1]])
+
+    def postings(self, i: int) -> Postings:
+        """Zero-copy postings of the i-th term of the dictionary."""
+        start, end = self._term_ptr[i], self._term_ptr[i + 1]
+        first, last = self._position_ptr[i], self._position_ptr[i + 1]
+        return Postings(
+            doc_ids=self._doc_ids[start:end],
+            term_freqs=self._term_freqs[start:end],
+            positions=self._positions[first:last],
+            position_offsets=self._position_offsets[start + i:end + i + 1],
+            char_offsets=self._char_offsets[first:last],
+            char_ends=self._char_ends[first:last],
+        )
+
+    def author_postings(self) -> Dict[str, array]:
+        pointers = self._section(AUTHOR_PTR, "Q")
+        doc_ids = self._section(AUTHOR_DOC_IDS)
+        out = {}
+        for i, name in enumerate(self._decode(AUTHOR_OFFSETS, AUTHOR_BLOB)):
+            out[name] = array("I")
+            out[name].frombytes(doc_ids[4 * pointers[i]:4 * pointers[i + 1]])
+        return out
+
+
+def concat_postings(parts: List[Postings]) -> Postings:
+    """Join postings of the same term from segments with increasing doc ranges."""
+    if len(parts) == 1:
+        return parts[0]
+    offsets, base = [], 0
+    for part in parts:
+        offsets.append(np.frombuffer(part.position_offsets, dtype=np.uint32)[:-1].astype(np.int64) + base)
+        base += len(part.positions)
+    offsets.append(np.array([base]))
+
+    def joined(values: List) -> array:
+        out = array("I")
+        for value in values:
+            out.frombytes(memoryview(value).cast("B"))
+        return out
+
+    position_offsets = array("I")
+    position_offsets.frombytes(np.concatenate(offsets).astype(np.uint32).tobytes())
+    return Postings(
+        doc_ids=joined([part.doc_ids for part in parts]),
+        term_freqs=joined([part.term_freqs for part in parts]),
+        positions=joined([part.positions for part in parts]),
+        position_offsets=position_offsets,
+        char_offsets=joined([part.char_offsets for part in parts]),
+        char_ends=joined([part.char_ends for part in parts]),
+    )
+
+
+def as_term_postings(postings: Postings, doc_start: int = 0) -> TermPostings:
+    """The part of ``postings`` at or after ``doc_start``, with offsets rebased to 0."""
+    doc_ids = np.frombuffer(postings.doc_ids, dtype=np.uint32)
+    offsets = np.frombuffer(postings.position_offsets, dtype=np.uint32)
+    i = bisect_left(postings.doc_ids, doc_start) if doc_start else 0
+    first = offsets[i]
+    return (
+        doc_ids[i:],
+        np.frombuffer(postings.term_freqs, dtype=np.uint32)[i:],
+        np.frombuffer(postings.positions, dtype=np.uint32)[first:],
+        offsets[i:] - first,
+        np.frombuffer(postings.char_offsets, dtype=np.uint32)[first:],
+        np.frombuffer(postings.char_ends, dtype=np.uint32)[first:],
+    )
+
+
+class SegmentPostings(MutableMapping):
+    """Term -> ``Postings`` mapping backed by segments, loaded term by term.
+
+    Terms are resolved on first access: a term stored in a single segment is
+    a zero-copy view, one spread over several segments is concatenated. Terms
+    assigned or fetched since loading are tracked so the repository can write
+    a new segment from them alone.
+    """
+
+    def __init__(self, segments: List[IndexSegment]):
+        self._locations: Dict[str, List[Tuple[IndexSegment, int]]] = {}
+        for segment in segments:
+            for i, term in enumerate(segment.terms()):
+                self._locations.setdefault(term, []).append((segment, i))
+        self._loaded: Dict[str, Postings] = {}
+        self._removed: Set[str] = set()
+
+    def __getitem__(self, term: str) -> Postings:
+        postings = self._loaded.get(term)
+        if postings is None:
+            if term in self._removed or term not in self._locations:
+                raise KeyError(term)
+            postings = self._loaded[term] = concat_postings(
+                [segment.postings(i) for segment, i in self._locations[term]]
+            )
+        return postings
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._loaded or (term in self._locations and term not in self._removed)
+
+    def __setitem__(self, term: str, postings: Postings) -> None:
+        self._loaded[term] = postings
+        self._removed.discard(term)
+
+    def __delitem__(self, term: str) -> None:
+        if term not in self:
+            raise KeyError(term)
+        self._loaded.pop(term, None)
+        if term in self._locations:
+            self._removed.add(term)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._loaded
+        for term in self._locations:
+            if term not in self._loaded and term not in self._removed:
+                yield term
+
+    def __len__(self) -> int:
+        on_disk = sum(1 for term in self._locations if term not in self._loaded and term not in self._removed)
+        return len(self._loaded) + on_disk
+
+    def loaded_items(self) -> Iterable[Tuple[str, Postings]]:
+        """Postings touched since loading; the only ones that can hold new docs."""
+        return self._loaded.items()
+
+
+class SegmentDocTerms(Sequence):
+    """Doc ID -> distinct terms, read from the segments' forward index.
+
+    Docs appended since loading are kept in memory until the next save.
+    """
+
+    def __init__(self, segments: List[IndexSegment]):
+        self._segments = segments
+        self._starts = [segment.doc_start for segment in segments]
+        self._on_disk = segments[-1].doc_end if segments else 0
+        self._appended: List[Tuple[str, ...]] = []
+
+    def __getitem__(self, doc_id: int) -> Tuple[str, ...]:
+        if not 0 <= doc_id < len(self):
+            raise IndexError(doc_id)
+        if doc_id >= self._on_disk:
+            return self._appended[doc_id - self._on_disk]
+        segment = self._segments[bisect_left(self._starts, doc_id + 1) - 1]
+        return segment.doc_terms(doc_id - segment.doc_start)
+
+    def __len__(self) -> int:
+        return self._on_disk + len(self._appended)
+
+    def append(self, terms: Tuple[str, ...]) -> None:
+        self._appended.append(terms)
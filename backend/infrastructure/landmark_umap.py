@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+
+@dataclass
+class LandmarkUMAP:
+    """Fits UMAP on a random sample of landmarks and places every other point with ``transform``.
+
+    Fitting UMAP grows faster than linearly with the number of points, in
+    time and memory, while ``transform`` only searches the neighbour graph
+    of the fitted points. Fitting ``n_landmarks`` points and transforming
+    the rest ``chunk_size`` at a time keeps very large corpora within
+    bounds. It stands in for the UMAP model inside BERTopic, so
+    ``fit_transform``, ``transform`` and ``embedding_`` cover all fitted
+    points, not only the landmarks.
+    """
+    model: Any  # an unfitted umap.UMAP
+    n_landmarks: int = 2000
+    chunk_size: int = 4096
+    random_state: Optional[int] = 42
+    landmarks_: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    embedding_: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    def fit(self, X, y=None) -> "LandmarkUMAP":
+        self.fit_transform(X, y=y)
+        return self
+
+    def fit_transform(self, X, y=None) -> np.ndarray:
+        X = np.asarray(X)
+        if len(X) <= self.n_landmarks:
+            landmarks = np.arange(len(X))
+        else:
+            rng = np.random.default_rng(self.random_state)
+            landmarks = np.sort(rng.choice(len(X), size=self.n_landmarks, replace=False))
+        others = np.setdiff1d(np.arange(len(X)), landmarks, assume_unique=True)
+
+        coords = np.empty((len(X), self.model.n_components), dtype=np.float32)
+        coords[landmarks] = self.model.fit_transform(X[landmarks], y=None if y is None else np.asarray(y)[landmarks])
+        self._transform_rows(X, others, coords)
+        self.landmarks_ = landmarks
+        self.embedding_ = coords
+        return coords
+
+    def transform(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        coords = np.empty((len(X), self.model.n_components), dtype=np.float32)
+        self._transform_rows(X, np.arange(len(X)), coords)
+        return coords
+
+    def _transform_rows(self, X: np.ndarray, rows: np.ndarray, out: np.ndarray) -> None:
+        # Chunks bound the memory of UMAP's neighbour search and of the copied rows
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            out[chunk] = self.model.transform(X[chunk])
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from domain.entities.search import SearchResponse
+from domain.entities.user_id import UserId
+from application.interfaces.search_result_cache import CacheStats, SearchResultCache
+from infrastructure.search_index_memory import deep_getsizeof
+
+CacheKey = Tuple[UserId, int, Hashable]
+
+
+@dataclass
+class LRUSearchResultCache(SearchResultCache):
+    """Bounded LRU over search responses, limited by entry count and approximate bytes.
+
+    Keys include the index generation, so an ingest or delete for a user makes
+    their cached responses unreachable; they are also evicted eagerly the
+    next time a response for the newer generation is stored.
+    """
+    max_entries: int = 1024
+    max_bytes: int = 32 * 1024 * 1024
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _entries: "OrderedDict[CacheKey, Tuple[SearchResponse, int]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _keys_by_user: Dict[UserId, Set[CacheKey]] = field(default_factory=dict, init=False, repr=False)
+    _generations: Dict[UserId, int] = field(default_factory=dict, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def get(self, user_id: UserId, generation: int, key: Hashable) -> Optional[SearchResponse]:
+        with self._lock:
+            entry = self._entries.get((user_id, generation, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((user_id, generation, key))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id: UserId, generation: int, key: Hashable, response: SearchResponse) -> None:
+        size = deep_getsizeof(response)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            if self._generations.get(user_id, generation) < generation:
+                for stale in list(self._keys_by_user.get(user_id, ())):
+                    self._evict(stale)
+            elif self._generations.get(user_id, generation) > generation:
+                return  # computed against an index that has since changed
+            self._generations[user_id] = generation
+
+            cache_key = (user_id, generation, key)
+            if cache_key in self._entries:
+                self._evict(cache_key)
+            self._entries[cache_key] = (response, size)
+            self._keys_by_user.setdefault(user_id, set()).add(cache_key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits, misses=self.misses, entries=len(self._entries), bytes=self._bytes
+            )
+
+    def _evict(self, cache_key: CacheKey) -> None:
+        _, size = self._entries.pop(cache_key)
+        self._bytes -= size
+        user_keys = self._keys_by_user[cache_key[0]]
+        user_keys.discard(cache_key)
+        if not user_keys:
+            del self._keys_by_user[cache_key[0]]
@@ -0,0 +1,94 @@
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from hashlib import sha256
+from threading import Lock
+from typing import Optional, Tuple
+
+from domain.entities.post import KeywordRelevance
+from domain.entities.topic import Topic, UserTopics
+from domain.entities.user_id import UserId
+from application.interfaces.topic_store import TopicStore
+
+
+@dataclass
+class LRUTopicStore(TopicStore):
+    """Bounded LRU of fitted topics, optionally written through to JSON files.
+
+    Memory holds the ``max_entries`` most recently used user generations.
+    With a ``root`` directory, stored topics are also written to
+    ``<root>/<hashed user>/<generation>.json``, keeping each user's newest
+    ``generations_per_user`` files, and misses are read back from there, so
+    topics outlive eviction and restarts.
+    """
+    max_entries: int = 256
+    root: Optional[str] = None
+    generations_per_user: int = 2
+    _entries: "OrderedDict[Tuple[UserId, int], UserTopics]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def get(self, user_id: UserId, generation: int) -> Optional[UserTopics]:
+        with self._lock:
+            topics = self._entries.get((user_id, generation))
+            if topics is not None:
+                self._entries.move_to_end((user_id, generation))
+                return topics
+        if self.root is None:
+            return None
+        topics = self._read(user_id, generation)
+        if topics is not None:
+            self._remember(user_id, topics)
+        return topics
+
+    def put(self, user_id: UserId, topics: UserTopics) -> None:
+        self._remember(user_id, topics)
+        if self.root is not None:
+            self._write(user_id, topics)
+
+    def _remember(self, user_id: UserId, topics: UserTopics) -> None:
+        with self._lock:
+            self._entries[(user_id, topics.generation)] = topics
+            self._entries.move_to_end((user_id, topics.generation))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _user_dir(self, user_id: UserId) -> str:
+        return os.path.join(self.root, sha256(user_id.encode("utf-8")).hexdigest()[:32])
+
+    def _read(self, user_id: UserId, generation: int) -> Optional[UserTopics]:
+        try:
+            with open(os.path.join(self._user_dir(user_id), f"{generation}.json"), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return UserTopics(
+            generation=data["generation"],
+            topics={
+                int(topic_id): Topic(
+                    id=topic["id"],
+                    keywords=[KeywordRelevance(**keyword) for keyword in topic["keywords"]],
+                    post_ids=topic["post_ids"],
+                    representative_post_ids=topic["representative_post_ids"],
+                )
+                for topic_id, topic in data["topics"].items()
+            },
+        )
+
+    def _write(self, user_id: UserId, topics: UserTopics) -> None:
+        user_dir = self._user_dir(user_id)
+        with self._lock:
+            os.makedirs(user_dir, exist_ok=True)
+            tmp_path = os.path.join(user_dir, f"{topics.generation}.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(topics), f)
+            os.replace(tmp_path, os.path.join(user_dir, f"{topics.generation}.json"))
+
+            generations = sorted(
+                (int(name[:-len(".json")]) for name in os.listdir(user_dir) if name.endswith(".json")),
+                reverse=True,
+            )
+            for generation in generations[self.generations_per_user:]:
+                os.remove(os.path.join(user_dir, f"{generation}.json"))
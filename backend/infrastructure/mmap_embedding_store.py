@@ -0,0 +1,165 @@
+import fcntl
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from application.interfaces.embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+META = "meta.json"
+VECTORS = "vectors.bin"
+KEYS = "keys.txt"
+LOCK = "lock"
+
+
+@dataclass
+class MmapEmbeddingStore(EmbeddingStore):
+    """Embeddings in a memory-mapped matrix file, with a key log naming its rows.
+
+    Rows are only ever appended. Vectors are flushed before their keys are
+    logged, so after a crash the log never names a row that was not
+    written. ``dtype`` may be "float16" to halve the file; vectors are read
+    back as float32. The dtype and dimension of an existing store win over
+    the configured ones.
+
+    Several processes may share a store: appends hold a file lock, and rows
+    appended by other processes are picked up on a lookup miss. Pickling
+    keeps only the settings, so an unpickled store opens its own maps.
+    """
+    root: str
+    dtype: str = "float32"
+    initial_capacity: int = 1024  # rows
+    _rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _matrix: Optional[np.memmap] = field(default=None, init=False, repr=False)
+    _dim: Optional[int] = field(default=None, init=False, repr=False)
+    _keys_end: int = field(default=0, init=False, repr=False)  # bytes of the key log read so far
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False)
+
+    def __post_init__(self):
+        os.makedirs(self.root, exist_ok=True)
+        self._refresh()
+
+    def __getstate__(self):
+        return {"root": self.root, "dtype": self.dtype, "initial_capacity": self.initial_capacity}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._refresh()
+            rows = [self._rows.get(key, -1) for key in keys]
+            found = [row for row in rows if row >= 0]
+            if not found:
+                return [None] * len(rows)
+            vectors = iter(np.asarray(self._matrix[found], dtype=np.float32))
+            return [next(vectors) if row >= 0 else None for row in rows]
+
+    def put(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors)
+        with self._lock, self._file_lock():
+            self._refresh()
+            new = {key: i for i, key in enumerate(keys) if key not in self._rows}
+            if not new:
+                return
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                tmp_path = self._path(f"{META}.tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump({"dim": self._dim, "dtype": self.dtype}, f)
+                os.replace(tmp_path, self._path(META))
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Expected {self._dim}-dimensional embeddings, got {vectors.shape[1]}")
+
+            start = len(self._rows)
+            self._reserve(start + len(new))
+            self._matrix[start:start + len(new)] = vectors[list(new.values())]
+            self._matrix.flush()
+            with open(self._path(KEYS), "ab") as f:
+                # Drop whatever a writer that crashed mid-append left after the last full key
+                f.truncate(self._keys_end)
+                data = "".join(f"{key}\n" for key in new).encode("utf-8")
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._keys_end += len(data)
+            for row, key in enumerate(new, start=start):
+                self._rows[key] = row
+
+    def size(self) -> int:
+        return len(self._rows)
+
+    @property
+    def _row_bytes(self) -> int:
+        return self._dim * np.dtype(self.dtype).itemsize
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path(LOCK), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _capacity_on_disk(self) -> int:
+        if not os.path.exists(self._path(VECTORS)):
+            return 0
+        return os.path.getsize(self._path(VECTORS)) // self._row_bytes
+
+    def _reserve(self, n_rows: int) -> None:
+        capacity = 0 if self._matrix is None else len(self._matrix)
+        if n_rows <= capacity:
+            return
+        # Another process may have grown the file already
+        capacity = self._capacity_on_disk()
+        if n_rows > capacity:
+            capacity = max(self.initial_capacity, 2 * capacity, n_rows)
+            with open(self._path(VECTORS), "ab") as f:
+                f.truncate(capacity * self._row_bytes)
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self._path(VECTORS), dtype=self.dtype, mode="r+", shape=(capacity, self._dim))
+
+    def _refresh(self) -> None:
+        """Map the rows whose keys were logged since we last read the log."""
+        if self._dim is None:
+            meta_path = self._path(META)
+            if not os.path.exists(meta_path):
+                return
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["dtype"] != self.dtype:
+                logger.warning(
+                    "[MmapEmbeddingStore] %s holds %s vectors; ignoring dtype=%s", self.root, meta["dtype"], self.dtype
+                )
+            self.dtype, self._dim = meta["dtype"], meta["dim"]
+
+        keys_path = self._path(KEYS)
+        if not os.path.exists(keys_path) or os.path.getsize(keys_path) <= self._keys_end:
+            return
+        with open(keys_path, "rb") as f:
+            f.seek(self._keys_end)
+            data = f.read()
+        # A partial last line is a key still being written, or one a crash cut short
+        lines = data.split(b"\n")[:-1]
+        # Only reachable with more keys than rows if the matrix file was truncated by hand
+        lines = lines[:max(self._capacity_on_disk() - len(self._rows), 0)]
+        if not lines:
+            return
+        start = len(self._rows)
+        self._reserve(start + len(lines))
+        for row, line in enumerate(lines, start=start):
+            self._rows[line.decode("utf-8")] = row
+        self._keys_end += sum(len(line) + 1 for line in lines)
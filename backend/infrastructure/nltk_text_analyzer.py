@@ -0,0 +1,125 @@
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, fields
+from threading import Lock
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from application.interfaces.text_analyzer import AnalyzedText, TextAnalyzer
+
+URL = r"https?://\S+|www\.\S+"
+# Letters and digits of any script, keeping combining accents inside the word
+WORD = r"[^\W_](?:[^\W_]|[\u0300-\u036f])+"
+TOKENS = re.compile(f"({URL})|{WORD}")
+# A word of any length at the end of the text, as a prefix being typed is
+LAST_WORD = re.compile(r"[^\W_](?:[^\W_]|[\u0300-\u036f])*$")
+
+
+def _normalize(word: str) -> str:
+    return unicodedata.normalize("NFC", word.lower())
+
+
+@dataclass
+class _Entry:
+    analyzed: AnalyzedText
+    content: Optional[Tuple[str, ...]] = None
+
+
+@dataclass
+class NltkTextAnalyzer(TextAnalyzer):
+    """Strips URLs, splits text into lower-case words and drops NLTK stopwords.
+
+    Stopword sets are read from NLTK once, on the first ``content_tokens``
+    call, and frozen; ``languages`` of None uses every language NLTK ships.
+    With ``detect_language`` a text is filtered with the stopwords of the
+    language it uses most stopwords of, otherwise with those of all
+    languages. Results are cached by text for the ``cache_size`` most
+    recently analyzed texts. Pickling keeps only the settings.
+    """
+    languages: Optional[Tuple[str, ...]] = None
+    detect_language: bool = False
+    cache_size: int = 100_000
+    _stopwords: Optional[Dict[str, FrozenSet[str]]] = field(default=None, init=False, repr=False)
+    _all_stopwords: FrozenSet[str] = field(default=frozenset(), init=False, repr=False)
+    _languages_of: Dict[str, Tuple[str, ...]] = field(default_factory=dict, init=False, repr=False)
+    _cache: "OrderedDict[str, _Entry]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __getstate__(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def analyze(self, text: str) -> AnalyzedText:
+        return self._entry(text).analyzed
+
+    def content_tokens(self, text: str) -> Tuple[str, ...]:
+        entry = self._entry(text)
+        if entry.content is None:
+            stopwords = self._stopwords_for(entry.analyzed.tokens)
+            entry.content = tuple(token for token in entry.analyzed.tokens if token not in stopwords)
+        return entry.content
+
+    def last_word(self, text: str) -> str:
+        match = LAST_WORD.search(text.rstrip())
+        return "" if match is None else _normalize(match.group())
+
+    def language(self, text: str) -> Optional[str]:
+        """The language whose stopwords ``text`` uses most, or None if it uses none."""
+        self._load_stopwords()
+        return self._detect(self.analyze(text).tokens)
+
+    def _entry(self, text: str) -> _Entry:
+        with self._lock:
+            entry = self._cache.get(text)
+            if entry is not None:
+                self._cache.move_to_end(text)
+                return entry
+        entry = _Entry(self._tokenize(text))
+        with self._lock:
+            self._cache[text] = entry
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _tokenize(text: str) -> AnalyzedText:
+        tokens, offsets, ends = [], [], []
+        for match in TOKENS.finditer(text):
+            if match.group(1) is None:
+                tokens.append(_normalize(match.group()))
+                offsets.append(match.start())
+                ends.append(match.end())
+        return AnalyzedText(tokens=tuple(tokens), offsets=tuple(offsets), ends=tuple(ends))
+
+    def _stopwords_for(self, tokens: Tuple[str, ...]) -> FrozenSet[str]:
+        self._load_stopwords()
+        language = self._detect(tokens) if self.detect_language else None
+        return self._all_stopwords if language is None else self._stopwords[language]
+
+    def _detect(self, tokens: Tuple[str, ...]) -> Optional[str]:
+        counts = Counter(language for token in tokens for language in self._languages_of.get(token, ()))
+        return counts.most_common(1)[0][0] if counts else None
+
+    def _load_stopwords(self) -> None:
+        if self._stopwords is not None:
+            return
+        from nltk.corpus import stopwords  # nltk pulls in scipy, so it loads on first use
+
+        with self._lock:
+            if self._stopwords is not None:
+                return
+            stopword_sets = {}
+            for language in self.languages or stopwords.fileids():
+                try:
+                    stopword_sets[language] = frozenset(stopwords.words(language))
+                except OSError:
+                    raise ValueError(f"Stopwords for language '{language}' not found in NLTK corpus.")
+            languages_of: Dict[str, Tuple[str, ...]] = {}
+            for language, words in stopword_sets.items():
+                for word in words:
+                    languages_of[word] = languages_of.get(word, ()) + (language,)
+            self._languages_of = languages_of
+            self._all_stopwords = frozenset(languages_of)
+            self._stopwords = stopword_sets
@@ -0,0 +1,184 @@
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.post import PostId
+from domain.entities.user_id import UserId
+from application.interfaces.vector_index import VectorIndex
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class _UserVectors:
+    """Contiguous, L2-normalised float32 rows for one user's posts."""
+    dim: int
+    matrix: np.ndarray = None  # (capacity, dim); rows [0, size) are in use
+    alive: np.ndarray = None  # (capacity,) False for replaced or dropped rows
+    post_ids: List[PostId] = field(default_factory=list)  # row -> post ID
+    row_by_post: Dict[PostId, int] = field(default_factory=dict)
+    # Coarse quantizer (IVF): unit centroids and the cell of every row
+    centroids: Optional[np.ndarray] = None
+    cells: np.ndarray = None  # (capacity,) int32
+    trained_size: int = 0
+    lock: RLock = field(default_factory=RLock, repr=False)
+
+    def __post_init__(self):
+        self.matrix = np.zeros((16, self.dim), dtype=np.float32)
+        self.alive = np.zeros(16, dtype=bool)
+        self.cells = np.zeros(16, dtype=np.int32)
+
+    @property
+    def size(self) -> int:
+        return len(self.post_ids)
+
+    @property
+    def n_alive(self) -> int:
+        return len(self.row_by_post)
+
+
+@dataclass
+class NumpyVectorIndex(VectorIndex):
+    """Brute-force cosine top-k over a per-user matrix, with an optional IVF stage.
+
+    A search is one matrix-vector product plus ``argpartition``. Once a user
+    has ``ivf_min_size`` vectors a spherical k-means quantizer with about
+    sqrt(n) cells is trained, and queries with a ``top_k`` only score the
+    rows of the ``nprobe`` closest cells. The quantizer is retrained when the corpus
+    doubles; rows added in between go to their nearest existing cell.
+    """
+    ivf_min_size: int = 20_000
+    nprobe: int = 8
+    kmeans_iterations: int = 10
+    _users: Dict[UserId, _UserVectors] = field(default_factory=dict, init=False, repr=False)
+
+    def add(self, user_id: UserId, post_ids: List[PostId], vectors: np.ndarray) -> None:
+        if not post_ids:
+            return
+        vectors = _normalize(vectors)
+        store = self._users.get(user_id)
+        if store is None:
+            store = self._users[user_id] = _UserVectors(dim=vectors.shape[1])
+
+        with store.lock:
+            for post_id in post_ids:
+                row = store.row_by_post.pop(post_id, None)
+                if row is not None:
+                    store.alive[row] = False
+            self._reserve(store, store.size + len(post_ids))
+            start = store.size
+            store.matrix[start:start + len(post_ids)] = vectors
+            store.alive[start:start + len(post_ids)] = True
+            for offset, post_id in enumerate(post_ids):
+                store.row_by_post[post_id] = start + offset
+            store.post_ids.extend(post_ids)
+
+            if store.centroids is not None:
+                store.cells[start:store.size] = np.argmax(vectors @ store.centroids.T, axis=1)
+            if store.n_alive >= self.ivf_min_size and store.n_alive >= 2 * store.trained_size:
+                self._train(store)
+
+    def remove(self, user_id: UserId, post_ids: List[PostId]) -> None:
+        store = self._users.get(user_id)
+        if store is None:
+            return
+        with store.lock:
+            self._drop(store, post_ids)
+
+    def sync(self, user_id: UserId, post_ids: List[PostId]) -> List[PostId]:
+        store = self._users.get(user_id)
+        if store is None:
+            return list(post_ids)
+        with store.lock:
+            wanted = set(post_ids)
+            self._drop(store, [pid for pid in store.row_by_post if pid not in wanted])
+            return [pid for pid in post_ids if pid not in store.row_by_post]
+
+    def _drop(self, store: _UserVectors, post_ids: List[PostId]) -> None:
+        for post_id in post_ids:
+            row = store.row_by_post.pop(post_id, None)
+            if row is not None:
+                store.alive[row] = False
+        if store.size > 2 * store.n_alive + 16:
+            self._compact(store)
+
+    def size(self, user_id: UserId) -> int:
+        store = self._users.get(user_id)
+        return store.n_alive if store is not None else 0
+
+    def search(self, user_id: UserId, query: np.ndarray, top_k: Optional[int]) -> List[Tuple[PostId, float]]:
+        store = self._users.get(user_id)
+        if store is None or (top_k is not None and top_k <= 0):
+            return []
+        query = _normalize(query).reshape(-1)
+
+        with store.lock:
+            # Without a top_k every row is scored, so the IVF stage is skipped
+            if store.centroids is not None and top_k is not None:
+                nprobe = min(self.nprobe, len(store.centroids))
+                probed = np.argpartition(-(store.centroids @ query), nprobe - 1)[:nprobe]
+                rows = np.flatnonzero(np.isin(store.cells[:store.size], probed) & store.alive[:store.size])
+                scores = store.matrix[rows] @ query
+            else:
+                rows = None
+                scores = store.matrix[:store.size] @ query
+                scores[~store.alive[:store.size]] = -np.inf
+                top_k = store.n_alive if top_k is None else min(top_k, store.n_alive)
+
+            top_k = min(top_k, len(scores))
+            if top_k == 0:
+                return []
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            if rows is not None:
+                return [(store.post_ids[rows[i]], float(scores[i])) for i in best]
+            return [(store.post_ids[i], float(scores[i])) for i in best]
+
+    @staticmethod
+    def _reserve(store: _UserVectors, capacity: int) -> None:
+        if capacity <= len(store.matrix):
+            return
+        new_capacity = max(capacity, 2 * len(store.matrix))
+        for name in ("matrix", "alive", "cells"):
+            old = getattr(store, name)
+            grown = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:store.size] = old[:store.size]
+            setattr(store, name, grown)
+
+    def _compact(self, store: _UserVectors) -> None:
+        rows = np.flatnonzero(store.alive[:store.size])
+        store.matrix[:len(rows)] = store.matrix[rows]
+        store.cells[:len(rows)] = store.cells[rows]
+        store.alive[:] = False
+        store.alive[:len(rows)] = True
+        store.post_ids = [store.post_ids[row] for row in rows]
+        store.row_by_post = {post_id: row for row, post_id in enumerate(store.post_ids)}
+
+    def _train(self, store: _UserVectors) -> None:
+        """Spherical k-means over the live rows."""
+        rows = np.flatnonzero(store.alive[:store.size])
+        data = store.matrix[rows]
+        n_cells = max(1, int(np.sqrt(len(rows))))
+        rng = np.random.default_rng(0)
+        # Centroids are fitted on a sample; assignment covers every row
+        sample = data[rng.choice(len(data), size=min(len(data), 64 * n_cells), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_cells, replace=False)]
+        for _ in range(self.kmeans_iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~np.bincount(assignment, minlength=n_cells).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        for start in range(0, store.size, 8192):
+            block = store.matrix[start:start + 8192][: store.size - start]
+            store.cells[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        store.centroids = centroids
+        store.trained_size = len(rows)
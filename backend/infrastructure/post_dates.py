@@ -0,0 +1,48 @@
+"""Post dates from the timestamps captured by the browser extension.
+
+LinkedIn shows relative ages ("3d", "2w", "5mo", "1yr", "2 days ago"), which
+are resolved against the time the post is indexed; ISO dates are also
+accepted.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+_EPOCH = date(1970, 1, 1)
+
+_RELATIVE = re.compile(r"^(\d+)\s*([a-z]+)")
+_UNIT_DAYS = {
+    "s": 0, "sec": 0, "second": 0,
+    "m": 0, "min": 0, "minute": 0,
+    "h": 0, "hr": 0, "hour": 0,
+    "d": 1, "day": 1,
+    "w": 7, "wk": 7, "week": 7,
+    "mo": 30, "month": 30,
+    "y": 365, "yr": 365, "year": 365,
+}
+
+
+def to_day(value: date) -> int:
+    """Days since 1970-01-01."""
+    return (value - _EPOCH).days
+
+
+def parse_post_day(timestamp: str, now: datetime) -> Optional[int]:
+    """The post date as days since 1970-01-01, or None if ``timestamp`` is not understood."""
+    text = timestamp.strip().lower()
+    if not text:
+        return None
+    try:
+        return to_day(datetime.fromisoformat(text.replace("z", "+00:00")).date())
+    except ValueError:
+        pass
+
+    match = _RELATIVE.match(text)
+    if match is None:
+        return None
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit not in _UNIT_DAYS and unit.endswith("s"):
+        unit = unit[:-1]  # "days", "mos", "yrs"
+    if unit not in _UNIT_DAYS:
+        return None
+    return to_day((now - timedelta(days=amount * _UNIT_DAYS[unit])).date())
@@ -22,6 +22,20 @@ class InMemoryPostRepository(PostRepository):
         for post in posts:
             self.add_post(post)
 
+    def remove_posts(self, user_id: UserId, post_ids: List[PostId]) -> List[PostId]:
+        removed = [
+            pid for pid in dict.fromkeys(post_ids)
+            if pid in self._by_post_id and self._by_post_id[pid].userId == user_id
+        ]
+        if removed:
+            removed_set = set(removed)
+            for pid in removed:
+                del self._by_post_id[pid]
+            self._by_user_id[user_id] = [
+                post for post in self._by_user_id.get(user_id, []) if post.id not in removed_set
+            ]
+        return removed
+
     def get_post_by_id(self, post_id: PostId) -> Optional[Post]:
         return self._by_post_id.get(post_id)
 
@@ -32,10 +46,9 @@ class InMemoryPostRepository(PostRepository):
         return self._by_user_id.get(user_id, [])
 
     def get_posts_by_user_id_and_ids(self, user_id: UserId, post_ids: List[PostId]) -> List[Post]:
-        user_posts = self._by_user_id.get(user_id, [])
-        user_post_ids = {post.id for post in user_posts}
-        filtered_post_ids = [pid for pid in post_ids if pid in user_post_ids]
-        return [self._by_post_id[pid] for pid in filtered_post_ids]
+        # One dict probe per requested ID instead of a set over all the user's posts
+        posts = (self._by_post_id.get(pid) for pid in post_ids)
+        return [post for post in posts if post is not None and post.userId == user_id]
 
     def get_posts(self) -> List[Post]:
         return list(self._by_post_id.values())
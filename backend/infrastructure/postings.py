@@ -0,0 +1,67 @@
+"""Set operations over sorted ``array('I')`` posting lists."""
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+# Below this size ratio a galloping merge beats a full vectorised pass
+GALLOP_RATIO = 8
+# Unions covering more than 1/DENSE_RATIO of the doc ID space use a bitmap
+DENSE_RATIO = 16
+
+
+def as_numpy(values: array) -> np.ndarray:
+    """Zero-copy uint32 view over a posting array."""
+    return np.frombuffer(values, dtype=np.uint32)
+
+
+def from_numpy(values: np.ndarray) -> array:
+    out = array("I")
+    out.frombytes(np.ascontiguousarray(values, dtype=np.uint32).tobytes())
+    return out
+
+
+def intersect(a: array, b: array) -> array:
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return array("I")
+    if len(a) * GALLOP_RATIO < len(b):
+        out = array("I")
+        lo = 0
+        for doc_id in a:
+            lo = bisect_left(b, doc_id, lo)
+            if lo == len(b):
+                break
+            if b[lo] == doc_id:
+                out.append(doc_id)
+        return out
+    return from_numpy(np.intersect1d(as_numpy(a), as_numpy(b), assume_unique=True))
+
+
+def union(a: array, b: array) -> array:
+    if not a:
+        return array("I", b)
+    if not b:
+        return array("I", a)
+    return from_numpy(np.union1d(as_numpy(a), as_numpy(b)))
+
+
+def union_all(lists: list[array], universe: int) -> array:
+    """Union of many posting lists of doc IDs below ``universe`` in a single pass."""
+    lists = [doc_ids for doc_ids in lists if doc_ids]
+    if len(lists) <= 1:
+        return array("I", lists[0]) if lists else array("I")
+    if sum(len(doc_ids) for doc_ids in lists) * DENSE_RATIO < universe:
+        return from_numpy(np.unique(np.concatenate([as_numpy(doc_ids) for doc_ids in lists])))
+    # Dense inputs: mark a bitmap instead of sorting the concatenation
+    mask = np.zeros(universe, dtype=bool)
+    for doc_ids in lists:
+        mask[as_numpy(doc_ids)] = True
+    return from_numpy(np.flatnonzero(mask))
+
+
+def difference(a: array, b: array) -> array:
+    if not a or not b:
+        return array("I", a)
+    return from_numpy(np.setdiff1d(as_numpy(a), as_numpy(b), assume_unique=True))
@@ -0,0 +1,256 @@
+import logging
+import multiprocessing
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.interfaces.fitted_topics import FittedTopics
+from application.interfaces.post_projector import PostProjector
+from application.interfaces.projection_jobs import ProjectionJobs
+from application.interfaces.topic_store import TopicStore
+from application.interfaces.vector_index import VectorIndex
+from application.interfaces.warm_up import WarmUp
+from domain.entities.health import ModelState
+from domain.entities.post import Post, PostId, PostProjection
+from domain.entities.projection_job import ProjectionJob
+from domain.entities.topic import Topic, UserTopics
+from domain.entities.user_id import UserId
+
+logger = logging.getLogger(__name__)
+
+# Post IDs and their embeddings, as computed by a job
+Embeddings = Tuple[List[PostId], np.ndarray]
+
+
+@dataclass
+class _EmbeddingCollector(VectorIndex):
+    """Keeps the embeddings a worker's projector computes, for the job to send back.
+
+    It holds no index of its own: the API process adds what a job sends
+    back to its vector index.
+    """
+    _added: List[Embeddings] = field(default_factory=list, init=False, repr=False)
+
+    def add(self, user_id: UserId, post_ids: List[PostId], vectors: np.ndarray) -> None:
+        self._added.append((list(post_ids), np.asarray(vectors, dtype=np.float32)))
+
+    def remove(self, user_id: UserId, post_ids: List[PostId]) -> None:
+        pass
+
+    def sync(self, user_id: UserId, post_ids: List[PostId]) -> List[PostId]:
+        return list(post_ids)
+
+    def size(self, user_id: UserId) -> int:
+        return 0
+
+    def search(self, user_id: UserId, query: np.ndarray, top_k: Optional[int]) -> List[Tuple[PostId, float]]:
+        return []
+
+    def take(self) -> Optional[Embeddings]:
+        """The embeddings added since the last call, if any."""
+        added, self._added = self._added, []
+        if not added:
+            return None
+        return [post_id for post_ids, _ in added for post_id in post_ids], np.concatenate([v for _, v in added])
+
+
+# The projector of the current worker process, built once when it starts,
+# and the collector of its embeddings when the API process wants them
+_projector: Optional[PostProjector] = None
+_embeddings: Optional[_EmbeddingCollector] = None
+
+
+def _start_worker(projector_factory: Callable[..., PostProjector], collect_embeddings: bool) -> None:
+    global _projector, _embeddings
+    if collect_embeddings:
+        _embeddings = _EmbeddingCollector()
+        _projector = projector_factory(vector_index=_embeddings)
+    else:
+        _projector = projector_factory()
+
+
+def _project(
+    posts: List[Post],
+) -> Tuple[List[PostProjection], Optional[Dict[int, Topic]], Optional[Embeddings]]:
+    if _embeddings is not None:
+        _embeddings.take()  # left over from a job that failed
+    projections = _projector.project(posts)
+    topics = None
+    if posts and isinstance(_projector, FittedTopics):
+        topics = _projector.fitted_topics(posts[0].userId)
+    return projections, topics, None if _embeddings is None else _embeddings.take()
+
+
+def _warm_up_worker() -> None:
+    if isinstance(_projector, WarmUp):
+        _projector.warm_up()
+
+
+@dataclass
+class _Job:
+    id: str
+    user_id: UserId
+    generation: int
+    future: Future
+
+    def view(self) -> ProjectionJob:
+        error = None
+        if not self.future.done():
+            status = "running" if self.future.running() else "pending"
+        elif self.future.cancelled():
+            status, error = "failed", "cancelled"
+        elif self.future.exception() is not None:
+            status, error = "failed", repr(self.future.exception())
+        else:
+            status = "done"
+        return ProjectionJob(id=self.id, generation=self.generation, status=status, error=error)
+
+
+@dataclass
+class ProcessPoolProjectionJobs(ProjectionJobs, WarmUp):
+    """Runs projections in worker processes, so the API never waits on BERTopic.
+
+    There are ``max_workers`` single-process pools and each user is pinned to
+    one of them, so the fitted state a worker's projector keeps for a user
+    is found again by the user's next job. Workers are spawned on first use
+    and build their projector with ``projector_factory``, which must be
+    picklable; ``warm_up`` starts them all and has their projectors load
+    their models. The newest ``max_finished_jobs`` finished jobs keep their
+    results; older ones are forgotten. The topics of each finished job go to
+    ``topic_store``, under the job's generation. With a ``vector_index``,
+    ``projector_factory`` is called with a ``vector_index`` keyword argument
+    that collects the embeddings each job computes, and the API process adds
+    them to its own index once the job finishes.
+    """
+    projector_factory: Callable[[], PostProjector]
+    max_workers: int = 2
+    max_finished_jobs: int = 256
+    topic_store: Optional[TopicStore] = None
+    vector_index: Optional[VectorIndex] = None
+    _pools: List[Optional[ProcessPoolExecutor]] = field(default_factory=list, init=False, repr=False)
+    _jobs: "OrderedDict[str, _Job]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _by_generation: Dict[Tuple[UserId, int], str] = field(default_factory=dict, init=False, repr=False)
+    _warm_ups: List[Future] = field(default_factory=list, init=False, repr=False)
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._pools = [None] * self.max_workers
+
+    def submit(self, user_id: UserId, generation: int, posts: List[Post]) -> ProjectionJob:
+        with self._lock:
+            job = self._jobs.get(self._by_generation.get((user_id, generation)))
+            if job is not None:
+                view = job.view()
+                if view.status != "failed":
+                    return view
+            job = _Job(
+                id=uuid.uuid4().hex,
+                user_id=user_id,
+                generation=generation,
+                future=self._submit(hash(user_id) % self.max_workers, _project, posts),
+            )
+            if self.topic_store is not None:
+                job.future.add_done_callback(partial(self._store_topics, user_id, generation))
+            if self.vector_index is not None:
+                job.future.add_done_callback(partial(self._add_embeddings, user_id))
+            self._jobs[job.id] = job
+            self._by_generation[(user_id, generation)] = job.id
+            self._forget_finished()
+            return job.view()
+
+    def status(self, user_id: UserId, job_id: str) -> Optional[ProjectionJob]:
+        job = self._job(user_id, job_id)
+        return None if job is None else job.view()
+
+    def result(self, user_id: UserId, job_id: str) -> Optional[List[PostProjection]]:
+        job = self._job(user_id, job_id)
+        if job is None or job.view().status != "done":
+            return None
+        projections, _, _ = job.future.result()
+        return projections
+
+    def wait(self, user_id: UserId, job_id: str, timeout: float) -> Optional[ProjectionJob]:
+        job = self._job(user_id, job_id)
+        if job is None:
+            return None
+        wait([job.future], timeout=timeout)
+        return job.view()
+
+    def warm_up(self) -> None:
+        with self._lock:
+            self._warm_ups = [self._submit(slot, _warm_up_worker) for slot in range(self.max_workers)]
+        for future in self._warm_ups:
+            future.result()
+
+    def model_state(self) -> ModelState:
+        warm_ups = self._warm_ups
+        if not warm_ups:
+            return "cold"
+        if any(future.done() and (future.cancelled() or future.exception()) for future in warm_ups):
+            return "failed"
+        return "ready" if all(future.done() for future in warm_ups) else "loading"
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling jobs that have not started."""
+        with self._lock:
+            for pool in self._pools:
+                if pool is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+            self._pools = [None] * self.max_workers
+
+    def _job(self, user_id: UserId, job_id: str) -> Optional[_Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def _submit(self, slot: int, fn: Callable, *args) -> Future:
+        pool = self._pools[slot]
+        if pool is not None:
+            try:
+                return pool.submit(fn, *args)
+            except BrokenProcessPool:
+                # The worker died (e.g. out of memory); its jobs have failed, start a new one
+                logger.warning("[ProcessPoolProjectionJobs] Restarting projection worker %d", slot)
+                pool.shutdown(wait=False)
+        pool = self._pools[slot] = ProcessPoolExecutor(
+            max_workers=1,
+            # Forking a process that runs threads or has loaded torch can deadlock the child
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_start_worker,
+            initargs=(self.projector_factory, self.vector_index is not None),
+        )
+        return pool.submit(fn, *args)
+
+    def _store_topics(self, user_id: UserId, generation: int, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, topics, _ = future.result()
+        if topics is not None:
+            self.topic_store.put(user_id, UserTopics(generation=generation, topics=topics))
+
+    def _add_embeddings(self, user_id: UserId, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, _, embeddings = future.result()
+        if embeddings is not None:
+            post_ids, vectors = embeddings
+            self.vector_index.add(user_id, post_ids, vectors)
+
+    def _forget_finished(self) -> None:
+        finished = [job for job in self._jobs.values() if job.future.done()]
+        for job in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+            del self._jobs[job.id]
+            key = (job.user_id, job.generation)
+            if self._by_generation.get(key) == job.id:
+                del self._by_generation[key]
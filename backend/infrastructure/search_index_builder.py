@@ -1,18 +1,156 @@
-from collections import defaultdict, Counter
-from typing import List, Set
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from domain.entities.post import PostId
 from domain.entities.search import Post
 
-from application.interfaces.search_index_builder import UserIndex, SearchIndexBuilder
+from application.interfaces.search_index_builder import NO_DATE, Postings, UserIndex, SearchIndexBuilder
 from application.interfaces.tokenizer import Tokenizer
+from infrastructure.post_dates import parse_post_day
+from infrastructure.postings import as_numpy, from_numpy
+from infrastructure.trigram_term_expander import trigrams
 
 
 class InMemorySearchIndexBuilder(SearchIndexBuilder):
     def build_index(self, posts: List[Post], tokenizer: Tokenizer) -> UserIndex:
-        index: UserIndex = defaultdict(set)
+        index = UserIndex()
+        self.add_posts(index, posts, tokenizer)
+        return index
 
-        for post in posts:
-            tokens = tokenizer.tokenize(post.text)
-            for token in set(tokens):
-                index[token].add(post.id)
+    def add_posts(self, index: UserIndex, posts: List[Post], tokenizer: Tokenizer) -> None:
+        with index.lock:
+            index.generation += 1
+            new_terms = []
+            now = datetime.now(timezone.utc)
+            for post in posts:
+                # A re-indexed post gets a fresh doc ID; the old one is tombstoned
+                self.remove_posts(index, [post.id])
 
-        return index
+                doc_id = len(index.post_ids)
+                tokens = tokenizer.tokenize_with_spans(post.text)
+                positions_by_token: Dict[str, List[int]] = {}
+                spans_by_token: Dict[str, List[Tuple[int, int]]] = {}
+                for position, (token, start, end) in enumerate(tokens):
+                    positions_by_token.setdefault(token, []).append(position)
+                    spans_by_token.setdefault(token, []).append((start, end))
+
+                for token, positions in positions_by_token.items():
+                    index.doc_freqs[token] = index.doc_freqs.get(token, 0) + 1
+                    postings = index.postings.get(token)
+                    if postings is None:
+                        postings = index.postings[token] = Postings()
+                        new_terms.append(token)
+                    else:
+                        postings.make_mutable()
+                    postings.doc_ids.append(doc_id)
+                    postings.term_freqs.append(len(positions))
+                    postings.positions.extend(positions)
+                    postings.char_offsets.extend(start for start, _ in spans_by_token[token])
+                    postings.char_ends.extend(end for _, end in spans_by_token[token])
+                    postings.position_offsets.append(len(postings.positions))
+
+                for token in dict.fromkeys(tokenizer.tokenize(getattr(post, "author", ""))):
+                    index.author_postings.setdefault(token, array("I")).append(doc_id)
+
+                self._add_facets(index, doc_id, getattr(post, "author", ""), getattr(post, "timestamp", ""), now)
+                index.post_ids.append(post.id)
+                index.doc_id_by_post[post.id] = doc_id
+                index.doc_lengths.append(len(tokens))
+                index.doc_terms.append(tuple(positions_by_token))
+                index.total_length += len(tokens)
+
+            if new_terms:
+                # Timsort merges the appended run in linear time
+                index.terms.extend(new_terms)
+                index.terms.sort()
+                self._add_trigrams(index, new_terms)
+
+    @staticmethod
+    def _add_facets(index: UserIndex, doc_id: int, author: str, timestamp: str, now: datetime) -> None:
+        ordinal = index.author_ordinals.get(author)
+        if ordinal is None:
+            ordinal = index.author_ordinals[author] = len(index.authors)
+            index.authors.append(author)
+            index.author_docs.append(array("I"))
+        index.author_docs[ordinal].append(doc_id)
+        index.doc_authors.append(ordinal)
+        day = parse_post_day(timestamp, now)
+        index.doc_days.append(NO_DATE if day is None else day)
+
+    @staticmethod
+    def _add_trigrams(index: UserIndex, terms: List[str]) -> None:
+        for term in terms:
+            for gram in trigrams(term):
+                index.trigrams.setdefault(gram, []).append(term)
+
+    def remove_posts(self, index: UserIndex, post_ids: Iterable[PostId]) -> None:
+        with index.lock:
+            for post_id in post_ids:
+                doc_id = index.doc_id_by_post.pop(post_id, None)
+                if doc_id is not None:
+                    index.generation += 1
+                    index.tombstones.add(doc_id)
+                    index.total_length -= index.doc_lengths[doc_id]
+                    for term in index.doc_terms[doc_id]:
+                        index.doc_freqs[term] -= 1
+
+    def compact(self, index: UserIndex) -> None:
+        with index.lock:
+            if not index.tombstones:
+                return
+            index.generation += 1
+            index.epoch += 1
+            alive = np.ones(len(index.post_ids), dtype=bool)
+            alive[list(index.tombstones)] = False
+            # Renumbering is monotonic, so posting lists stay sorted
+            new_doc_ids = np.cumsum(alive, dtype=np.int64) - 1
+
+            for token in list(index.postings):
+                postings = index.postings[token]
+                doc_ids = as_numpy(postings.doc_ids)
+                keep = alive[doc_ids]
+                if not keep.any():
+                    del index.postings[token]
+                    index.doc_freqs.pop(token, None)
+                    continue
+                if not keep.all():
+                    offsets = as_numpy(postings.position_offsets)
+                    lengths = np.diff(offsets)
+                    kept_positions = np.repeat(keep, lengths)
+                    postings.positions = from_numpy(as_numpy(postings.positions)[kept_positions])
+                    postings.char_offsets = from_numpy(as_numpy(postings.char_offsets)[kept_positions])
+                    postings.char_ends = from_numpy(as_numpy(postings.char_ends)[kept_positions])
+                    postings.position_offsets = from_numpy(np.concatenate(([0], np.cumsum(lengths[keep]))))
+                    postings.term_freqs = from_numpy(as_numpy(postings.term_freqs)[keep])
+                    doc_ids = doc_ids[keep]
+                postings.doc_ids = from_numpy(new_doc_ids[doc_ids])
+
+            if len(index.terms) != len(index.postings):
+                index.terms = [token for token in index.terms if token in index.postings]
+                index.trigrams = {}
+                self._add_trigrams(index, index.terms)
+
+            for token in list(index.author_postings):
+                doc_ids = as_numpy(index.author_postings[token])
+                doc_ids = doc_ids[alive[doc_ids]]
+                if len(doc_ids):
+                    index.author_postings[token] = from_numpy(new_doc_ids[doc_ids])
+                else:
+                    del index.author_postings[token]
+
+            for ordinal, doc_ids in enumerate(index.author_docs):
+                doc_ids = as_numpy(doc_ids)
+                index.author_docs[ordinal] = from_numpy(new_doc_ids[doc_ids[alive[doc_ids]]])
+            index.doc_authors = from_numpy(as_numpy(index.doc_authors)[alive])
+            days = array("i")
+            days.frombytes(np.frombuffer(index.doc_days, dtype=np.int32)[alive].tobytes())
+            index.doc_days = days
+
+            index.post_ids = [pid for pid, live in zip(index.post_ids, alive) if live]
+            index.doc_id_by_post = {pid: doc_id for doc_id, pid in enumerate(index.post_ids)}
+            index.doc_lengths = from_numpy(as_numpy(index.doc_lengths)[alive])
+            index.doc_terms = [terms for terms, live in zip(index.doc_terms, alive) if live]
+            index.tombstones = set()
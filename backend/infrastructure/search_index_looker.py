@@ -1,23 +1,380 @@
+import math
+from array import array
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from domain.entities.post import PostId
+from domain.entities.search import Facets, PostFilter
 from application.interfaces.tokenizer import Tokenizer
-from application.interfaces.search_index_lookup import SearchIndexLookup
+from application.interfaces.search_index_builder import NO_DATE, Postings, UserIndex
+from application.interfaces.search_index_lookup import SearchIndexLookup, RankedMatches
+from application.interfaces.term_expander import TermExpander
+from infrastructure.post_dates import to_day
+from infrastructure.postings import as_numpy, from_numpy, intersect, union, union_all, difference
+from infrastructure.search_query import (
+    QueryNode, Term, Phrase, Author, Not, And, Or, parse_query, scoring_terms
+)
+
+# Relative margin on score bounds, so rounding never prunes a tied doc
+PRUNING_SLACK = 1e-9
+# Below this many postings per query, plain exhaustive scoring is faster
+PRUNING_MIN_POSTINGS = 32_768
 
 
 @dataclass
 class SimpleSearchIndexLookup(SearchIndexLookup):
+    """Evaluates boolean/phrase queries and ranks the matches with Okapi BM25.
+
+    See ``infrastructure.search_query`` for the query syntax. In fuzzy mode
+    every query term is OR-ed with its ``term_expander`` corrections. Paged
+    lookups score with MaxScore pruning unless ``top_k_pruning`` is off; both
+    paths return the same ranking.
+    """
     tokenizer: Tokenizer
+    term_expander: Optional[TermExpander] = None  # enables fuzzy lookups
+    k1: float = 1.2
+    b: float = 0.75
+    top_k_pruning: bool = True
+
+    def _idf(self, token: str, index: UserIndex) -> float:
+        # Tombstoned docs stay in the postings until compaction, so the live count comes from the dictionary
+        doc_freq = index.doc_freqs.get(token, 0)
+        return math.log(1 + (index.n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
 
     def lookup(
         self,
         query: str,
-        index: Dict[str, set[str]],
-    ) -> List[PostId]:
-        tokens = self.tokenizer.tokenize(query)
-        matched_post_ids = set()
-        for token in tokens:
-            if token in index:
-                matched_post_ids.update(index[token])
-        return list(matched_post_ids)
+        index: UserIndex,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fuzzy: bool = False,
+        filters: Optional[PostFilter] = None,
+    ) -> RankedMatches:
+        node = parse_query(query, self.tokenizer)
+        if node is None:
+            return RankedMatches(matches=[], total=0)
+
+        with index.lock:
+            expansions: Dict[str, List[str]] = {}
+            if fuzzy and self.term_expander is not None:
+                node = self._expand(node, index, expansions)
+            terms = list(dict.fromkeys(scoring_terms(node)))
+
+            matched = self._evaluate(node, index)
+            allowed = self._filter_docs(filters, index) if filters is not None else None
+            if allowed is not None:
+                matched = intersect(matched, allowed)
+            matched = self._live(as_numpy(matched), index)
+            if limit is not None and self.top_k_pruning:
+                top, scores = self._top_pruned(terms, matched, index, offset + limit)
+            else:
+                scores = self._bm25(terms, index)
+                top = self._top(matched, scores, None if limit is None else offset + limit)
+            top = top[offset:]
+            matches = [(index.post_ids[doc_id], float(scores[doc_id])) for doc_id in top]
+            facets = self._facets(matched, index)
+            highlights = self._highlights(terms, top, index)
+        used = {token: terms for token, terms in expansions.items() if terms}
+        return RankedMatches(
+            matches=matches,
+            total=len(matched),
+            terms=terms,
+            expansions=used,
+            facets=facets,
+            highlights=highlights,
+        )
+
+    def filter_posts(self, filters: PostFilter, index: UserIndex) -> List[PostId]:
+        with index.lock:
+            allowed = self._filter_docs(filters, index)
+            doc_ids = self._all_docs(index) if allowed is None else allowed
+            return [index.post_ids[doc_id] for doc_id in self._live(as_numpy(doc_ids), index)]
+
+    def facets(self, post_ids: List[PostId], index: UserIndex) -> Facets:
+        with index.lock:
+            doc_ids = [index.doc_id_by_post[post_id] for post_id in post_ids if post_id in index.doc_id_by_post]
+            return self._facets(np.array(doc_ids, dtype=np.int64), index)
+
+    def _filter_docs(self, filters: PostFilter, index: UserIndex) -> Optional[array]:
+        """Sorted doc IDs passing ``filters``, or None when they filter nothing."""
+        allowed = None
+        if filters.authors:
+            allowed = array("I")
+            for author in filters.authors:
+                ordinal = index.author_ordinals.get(author)
+                if ordinal is not None:
+                    allowed = union(allowed, index.author_docs[ordinal])
+        if filters.since is not None or filters.until is not None:
+            days, doc_ids = index.get_derived("docs_by_day", lambda: self._docs_by_day(index))
+            lo = np.searchsorted(days, NO_DATE + 1 if filters.since is None else to_day(filters.since), "left")
+            hi = len(days) if filters.until is None else np.searchsorted(days, to_day(filters.until), "right")
+            in_range = from_numpy(np.sort(doc_ids[lo:hi]))
+            allowed = in_range if allowed is None else intersect(allowed, in_range)
+        return allowed
+
+    @staticmethod
+    def _docs_by_day(index: UserIndex):
+        """Doc IDs sorted by post date, with the sorted dates, for range filters."""
+        days = np.frombuffer(index.doc_days, dtype=np.int32)
+        order = np.argsort(days, kind="stable")
+        return days[order], order
+
+    @staticmethod
+    def _live(doc_ids: np.ndarray, index: UserIndex) -> np.ndarray:
+        if index.tombstones:
+            return doc_ids[~np.isin(doc_ids, list(index.tombstones))]
+        return doc_ids
+
+    def _facets(self, doc_ids: np.ndarray, index: UserIndex) -> Facets:
+        author_counts = np.bincount(as_numpy(index.doc_authors)[doc_ids], minlength=len(index.authors))
+        authors = {
+            index.authors[ordinal]: int(author_counts[ordinal])
+            for ordinal in np.argsort(-author_counts, kind="stable")
+            if author_counts[ordinal] and index.authors[ordinal]
+        }
+        doc_months, first = index.get_derived("doc_months", lambda: self._doc_months(index))
+        codes = doc_months[doc_ids]
+        month_counts = np.bincount(codes[codes >= 0])
+        months = {
+            str(np.datetime64(int(first + code), "M")): int(month_counts[code])
+            for code in np.flatnonzero(month_counts)
+        }
+        return Facets(authors=authors, months=months)
+
+    @staticmethod
+    def _doc_months(index: UserIndex):
+        """Month of each post counted from the earliest one (-1 if undated), and that month."""
+        days = np.frombuffer(index.doc_days, dtype=np.int32)
+        dated = days != NO_DATE
+        months = days[dated].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first = int(months.min()) if len(months) else 0
+        doc_months = np.full(len(days), -1, dtype=np.int64)
+        doc_months[dated] = months - first
+        return doc_months, first
+
+    @staticmethod
+    def _highlights(terms: list[str], doc_ids: np.ndarray, index: UserIndex) -> Dict[PostId, List[Tuple[int, int]]]:
+        """Character spans of the scoring terms in each of ``doc_ids``, read from the postings."""
+        postings = [p for token in terms if (p := index.postings.get(token))]
+        return {
+            index.post_ids[doc_id]: sorted(span for p in postings for span in p.spans_of(doc_id))
+            for doc_id in doc_ids.tolist()
+        }
+
+    def _expand(self, node: QueryNode, index: UserIndex, expansions: Dict[str, List[str]]) -> QueryNode:
+        """Rewrite every term as an OR of itself and its fuzzy matches; phrases stay exact."""
+        if isinstance(node, Term):
+            if node.token not in expansions:
+                expansions[node.token] = self.term_expander.expand(node.token, index)
+            if not expansions[node.token]:
+                return node
+            return Or((node,) + tuple(Term(term) for term in expansions[node.token]))
+        if isinstance(node, Not):
+            return Not(self._expand(node.child, index, expansions))
+        if isinstance(node, (And, Or)):
+            return type(node)(tuple(self._expand(child, index, expansions) for child in node.children))
+        return node
+
+    def _norm(self, doc_lengths: np.ndarray, index: UserIndex) -> np.ndarray:
+        return self.k1 * (1 - self.b + self.b * doc_lengths / (index.avg_doc_length or 1.0))
+
+    def _weight(self, idf: float, tf: np.ndarray, norm: np.ndarray) -> np.ndarray:
+        return idf * tf * (self.k1 + 1) / (tf + norm)
+
+    def _bm25(self, terms: list[str], index: UserIndex) -> np.ndarray:
+        """Term-at-a-time BM25 accumulation over the dense doc ID space."""
+        norm = self._norm(as_numpy(index.doc_lengths), index)
+        scores = np.zeros(len(index.post_ids))
+        for token in terms:
+            postings = index.postings.get(token)
+            if not postings:
+                continue
+            idf = self._idf(token, index)
+            doc_ids = as_numpy(postings.doc_ids)
+            scores[doc_ids] += self._weight(idf, as_numpy(postings.term_freqs), norm[doc_ids])
+        return scores
+
+    def _upper_bound(self, token: str, postings: Postings, index: UserIndex) -> float:
+        """Highest BM25 score ``token`` can contribute to any doc.
+
+        The score grows with the term frequency and shrinks with the doc
+        length, so the largest frequency and the shortest doc of the list
+        bound it. Both are cached until the index changes.
+        """
+        stats = index.get_derived("term_bounds", dict)
+        if token not in stats:
+            doc_lengths = as_numpy(index.doc_lengths)[as_numpy(postings.doc_ids)]
+            stats[token] = (int(as_numpy(postings.term_freqs).max()), int(doc_lengths.min()))
+        max_tf, min_length = stats[token]
+        idf = self._idf(token, index)
+        return float(self._weight(idf, np.float64(max_tf), self._norm(np.float64(min_length), index)))
+
+    def _top_pruned(
+        self, terms: list[str], matched: np.ndarray, index: UserIndex, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``k`` of ``matched`` with MaxScore pruning, and their scores.
+
+        Lists are scored by decreasing upper bound. Once the bounds of the
+        lists left sum below the k-th best partial score, a doc missing from
+        every list seen so far cannot reach the top ``k``: the remaining lists
+        are only probed for the current candidates, which are dropped as soon
+        as their best reachable score falls below that threshold. Survivors
+        are rescored in query order, so scores and ties match ``_bm25``.
+        """
+        present = {token: p for token in terms if (p := index.postings.get(token))}
+        if len(present) < 2 or len(matched) <= k or sum(map(len, present.values())) < PRUNING_MIN_POSTINGS:
+            scores = self._bm25(terms, index)
+            return self._top(matched, scores, k), scores
+        lists = sorted(
+            ((token, p, self._upper_bound(token, p, index)) for token, p in present.items()),
+            key=lambda item: -item[2],
+        )
+        # remaining[j]: the most the lists from j on can add to a doc's score
+        remaining = np.append(np.cumsum([bound for _, _, bound in lists][::-1])[::-1], 0.0)
+
+        doc_lengths = as_numpy(index.doc_lengths)
+        in_matched = np.zeros(len(index.post_ids), dtype=bool)
+        in_matched[matched] = True
+        scores = np.zeros(len(index.post_ids))
+        scored = []
+        cutoff = 0.0  # the k-th best partial score so far, less the rounding slack
+        j = 0
+        while j < len(lists) and remaining[j] >= cutoff:
+            token, postings, _ = lists[j]
+            doc_ids = as_numpy(postings.doc_ids)
+            idf = self._idf(token, index)
+            scores[doc_ids] += self._weight(idf, as_numpy(postings.term_freqs), self._norm(doc_lengths[doc_ids], index))
+            scored.append(doc_ids)
+            j += 1
+            # Any k matched docs of this list bound the k-th best score from below
+            partial = scores[doc_ids[in_matched[doc_ids]]]
+            if len(partial) >= k:
+                cutoff = max(cutoff, np.partition(partial, len(partial) - k)[len(partial) - k] * (1 - PRUNING_SLACK))
+
+        if j == len(lists):
+            candidates = matched[scores[matched] >= cutoff]
+        else:
+            # Docs outside the scored lists are out of reach, as remaining[j] < cutoff
+            candidates = np.unique(np.concatenate(scored)) if len(scored) > 1 else scored[0]
+            candidates = candidates[in_matched[candidates]]
+            candidates = candidates[scores[candidates] + remaining[j] >= cutoff]
+        for token, postings, _ in lists[j:]:
+            docs, tf = self._probe(postings, candidates)
+            idf = self._idf(token, index)
+            scores[docs] += self._weight(idf, tf, self._norm(doc_lengths[docs], index))
+            j += 1
+            partial = scores[candidates]
+            if len(candidates) > k:
+                cutoff = max(cutoff, np.partition(partial, len(partial) - k)[len(partial) - k] * (1 - PRUNING_SLACK))
+            candidates = candidates[partial + remaining[j] >= cutoff]
+
+        exact = np.zeros(len(index.post_ids))
+        for token in terms:
+            postings = index.postings.get(token)
+            if postings:
+                docs, tf = self._probe(postings, candidates)
+                idf = self._idf(token, index)
+                exact[docs] += self._weight(idf, tf, self._norm(doc_lengths[docs], index))
+        return self._top(candidates, exact, k), exact
+
+    @staticmethod
+    def _probe(postings: Postings, doc_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The docs of ``doc_ids`` present in ``postings``, with their term frequencies."""
+        listed = as_numpy(postings.doc_ids)
+        rows = np.minimum(np.searchsorted(listed, doc_ids), len(listed) - 1)
+        hit = listed[rows] == doc_ids
+        return doc_ids[hit], as_numpy(postings.term_freqs)[rows[hit]]
+
+    def _evaluate(self, node: QueryNode, index: UserIndex) -> array:
+        """Sorted doc IDs matching ``node``; tombstones are filtered by the caller."""
+        if isinstance(node, Term):
+            postings = index.postings.get(node.token)
+            return postings.doc_ids if postings else array("I")
+        if isinstance(node, Phrase):
+            return self._evaluate_phrase(node, index)
+        if isinstance(node, Author):
+            lists = sorted((index.author_postings.get(t, array("I")) for t in node.tokens), key=len)
+            return self._intersect_all(lists)
+        if isinstance(node, Or):
+            return union_all([self._evaluate(child, index) for child in node.children], len(index.post_ids))
+        if isinstance(node, And):
+            return self._evaluate_and(node, index)
+        # A bare negation matches every post except the excluded ones
+        return difference(self._all_docs(index), self._evaluate(node.child, index))
+
+    def _evaluate_and(self, node: And, index: UserIndex) -> array:
+        positives = sorted(
+            (child for child in node.children if not isinstance(child, Not)),
+            key=lambda child: self._estimate(child, index),
+        )
+        negatives = [child.child for child in node.children if isinstance(child, Not)]
+
+        # Smallest operand first, so intersections only ever shrink
+        result = self._evaluate(positives[0], index) if positives else self._all_docs(index)
+        for child in positives[1:]:
+            if not result:
+                return result
+            result = intersect(result, self._evaluate(child, index))
+        for child in negatives:
+            if not result:
+                return result
+            result = difference(result, self._evaluate(child, index))
+        return result
+
+    def _evaluate_phrase(self, node: Phrase, index: UserIndex) -> array:
+        postings = [index.postings.get(token) for token in node.tokens]
+        if any(p is None for p in postings):
+            return array("I")
+        candidates = self._intersect_all(sorted((p.doc_ids for p in postings), key=len))
+
+        result = array("I")
+        for doc_id in candidates:
+            # Phrase start positions consistent with every token seen so far
+            starts = set(postings[0].positions_of(doc_id))
+            for offset, p in enumerate(postings[1:], start=1):
+                starts.intersection_update(pos - offset for pos in p.positions_of(doc_id))
+                if not starts:
+                    break
+            if starts:
+                result.append(doc_id)
+        return result
+
+    def _estimate(self, node: QueryNode, index: UserIndex) -> int:
+        """Upper bound on the number of docs matching ``node``."""
+        if isinstance(node, Term):
+            return len(index.postings.get(node.token, ()))
+        if isinstance(node, Phrase):
+            return min(len(index.postings.get(token, ())) for token in node.tokens)
+        if isinstance(node, Author):
+            return min(len(index.author_postings.get(token, ())) for token in node.tokens)
+        if isinstance(node, Or):
+            return sum(self._estimate(child, index) for child in node.children)
+        if isinstance(node, And):
+            positives = [c for c in node.children if not isinstance(c, Not)]
+            return min((self._estimate(c, index) for c in positives), default=len(index.post_ids))
+        return len(index.post_ids)
+
+    @staticmethod
+    def _intersect_all(lists: list[array]) -> array:
+        result = lists[0] if lists else array("I")
+        for doc_ids in lists[1:]:
+            if not result:
+                break
+            result = intersect(result, doc_ids)
+        return result
+
+    @staticmethod
+    def _all_docs(index: UserIndex) -> array:
+        return from_numpy(np.arange(len(index.post_ids)))
+
+    @staticmethod
+    def _top(doc_ids: np.ndarray, scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+        """Best ``k`` doc IDs by score; ties are broken by doc ID so pages are stable."""
+        if k is not None and k < len(doc_ids):
+            # Keep everything tied with the k-th best score before the exact sort
+            threshold = np.partition(scores[doc_ids], len(doc_ids) - k)[len(doc_ids) - k]
+            doc_ids = doc_ids[scores[doc_ids] >= threshold]
+        order = np.lexsort((doc_ids, -scores[doc_ids]))
+        return doc_ids[order][:k]
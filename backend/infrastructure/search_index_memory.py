@@ -0,0 +1,68 @@
+"""Memory accounting for user search indexes."""
+import sys
+from array import array
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Set
+
+from application.interfaces.search_index_builder import UserIndex
+
+
+@dataclass(frozen=True)
+class IndexMemoryReport:
+    n_posts: int
+    n_tokens: int
+    n_postings: int
+    compact_bytes: int  # current integer doc ID layout
+    legacy_bytes: int  # equivalent Dict[str, set[str]] layout
+
+    @property
+    def compact_bytes_per_post(self) -> float:
+        return self.compact_bytes / self.n_posts if self.n_posts else 0.0
+
+    @property
+    def legacy_bytes_per_post(self) -> float:
+        return self.legacy_bytes / self.n_posts if self.n_posts else 0.0
+
+    @property
+    def savings_ratio(self) -> float:
+        return self.legacy_bytes / self.compact_bytes if self.compact_bytes else 0.0
+
+
+def deep_getsizeof(obj: Any, seen: Set[int] | None = None) -> int:
+    """Approximate retained size of ``obj``, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_getsizeof(k, seen) + deep_getsizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_getsizeof(item, seen) for item in obj)
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        size += sum(
+            deep_getsizeof(getattr(obj, f.name), seen) for f in fields(obj) if f.name != "lock"
+        )
+    # array and str report their buffers through sys.getsizeof
+    return size
+
+
+def legacy_layout(index: UserIndex) -> Dict[str, set]:
+    """Rebuild the token -> set of post ID strings layout used before doc IDs."""
+    return {
+        token: {index.post_ids[doc_id] for doc_id in postings.doc_ids if doc_id not in index.tombstones}
+        for token, postings in index.postings.items()
+    }
+
+
+def memory_report(index: UserIndex) -> IndexMemoryReport:
+    with index.lock:
+        # Post ID and token strings are shared by both layouts, so each
+        # measurement starts from a fresh ``seen`` set and counts them once.
+        return IndexMemoryReport(
+            n_posts=index.n_docs,
+            n_tokens=len(index.postings),
+            n_postings=sum(len(postings) for postings in index.postings.values()),
+            compact_bytes=deep_getsizeof(index),
+            legacy_bytes=deep_getsizeof(legacy_layout(index)),
+        )
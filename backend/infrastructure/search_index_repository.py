@@ -4,6 +4,7 @@ from typing import Dict, Optional
 from application.interfaces.search_index_repository import (
     SearchIndexRepository, UserIndex, Index
 )
+from domain.entities.post import PostId
 from domain.entities.user_id import UserId
 
 
@@ -24,12 +25,16 @@ class InMemorySearchIndexRepository(SearchIndexRepository):
         """Retrieve the index for a given user, or None if not exists."""
         return self._storage.get(user_id)
 
-    def get_post_ids_by_token(self, user_id: UserId, token: str) -> Optional[list[int]]:
+    def get_post_ids_by_token(self, user_id: UserId, token: str) -> Optional[list[PostId]]:
         """Retrieve the list of post IDs for a given user and token, or None if not exists."""
         user_index = self._storage.get(user_id)
-        if user_index is None:
+        if user_index is None or token not in user_index.postings:
             return None
-        return user_index.get(token)
+        return [
+            user_index.post_ids[doc_id]
+            for doc_id in user_index.postings[token].doc_ids
+            if doc_id not in user_index.tombstones
+        ]
 
     def list_all_indexes(self) -> Dict[UserId, UserIndex]:
         """Return all user indexes (for debugging or admin purposes)."""
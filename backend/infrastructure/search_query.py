@@ -0,0 +1,176 @@
+"""Parser for the search query language.
+
+Supported syntax::
+
+    machine learning          either term (implicit OR, ranked by BM25)
+    machine AND learning      both terms
+    "machine learning"        exact phrase
+    python NOT java, -java    exclusion
+    author:jane, author:"jane doe"
+    (rust OR go) AND "web assembly"
+
+``AND`` binds tighter than ``OR``. Exclusions and ``author:`` filters always
+restrict the group they appear in, so ``python author:jane`` means Python
+posts by Jane. Malformed input never raises: unbalanced parentheses and
+quotes are closed implicitly and words that produce no tokens are dropped.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from application.interfaces.tokenizer import Tokenizer
+
+
+@dataclass(frozen=True)
+class Term:
+    token: str
+
+
+@dataclass(frozen=True)
+class Phrase:
+    tokens: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Author:
+    tokens: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    child: "QueryNode"
+
+
+@dataclass(frozen=True)
+class And:
+    children: Tuple["QueryNode", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: Tuple["QueryNode", ...]
+
+
+QueryNode = Union[Term, Phrase, Author, Not, And, Or]
+
+_LEXER = re.compile(
+    r'\s*(?:'
+    r'(?P<lparen>\()|(?P<rparen>\))'
+    r'|author:(?:"(?P<author_phrase>[^"]*)"?|(?P<author_word>[^\s()"]+))'
+    r'|"(?P<phrase>[^"]*)"?'
+    r'|(?P<minus>-)(?=[^\s()])'
+    r'|(?P<word>[^\s()"]+)'
+    r')'
+)
+
+
+def scoring_terms(node: Optional[QueryNode]) -> List[str]:
+    """Tokens of the non-negated terms and phrases, in query order."""
+    if isinstance(node, Term):
+        return [node.token]
+    if isinstance(node, Phrase):
+        return list(node.tokens)
+    if isinstance(node, (And, Or)):
+        return [token for child in node.children for token in scoring_terms(child)]
+    return []
+
+
+def parse_query(query: str, tokenizer: Tokenizer) -> Optional[QueryNode]:
+    """Parse ``query`` into a query tree, or None if it contains no searchable terms."""
+    return _Parser(_lex(query), tokenizer).parse()
+
+
+def _lex(query: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for match in _LEXER.finditer(query):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        if kind in ("author_phrase", "author_word"):
+            kind = "author"
+        tokens.append((kind, match.group(match.lastgroup)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, str]], tokenizer: Tokenizer):
+        self.tokens = tokens
+        self.pos = 0
+        self.tokenizer = tokenizer
+
+    def parse(self) -> Optional[QueryNode]:
+        children = []
+        while self._peek() is not None:
+            if self._peek()[0] == "rparen":  # stray closing parenthesis
+                self.pos += 1
+                continue
+            children.append(self._parse_or())
+        return _combine_or(children)
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _is_operator(self, name: str) -> bool:
+        token = self._peek()
+        return token is not None and token == ("word", name)
+
+    def _parse_or(self) -> Optional[QueryNode]:
+        children = [self._parse_and()]
+        while self._peek() is not None and self._peek()[0] != "rparen":
+            if self._is_operator("OR"):
+                self.pos += 1
+            children.append(self._parse_and())
+        return _combine_or(children)
+
+    def _parse_and(self) -> Optional[QueryNode]:
+        children = [self._parse_unary()]
+        while self._is_operator("AND"):
+            self.pos += 1
+            children.append(self._parse_unary())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def _parse_unary(self) -> Optional[QueryNode]:
+        if self._is_operator("NOT") or (self._peek() or ("",))[0] == "minus":
+            self.pos += 1
+            child = self._parse_unary()
+            return Not(child) if child is not None else None
+        return self._parse_atom()
+
+    def _parse_atom(self) -> Optional[QueryNode]:
+        token = self._peek()
+        if token is None or token[0] == "rparen":
+            return None
+        self.pos += 1
+        kind, value = token
+        if kind == "lparen":
+            node = self._parse_or()
+            if self._peek() is not None and self._peek()[0] == "rparen":
+                self.pos += 1
+            return node
+        tokens = tuple(self.tokenizer.tokenize(value))
+        if not tokens:
+            return None
+        if kind == "author":
+            return Author(tokens)
+        # A word such as "node.js" tokenizes into several tokens and is matched as a phrase
+        return Term(tokens[0]) if len(tokens) == 1 else Phrase(tokens)
+
+
+def _combine_or(children: List[Optional[QueryNode]]) -> Optional[QueryNode]:
+    children = [child for child in children if child is not None]
+    positives = [child for child in children if not isinstance(child, (Not, Author))]
+    constraints = [child for child in children if isinstance(child, (Not, Author))]
+
+    if not positives:
+        group = None
+    elif len(positives) == 1:
+        group = positives[0]
+    else:
+        group = Or(tuple(positives))
+
+    if not constraints:
+        return group
+    return And(tuple(([group] if group is not None else []) + constraints))
@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field, fields
+from threading import Lock
+from typing import TYPE_CHECKING, List, Literal, Optional
+
+import numpy as np
+
+from application.interfaces.text_embedder import TextEmbedder
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+@dataclass
+class SentenceTransformerEmbedder(TextEmbedder):
+    """A sentence-transformers model, run with PyTorch or with ONNX Runtime.
+
+    With ``backend="onnx"`` the model is loaded from ``onnx_file`` in the
+    model repository; the default is its int8 dynamically quantized export,
+    which is several times faster on CPUs. That backend needs the
+    ``sentence-transformers[onnx]`` extra. ``threads`` of 0 keeps the
+    runtime's default. Pickling keeps only the settings.
+    """
+    model_name: str = "all-MiniLM-L6-v2"
+    backend: Literal["torch", "onnx"] = "torch"
+    onnx_file: str = "onnx/model_quint8_avx2.onnx"
+    batch_size: int = 32
+    threads: int = 0
+    _model: Optional["SentenceTransformer"] = field(default=None, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        # The PyTorch model keeps the bare name, so existing stored embeddings stay valid
+        return self.model_name if self.backend == "torch" else f"{self.model_name}@{self.onnx_file}"
+
+    def __getstate__(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def load(self) -> None:
+        with self._lock:
+            if self._model is not None:
+                return
+            from sentence_transformers import SentenceTransformer
+
+            model_kwargs = {}
+            if self.backend == "onnx":
+                model_kwargs["file_name"] = self.onnx_file
+                if self.threads:
+                    import onnxruntime
+
+                    options = onnxruntime.SessionOptions()
+                    options.intra_op_num_threads = self.threads
+                    model_kwargs["session_options"] = options
+            elif self.threads:
+                import torch
+
+                torch.set_num_threads(self.threads)
+            self._model = SentenceTransformer(self.model_name, backend=self.backend, model_kwargs=model_kwargs)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        embeddings = self._model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+        return np.asarray(embeddings, dtype=np.float32)
@@ -1,25 +1,55 @@
+from dataclasses import dataclass
 from typing import List, Tuple, Dict
 
+from application.interfaces.snippet_builder import SnippetBuilder
 from domain.entities.search import SearchResult, Post
 
 
-class SimpleSnippetBuilder:
-    def __init__(self, posts_by_id: Dict[str, Post]):
-        self.posts = posts_by_id
+@dataclass
+class SimpleSnippetBuilder(SnippetBuilder):
+    """Cuts ``width`` characters around the densest run of highlighted terms.
 
-    def build(self, matches: List[Tuple[str, float]], tokens: List[str]) -> List[SearchResult]:
+    Spans come from the index postings, so the text is never searched again;
+    the returned highlights are relative to the snippet.
+    """
+    width: int = 80
+
+    def build(
+        self,
+        matches: List[Tuple[str, float]],
+        highlights: Dict[str, List[Tuple[int, int]]],
+        posts: Dict[str, Post],
+    ) -> List[SearchResult]:
         results = []
         for post_id, score in matches:
-            text = self.posts[post_id].text
-            snippet = self._make_snippet(text, tokens)
-            results.append(SearchResult(post_id, score, snippet))
+            post = posts.get(post_id)
+            if post is None:
+                results.append(SearchResult(post_id, score, ""))
+                continue
+            snippet, spans = self._make_snippet(post.text, highlights.get(post_id, []))
+            results.append(SearchResult(post_id, score, snippet, highlights=spans))
         return results
 
-    def _make_snippet(self, text: str, tokens: List[str]) -> str:
-        for token in tokens:
-            idx = text.lower().find(token)
-            if idx != -1:
-                start = max(0, idx - 40)
-                end = min(len(text), idx + 40)
-                return text[start:end]
-        return text[:80]
+    def _make_snippet(self, text: str, spans: List[Tuple[int, int]]) -> Tuple[str, List[Tuple[int, int]]]:
+        if not spans:
+            return text[:self.width], []
+        first, last = self._densest(spans)
+        # Center the run in the window, then keep the window inside the text
+        slack = max(0, self.width - (spans[last][1] - spans[first][0]))
+        start = max(0, spans[first][0] - slack // 2)
+        end = min(len(text), start + self.width)
+        start = max(0, end - self.width)
+        visible = [
+            (max(s, start) - start, min(e, end) - start) for s, e in spans if s < end and e > start
+        ]
+        return text[start:end], visible
+
+    def _densest(self, spans: List[Tuple[int, int]]) -> Tuple[int, int]:
+        """First and last index of the most spans that fit in one window, earliest run first."""
+        best, lo = (0, 0), 0
+        for hi, (_, end) in enumerate(spans):
+            while lo < hi and end - spans[lo][0] > self.width:
+                lo += 1
+            if hi - lo > best[1] - best[0]:
+                best = (lo, hi)
+        return best
@@ -1,8 +1,18 @@
-import re
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Tuple
 
+from application.interfaces.text_analyzer import TextAnalyzer
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
 
+
+@dataclass
 class SimpleTokenizer:
+    # Shared with the other consumers of post text, whose tokens it caches
+    analyzer: TextAnalyzer = field(default_factory=NltkTextAnalyzer)
+
     def tokenize(self, text: str) -> List[str]:
-        text = text.lower()
-        return re.findall(r"[a-z0-9]{2,}", text)
+        return list(self.analyzer.analyze(text).tokens)
+
+    def tokenize_with_spans(self, text: str) -> List[Tuple[str, int, int]]:
+        analyzed = self.analyzer.analyze(text)
+        return list(zip(analyzed.tokens, analyzed.offsets, analyzed.ends))
@@ -1,14 +1,15 @@
+from collections import Counter
 from io import BytesIO
 from dataclasses import dataclass, field
 from hashlib import sha256
 from enum import Enum
-import re
 
-from wordcloud import WordCloud, STOPWORDS
-from nltk.corpus import stopwords
+from wordcloud import WordCloud
 
 from domain.entities.post import Post
 from application.interfaces.post_wordcloud_projector import PostWordCloudProjector
+from application.interfaces.text_analyzer import TextAnalyzer
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
 
 
 class WordCloudFormat(Enum):
@@ -23,7 +24,8 @@ class SimpleWordCloudProjector(PostWordCloudProjector):
     height: int = 200
     background_color: str = 'white'
     format: WordCloudFormat = WordCloudFormat.PNG
-    languages: list[str] = None
+    # Words are counted without URLs and stopwords
+    analyzer: TextAnalyzer = field(default_factory=NltkTextAnalyzer)
     _cache: dict[str, bytes] = field(default_factory=dict, init=False, repr=False)
 
     def _cache_key(self, posts: list[Post]) -> str:
@@ -32,20 +34,6 @@ class SimpleWordCloudProjector(PostWordCloudProjector):
         key = f"{post_ids}-{self.format.value}-{self.width}x{self.height}"
         return sha256(key.encode('utf-8')).hexdigest()
 
-    @staticmethod
-    def _compute_stopwords(languages: list[str] | None) -> set[str]:
-        all_stopwords = set(STOPWORDS)
-        if languages is None:
-            langs = stopwords.fileids()
-        else:
-            langs = languages
-        for lang in langs:
-            try:
-                all_stopwords.update(stopwords.words(lang))
-            except OSError:
-                raise ValueError(f"Stopwords for language '{lang}' not found in NLTK corpus.")
-        return all_stopwords
-
     def compute_word_cloud(self, posts: list[Post]) -> bytes:
         if not posts:
             raise ValueError("No posts provided for word cloud generation.")
@@ -55,12 +43,9 @@ class SimpleWordCloudProjector(PostWordCloudProjector):
         if cache_key in self._cache:
             return self._cache[cache_key]
 
-        texts = ' '.join([post.text for post in posts])
-        # Remove URLs from the text
-        texts = re.sub(r'https?://\S+|www\.\S+', '', texts)
-
-        # Collect stopwords from all specified languages, or all if languages is None
-        all_stopwords = self._compute_stopwords(self.languages)
+        frequencies = Counter(
+            token for post in posts for token in self.analyzer.content_tokens(post.text)
+        )
 
         if self.format.value not in {f.value for f in WordCloudFormat}:
             raise ValueError(
@@ -72,8 +57,7 @@ class SimpleWordCloudProjector(PostWordCloudProjector):
             width=self.width,
             height=self.height,
             background_color=self.background_color,
-            stopwords=all_stopwords
-        ).generate(texts)
+        ).generate_from_frequencies(frequencies)
 
         img_bytes = BytesIO()
         if self.format == WordCloudFormat.SVG:
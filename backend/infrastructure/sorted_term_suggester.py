@@ -0,0 +1,61 @@
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List
+
+from domain.entities.search import TermSuggestion
+from application.interfaces.search_index_builder import UserIndex
+from application.interfaces.term_suggester import TermSuggester
+from application.interfaces.text_analyzer import TextAnalyzer
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
+
+
+@dataclass
+class SortedTermSuggester(TermSuggester):
+    """Completes prefixes from the index's sorted term list.
+
+    Terms are ranked by the number of live posts containing them, kept in
+    the index's ``doc_freqs`` so no posting list is read; terms only found
+    in deleted posts are never suggested. Narrow prefixes take the top
+    terms of their bisected range directly. Broad ones (a single letter can
+    match most of the vocabulary) instead walk the vocabulary in decreasing
+    doc frequency and stop at ``limit`` hits; that ordering is derived
+    lazily once per index generation.
+    """
+    # Normalizes the prefix as the indexed terms were normalized
+    analyzer: TextAnalyzer = field(default_factory=NltkTextAnalyzer)
+
+    def suggest(self, prefix: str, index: UserIndex, limit: int = 10) -> List[TermSuggestion]:
+        # Only the word being typed is completed
+        word = self.analyzer.last_word(prefix)
+        if not word:
+            return []
+
+        with index.lock:
+            start = bisect_left(index.terms, word)
+            end = bisect_left(index.terms, word + "\U0010ffff", lo=start)
+            n_matches = end - start
+            if not n_matches:
+                return []
+
+            # Expected terms visited by the frequency walk vs. the size of the range
+            if limit * len(index.terms) / n_matches < n_matches:
+                by_freq = index.get_derived("terms_by_freq", lambda: self._terms_by_freq(index))
+                best = []
+                for term in by_freq:
+                    if term.startswith(word):
+                        best.append(term)
+                        if len(best) == limit:
+                            break
+            else:
+                best = heapq.nlargest(
+                    limit,
+                    (term for term in index.terms[start:end] if index.doc_freqs.get(term, 0) > 0),
+                    key=lambda term: index.doc_freqs[term],
+                )
+            return [TermSuggestion(term=term, doc_freq=index.doc_freqs[term]) for term in best]
+
+    @staticmethod
+    def _terms_by_freq(index: UserIndex) -> List[str]:
+        live = [term for term in index.terms if index.doc_freqs.get(term, 0) > 0]
+        return sorted(live, key=lambda term: index.doc_freqs[term], reverse=True)
@@ -0,0 +1,79 @@
+import os
+from dataclasses import dataclass, field, fields
+from threading import Lock
+from typing import Any, List, Optional
+
+import numpy as np
+
+from application.interfaces.text_embedder import TextEmbedder
+
+
+@dataclass
+class StaticTokenEmbedder(TextEmbedder):
+    """Embeds a text as the mean of precomputed vectors of its tokens.
+
+    The vectors are the input token embeddings of ``model_name``, centred so
+    the component every token shares does not dominate the means. No
+    transformer runs at encode time, so this is orders of magnitude faster
+    than the full model at a cost in quality. Given ``vectors_path`` the
+    table is saved there on first load and read back on later ones.
+    """
+    model_name: str = "all-MiniLM-L6-v2"
+    vectors_path: Optional[str] = None
+    batch_size: int = 1024
+    _tokenizer: Any = field(default=None, init=False, repr=False)
+    _vectors: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"static:{self.model_name}"
+
+    def __getstate__(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def _hub_id(self) -> str:
+        # sentence-transformers resolves bare names in its own organisation
+        return self.model_name if "/" in self.model_name else f"sentence-transformers/{self.model_name}"
+
+    def load(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                return
+            from transformers import AutoTokenizer
+
+            self._tokenizer = AutoTokenizer.from_pretrained(self._hub_id)
+            if self.vectors_path and os.path.exists(self.vectors_path):
+                self._vectors = np.load(self.vectors_path, mmap_mode="r")
+                return
+            from transformers import AutoModel
+
+            table = AutoModel.from_pretrained(self._hub_id).get_input_embeddings().weight.detach().numpy()
+            vectors = np.asarray(table - table.mean(axis=0), dtype=np.float32)
+            if self.vectors_path:
+                os.makedirs(os.path.dirname(self.vectors_path) or ".", exist_ok=True)
+                np.save(self.vectors_path, vectors)
+            self._vectors = vectors
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        return np.concatenate(
+            [self._encode_batch(texts[start:start + self.batch_size]) for start in range(0, len(texts), self.batch_size)]
+            or [np.zeros((0, self._vectors.shape[1]), dtype=np.float32)]
+        )
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        ids = self._tokenizer(texts, add_special_tokens=False)["input_ids"]
+        lengths = np.fromiter(map(len, ids), dtype=np.int64, count=len(ids))
+        token_ids = np.fromiter((i for row in ids for i in row), dtype=np.int64, count=int(lengths.sum()))
+        means = np.zeros((len(ids), self._vectors.shape[1]), dtype=np.float32)
+        nonempty = lengths > 0
+        if nonempty.any():
+            starts = (np.cumsum(lengths) - lengths)[nonempty]
+            means[nonempty] = np.add.reduceat(self._vectors[token_ids], starts, axis=0) / lengths[nonempty, None]
+        norms = np.linalg.norm(means, axis=1, keepdims=True)
+        return means / np.maximum(norms, 1e-12)
@@ -0,0 +1,76 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from application.interfaces.search_index_builder import UserIndex
+from application.interfaces.term_expander import TermExpander
+
+
+def trigrams(term: str) -> List[str]:
+    """Distinct character trigrams of ``term``, padded so word boundaries count."""
+    padded = f"${term}$"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def bounded_edit_distance(a: str, b: str, max_edits: int) -> Optional[int]:
+    """Optimal string alignment distance (edits plus adjacent transpositions).
+
+    Returns None as soon as the distance is known to exceed ``max_edits``.
+    """
+    if abs(len(a) - len(b)) > max_edits:
+        return None
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    previous_min = 0
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+        current_min = min(current)
+        # A transposition can still reach back one row, hence the previous row check
+        if current_min > max_edits and previous_min >= max_edits:
+            return None
+        before_previous, previous, previous_min = previous, current, current_min
+    return previous[-1] if previous[-1] <= max_edits else None
+
+
+@dataclass
+class TrigramTermExpander(TermExpander):
+    """Finds typo corrections for a query token in the user's term dictionary.
+
+    Candidates are narrowed with the index's trigram -> terms map: an
+    insertion, deletion or substitution breaks at most 3 of the token's
+    trigrams and an adjacent transposition at most 4, so a term within
+    ``k`` edits shares at least ``|trigrams(token)| - 4k`` trigrams with the
+    token. Only those candidates pay for the edit distance check.
+    Short tokens allow fewer edits (one per three characters) so that
+    two-letter words are never rewritten.
+    """
+    max_edits: int = 2
+    max_expansions: int = 3
+
+    def expand(self, token: str, index: UserIndex) -> List[str]:
+        max_edits = min(self.max_edits, len(token) // 3)
+        if max_edits == 0 or self.max_expansions == 0:
+            return []
+        grams = trigrams(token)
+        min_shared = max(1, len(grams) - 4 * max_edits)
+
+        with index.lock:
+            shared = Counter()
+            for gram in grams:
+                shared.update(index.trigrams.get(gram, ()))
+
+            scored = []
+            for term, count in shared.items():
+                if count < min_shared or term == token:
+                    continue
+                distance = bounded_edit_distance(token, term, max_edits)
+                if distance is not None:
+                    scored.append((distance, -index.doc_freqs.get(term, 0), term))
+        # Closest first, then most frequent
+        return [term for _, _, term in sorted(scored)[:self.max_expansions]]
@@ -4,32 +4,58 @@ This script initializes and runs the FastAPI app with clean architecture setup.
 """
 
 import logging
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
 
 from dotenv import load_dotenv
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 import uvicorn
 from vyper import v
 
 from application.use_cases.search_posts import SearchPosts
+from application.use_cases.suggest_terms import SuggestTerms
+from application.use_cases.semantic_search_posts import SemanticSearchPosts
 from application.use_cases.get_popular_authors import GetPopularAuthors
 from application.use_cases.compute_projection import ComputeProjection
 from application.use_cases.compute_word_cloud import ComputeWordCloud
+from application.use_cases.get_topics import GetTopics
 from application.use_cases.get_posts import GetPostsUseCase
 from application.use_cases.save_posts import SavePostsUseCase
+from application.use_cases.delete_posts import DeletePostsUseCase
+from application.use_cases.check_health import CheckHealth
 from infrastructure.fastapi.fastapi import AppBuilder
 from infrastructure.fastapi.search_posts_api import SearchPostsAPIImpl
+from infrastructure.fastapi.suggest_terms_api import SuggestTermsAPIImpl
+from infrastructure.fastapi.semantic_search_posts_api import SemanticSearchPostsAPIImpl
 from infrastructure.fastapi.get_most_popular_authors_api import GetPopularAuthorsAPIImpl
 from infrastructure.fastapi.compute_projection_api import ComputeProjectionAPIImpl
 from infrastructure.fastapi.compute_word_cloud_api import ComputeWordCloudAPIImpl
+from infrastructure.fastapi.get_topics_api import GetTopicsAPIImpl
 from infrastructure.fastapi.save_posts_api import SavePostsAPIImpl
 from infrastructure.fastapi.get_posts_api import GetPostsAPIImpl
+from infrastructure.fastapi.delete_posts_api import DeletePostsAPIImpl
+from infrastructure.fastapi.health_api import HealthAPIImpl
 from infrastructure.post_repository import InMemoryPostRepository
 from infrastructure.simple_author_ranker import SimpleAuthorRanker
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
 from infrastructure.simple_tokenizer import SimpleTokenizer
 from infrastructure.search_index_builder import InMemorySearchIndexBuilder
 from infrastructure.search_index_looker import SimpleSearchIndexLookup
 from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.file_search_index_repository import FileSearchIndexRepository
+from infrastructure.simple_snippet_builder import SimpleSnippetBuilder
+from infrastructure.lru_search_result_cache import LRUSearchResultCache
+from infrastructure.sorted_term_suggester import SortedTermSuggester
+from infrastructure.trigram_term_expander import TrigramTermExpander
+from infrastructure.numpy_vector_index import NumpyVectorIndex
+from infrastructure.mmap_embedding_store import MmapEmbeddingStore
+from infrastructure.sentence_transformer_embedder import SentenceTransformerEmbedder
+from infrastructure.static_token_embedder import StaticTokenEmbedder
 from infrastructure.bertopic_post_projector import BertopicPostProjector
+from infrastructure.process_pool_projection_jobs import ProcessPoolProjectionJobs
+from infrastructure.lru_topic_store import LRUTopicStore
 from infrastructure.simple_wordcloud_projector import SimpleWordCloudProjector
 
 logger = logging.getLogger(__name__)
@@ -71,6 +97,50 @@ def load_vyper_config():
     v.set_default("fastapi.port", 8000)
     v.set_default("fastapi.log_level", "info")
     v.set_default("fastapi.workers", 1)
+    v.set_default("analyzer.languages", [])
+    v.set_default("analyzer.detect_language", False)
+    v.set_default("analyzer.cache_size", 100_000)
+    v.set_default("search.compaction_threshold", 0.2)
+    v.set_default("search.index.storage", "memory")
+    v.set_default("search.index.path", "data/search_index")
+    v.set_default("search.index.merge_factor", 4)
+    v.set_default("search.index.small_segment_docs", 1000)
+    v.set_default("search.fuzzy.max_edits", 2)
+    v.set_default("search.fuzzy.max_expansions", 3)
+    v.set_default("search.semantic.ivf_min_size", 20000)
+    v.set_default("search.semantic.nprobe", 8)
+    v.set_default("search.hybrid.candidates", 100)
+    v.set_default("search.hybrid.rrf_k", 60)
+    v.set_default("search.cache.max_entries", 1024)
+    v.set_default("search.cache.max_bytes", 32 * 1024 * 1024)
+    v.set_default("projection.embedding_cache.enabled", True)
+    v.set_default("projection.embedding_cache.path", "data/embeddings")
+    v.set_default("projection.embedding_cache.dtype", "float32")
+    v.set_default("projection.refit.growth", 0.25)
+    v.set_default("projection.refit.drift", 0.1)
+    v.set_default("projection.refit.max_users", 64)
+    v.set_default("projection.umap.mode", "deterministic")
+    v.set_default("projection.umap.n_jobs", -1)
+    v.set_default("projection.umap.numba_threads", 0)
+    v.set_default("projection.large.landmark_threshold", 5000)
+    v.set_default("projection.large.landmarks", 2000)
+    v.set_default("projection.large.transform_chunk_size", 4096)
+    v.set_default("projection.large.minibatch_threshold", 20000)
+    v.set_default("projection.large.minibatch_clusters", 50)
+    v.set_default("projection.jobs.max_workers", 2)
+    v.set_default("projection.jobs.max_finished", 256)
+    v.set_default("projection.warm_up", True)
+    v.set_default("projection.progressive.refine_budget", 30.0)
+    v.set_default("projection.progressive.preview_poll_interval", 0.25)
+    v.set_default("projection.topics.max_entries", 256)
+    v.set_default("projection.topics.path", "")
+    v.set_default("projection.topics.generations_per_user", 2)
+    v.set_default("projection.embedder.backend", "torch")
+    v.set_default("projection.embedder.model", "all-MiniLM-L6-v2")
+    v.set_default("projection.embedder.batch_size", 32)
+    v.set_default("projection.embedder.threads", 0)
+    v.set_default("projection.embedder.onnx_file", "onnx/model_quint8_avx2.onnx")
+    v.set_default("projection.embedder.static_vectors_path", "data/static_vectors.npy")
 
 
 
@@ -81,18 +151,99 @@ def configure_app():
     # Initialize repositories
     post_repository = InMemoryPostRepository()
 
+    # One analyzer normalizes post text for search, the word cloud and projections
+    text_analyzer = NltkTextAnalyzer(
+        languages=tuple(v.get("analyzer.languages") or ()) or None,
+        detect_language=v.get_bool("analyzer.detect_language"),
+        cache_size=v.get_int("analyzer.cache_size"),
+    )
+
     # Initialize search infrastructure
-    tokenizer = SimpleTokenizer()
+    tokenizer = SimpleTokenizer(analyzer=text_analyzer)
     search_index_builder = InMemorySearchIndexBuilder()
-    search_index_repository = InMemorySearchIndexRepository()
-    search_index_lookup = SimpleSearchIndexLookup(tokenizer=tokenizer)
+    if v.get_string("search.index.storage") == "file":
+        search_index_repository = FileSearchIndexRepository(
+            root=v.get_string("search.index.path"),
+            merge_factor=v.get_int("search.index.merge_factor"),
+            small_segment_docs=v.get_int("search.index.small_segment_docs"),
+        )
+    else:
+        search_index_repository = InMemorySearchIndexRepository()
+    term_expander = TrigramTermExpander(
+        max_edits=v.get_int("search.fuzzy.max_edits"),
+        max_expansions=v.get_int("search.fuzzy.max_expansions"),
+    )
+    search_index_lookup = SimpleSearchIndexLookup(tokenizer=tokenizer, term_expander=term_expander)
+    snippet_builder = SimpleSnippetBuilder()
+    search_result_cache = LRUSearchResultCache(
+        max_entries=v.get_int("search.cache.max_entries"),
+        max_bytes=v.get_int("search.cache.max_bytes"),
+    )
+    term_suggester = SortedTermSuggester(analyzer=text_analyzer)
 
     # Initialize author ranker
     author_ranker = SimpleAuthorRanker()
 
-    # Initialize projectors
-    post_projector = BertopicPostProjector()
-    word_cloud_projector = SimpleWordCloudProjector()
+    # Initialize projectors; the post projector also embeds posts for semantic search
+    vector_index = NumpyVectorIndex(
+        ivf_min_size=v.get_int("search.semantic.ivf_min_size"),
+        nprobe=v.get_int("search.semantic.nprobe"),
+    )
+    embedding_store = None
+    if v.get_bool("projection.embedding_cache.enabled"):
+        embedding_store = MmapEmbeddingStore(
+            root=v.get_string("projection.embedding_cache.path"),
+            dtype=v.get_string("projection.embedding_cache.dtype"),
+        )
+    if v.get_string("projection.embedder.backend") == "static":
+        embedder = StaticTokenEmbedder(
+            model_name=v.get_string("projection.embedder.model"),
+            vectors_path=v.get_string("projection.embedder.static_vectors_path"),
+        )
+    else:
+        embedder = SentenceTransformerEmbedder(
+            model_name=v.get_string("projection.embedder.model"),
+            backend=v.get_string("projection.embedder.backend"),
+            onnx_file=v.get_string("projection.embedder.onnx_file"),
+            batch_size=v.get_int("projection.embedder.batch_size"),
+            threads=v.get_int("projection.embedder.threads"),
+        )
+    projector_settings = dict(
+        analyzer=text_analyzer,
+        embedder=embedder,
+        embedding_store=embedding_store,
+        refit_growth=v.get_float("projection.refit.growth"),
+        refit_drift=v.get_float("projection.refit.drift"),
+        max_users=v.get_int("projection.refit.max_users"),
+        umap_mode=v.get_string("projection.umap.mode"),
+        n_jobs=v.get_int("projection.umap.n_jobs"),
+        numba_threads=v.get_int("projection.umap.numba_threads"),
+        landmark_threshold=v.get_int("projection.large.landmark_threshold"),
+        landmarks=v.get_int("projection.large.landmarks"),
+        transform_chunk_size=v.get_int("projection.large.transform_chunk_size"),
+        minibatch_threshold=v.get_int("projection.large.minibatch_threshold"),
+        minibatch_clusters=v.get_int("projection.large.minibatch_clusters"),
+    )
+    # Projections run in the workers below, so the API process only warms up the embedder
+    post_projector = BertopicPostProjector(
+        vector_index=vector_index, warm_up_topic_modelling=False, **projector_settings
+    )
+    # The topics each projection fits are kept, so topic endpoints never refit
+    topic_store = LRUTopicStore(
+        max_entries=v.get_int("projection.topics.max_entries"),
+        root=v.get_string("projection.topics.path") or None,
+        generations_per_user=v.get_int("projection.topics.generations_per_user"),
+    )
+    # Projections requested over the API run in worker processes with projectors of their own
+    projection_jobs = ProcessPoolProjectionJobs(
+        projector_factory=partial(BertopicPostProjector, **projector_settings),
+        max_workers=v.get_int("projection.jobs.max_workers"),
+        max_finished_jobs=v.get_int("projection.jobs.max_finished"),
+        topic_store=topic_store,
+        # Embeddings computed by the workers are added to the API's index for semantic search
+        vector_index=vector_index,
+    )
+    word_cloud_projector = SimpleWordCloudProjector(analyzer=text_analyzer)
 
     logger.info("Initializing use cases...")
 
@@ -103,6 +254,27 @@ def configure_app():
         index_builder=search_index_builder,
         tokenizer=tokenizer,
         post_repository=post_repository,
+        snippet_builder=snippet_builder,
+        post_embedder=post_projector,
+        vector_index=vector_index,
+        hybrid_candidates=v.get_int("search.hybrid.candidates"),
+        rrf_k=v.get_int("search.hybrid.rrf_k"),
+        result_cache=search_result_cache,
+    )
+
+    suggest_terms_use_case = SuggestTerms(
+        term_suggester=term_suggester,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        tokenizer=tokenizer,
+        post_repository=post_repository,
+    )
+
+    semantic_search_posts_use_case = SemanticSearchPosts(
+        post_embedder=post_projector,
+        vector_index=vector_index,
+        post_repository=post_repository,
+        snippet_builder=snippet_builder,
     )
 
     get_popular_authors_use_case = GetPopularAuthors(
@@ -113,6 +285,21 @@ def configure_app():
     compute_projection_use_case = ComputeProjection(
         post_repository=post_repository,
         post_projector=post_projector,
+        projection_jobs=projection_jobs,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        tokenizer=tokenizer,
+        post_embedder=post_projector,
+        refine_budget=v.get_float("projection.progressive.refine_budget"),
+        preview_poll_interval=v.get_float("projection.progressive.preview_poll_interval"),
+    )
+
+    get_topics_use_case = GetTopics(
+        topic_store=topic_store,
+        post_repository=post_repository,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        tokenizer=tokenizer,
     )
 
     compute_word_cloud_use_case = ComputeWordCloud(
@@ -122,22 +309,61 @@ def configure_app():
 
     get_posts = GetPostsUseCase(
         post_repository=post_repository,
+        index_lookup=search_index_lookup,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        tokenizer=tokenizer,
     )
 
     save_posts_use_case = SavePostsUseCase(
-        post_repository=post_repository
+        post_repository=post_repository,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        tokenizer=tokenizer,
+        text_analyzer=text_analyzer,
+        compaction_threshold=v.get_float("search.compaction_threshold"),
+        post_embedder=post_projector,
+        vector_index=vector_index,
+    )
+
+    delete_posts_use_case = DeletePostsUseCase(
+        post_repository=post_repository,
+        index_repository=search_index_repository,
+        index_builder=search_index_builder,
+        compaction_threshold=v.get_float("search.compaction_threshold"),
+        vector_index=vector_index,
     )
 
+    # Models load lazily; warming them up in the background keeps startup fast
+    check_health_use_case = CheckHealth(
+        models={"post_embedder": post_projector, "projection_workers": projection_jobs},
+        wait_for_models=v.get_bool("projection.warm_up"),
+    )
+
+    # Projection workers are spawned processes that import this module again,
+    # so they and the warm-up start with the server rather than on import
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if v.get_bool("projection.warm_up"):
+            check_health_use_case.start_warm_up()
+        yield
+        await run_in_threadpool(projection_jobs.shutdown)
+
     logger.info("Creating API handlers...")
 
     # Create API handlers (Infrastructure Layer - FastAPI adapters)
     search_posts_api = SearchPostsAPIImpl(search_posts_use_case=search_posts_use_case)
+    suggest_terms_api = SuggestTermsAPIImpl(suggest_terms_use_case=suggest_terms_use_case)
+    semantic_search_posts_api = SemanticSearchPostsAPIImpl(
+        semantic_search_posts_use_case=semantic_search_posts_use_case
+    )
     get_popular_authors_api = GetPopularAuthorsAPIImpl(
         get_popular_authors_use_case=get_popular_authors_use_case
     )
     compute_projection_api = ComputeProjectionAPIImpl(
         compute_projection_use_case=compute_projection_use_case
     )
+    get_topics_api = GetTopicsAPIImpl(get_topics_use_case=get_topics_use_case)
     compute_word_cloud_api = ComputeWordCloudAPIImpl(
         compute_word_cloud_use_case=compute_word_cloud_use_case
     )
@@ -147,46 +373,75 @@ def configure_app():
     get_posts_api = GetPostsAPIImpl(
         get_posts_use_case=get_posts
     )
+    delete_posts_api = DeletePostsAPIImpl(
+        delete_posts_use_case=delete_posts_use_case
+    )
+    health_api = HealthAPIImpl(check_health_use_case=check_health_use_case)
 
     logger.info("Building FastAPI application...")
 
     # Create FastAPI app using the AppBuilder
     app_builder = AppBuilder(
         search_posts_api=search_posts_api,
+        suggest_terms_api=suggest_terms_api,
+        semantic_search_posts_api=semantic_search_posts_api,
         get_popular_authors_api=get_popular_authors_api,
         compute_projection_api=compute_projection_api,
+        get_topics_api=get_topics_api,
         compute_word_cloud_api=compute_word_cloud_api,
         save_posts_api=save_posts_api,
         get_posts_api=get_posts_api,
+        delete_posts_api=delete_posts_api,
+        health_api=health_api,
+        lifespan=lifespan,
     )
     main_app = app_builder.create_app()
 
     return main_app
 
 
-# Create the app at module level for uvicorn reload
-logger.info("Loading configuration...")
-load_dotenv_config()
-load_vyper_config()
-app = configure_app()
+def create_app() -> FastAPI:
+    """Load the configuration and build the app; uvicorn calls this once per server process.
+
+    Importing this module builds nothing, since every projection worker
+    process imports it again.
+    """
+    logger.info("Loading configuration...")
+    load_dotenv_config()
+    load_vyper_config()
+    return configure_app()
 
 
 def main():
     """Implement entry point for the application."""
+    load_dotenv_config()
+    load_vyper_config()
     print("🚀 Starting LinkedIn Saved Posts Analyzer API...")
-    print("   - Search Posts: GET /search?query=<query>")
+    print("   - Search Posts: GET /search?query=<query>&limit=<n>&offset=<n>&fuzzy=<bool>&mode=<keyword|hybrid>&author=<name>&since=<date>&until=<date>")
+    print("   - Search Cache Stats: GET /search/cache")
+    print("   - Suggest Terms: GET /search/suggest?prefix=<prefix>")
+    print("   - Semantic Search: GET /search/semantic?query=<query>&limit=<n>&offset=<n>")
     print("   - Popular Authors: GET /popular_authors")
-    print("   - Compute Projection: GET /projection")
+    print("   - Compute Projection: GET /projection (returns a job)")
+    print("   - Progressive Projection: GET /projection/stream?columnar=<bool> (Server-Sent Events: preview, then refined)")
+    print("   - Projection Job: GET /projection/jobs/{job_id}")
+    print("   - Projection Result: GET /projection/jobs/{job_id}/result?columnar=<bool> (Accept: JSON, MessagePack or Arrow IPC)")
+    print("   - Topics: GET /topics (fitted by the last projection of the current posts)")
+    print("   - Topic Posts: GET /topics/{topic_id}/posts?limit=<n>&offset=<n>")
+    print("   - Representative Posts: GET /topics/{topic_id}/representative")
     print("   - Word Cloud: GET /wordcloud")
+    print("   - Liveness: GET /healthz")
+    print("   - Readiness: GET /readyz (503 until the models are loaded)")
 
     fastapi_host = v.get_string("fastapi.host")
     fastapi_port = v.get_int("fastapi.port")
     fastapi_log_level = v.get_string("fastapi.log_level")
     fastapi_workers = v.get_int("fastapi.workers")
 
-    # Start the server using the module-level app
+    # Each server process builds its own app
     uvicorn.run(
-        "main:app",
+        "main:create_app",
+        factory=True,
         workers=fastapi_workers,
         host=fastapi_host,
         port=fastapi_port,
@@ -0,0 +1,29 @@
+import numpy as np
+
+from application.services.layout_alignment import procrustes_alignment
+
+
+def test_rotated_scaled_and_shifted_layout_is_mapped_back():
+    source = np.random.default_rng(0).standard_normal((20, 2))
+    angle = 0.7
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    target = 3.0 * source @ rotation + np.array([5.0, -2.0])
+
+    matrix, offset = procrustes_alignment(source, target)
+
+    assert np.allclose(source @ matrix + offset, target)
+
+
+def test_mirror_images_are_aligned():
+    source = np.random.default_rng(1).standard_normal((10, 2))
+    target = source * np.array([-1.0, 1.0])
+
+    matrix, offset = procrustes_alignment(source, target)
+
+    assert np.allclose(source @ matrix + offset, target)
+
+
+def test_collapsed_source_maps_to_the_target_centre():
+    matrix, offset = procrustes_alignment(np.ones((4, 2)), np.arange(8.0).reshape(4, 2))
+
+    assert np.allclose(np.ones((1, 2)) @ matrix + offset, [[3.0, 4.0]])
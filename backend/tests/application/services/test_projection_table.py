@@ -0,0 +1,26 @@
+from application.services.projection_table import projection_table
+from domain.entities.post import KeywordRelevance, PostProjection, ProjectionTopic
+
+AI = [KeywordRelevance(keyword="model", score=0.5), KeywordRelevance(keyword="gpu", score=0.25)]
+HIRING = [KeywordRelevance(keyword="hiring", score=0.75)]
+
+
+def test_topics_are_listed_once_and_posts_become_columns():
+    table = projection_table([
+        PostProjection(post_id="p1", x=1.0, y=2.0, keywords=HIRING, topic_id=1),
+        PostProjection(post_id="p2", x=3.0, y=4.0, keywords=AI, topic_id=0),
+        PostProjection(post_id="p3", x=5.0, y=6.0, keywords=AI, topic_id=0),
+    ])
+
+    assert table.topics == [ProjectionTopic(id=0, keywords=AI), ProjectionTopic(id=1, keywords=HIRING)]
+    assert table.post_id == ["p1", "p2", "p3"]
+    assert table.x == [1.0, 3.0, 5.0]
+    assert table.y == [2.0, 4.0, 6.0]
+    assert table.topic_id == [1, 0, 0]
+
+
+def test_previews_have_no_topics():
+    table = projection_table([PostProjection(post_id="p1", x=1.0, y=2.0, keywords=[])])
+
+    assert table.topics == []
+    assert table.topic_id == [None]
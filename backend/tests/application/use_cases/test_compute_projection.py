@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+
+from application.interfaces.post_embedder import PostEmbedder
+from application.interfaces.projection_jobs import ProjectionJobs
+from application.use_cases.compute_projection import ComputeProjection
+from domain.entities.post import Post, PostId, PostProjection
+from domain.entities.projection_job import ProjectionJob
+from domain.entities.user_id import UserId
+from infrastructure.post_repository import InMemoryPostRepository
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+class FakeJobs(ProjectionJobs):
+    """Jobs that finish, fail or hang as told, recording how long they were waited for."""
+
+    def __init__(self, status="done", pending_waits=0):
+        self.final_status = status
+        self.pending_waits = pending_waits  # waits that return before the job finishes
+        self.jobs: Dict[str, ProjectionJob] = {}
+        self.posts: Dict[str, List[Post]] = {}
+        self.waited: List[float] = []
+
+    def submit(self, user_id, generation, posts):
+        job = self.jobs[str(generation)] = ProjectionJob(id=str(generation), generation=generation, status="pending")
+        self.posts[job.id] = posts
+        return job
+
+    def status(self, user_id, job_id):
+        return self.jobs.get(job_id)
+
+    def result(self, user_id, job_id) -> Optional[List[PostProjection]]:
+        return [PostProjection(post_id=post.id, x=1.0, y=2.0, keywords=[]) for post in self.posts[job_id]]
+
+    def wait(self, user_id, job_id, timeout):
+        self.waited.append(timeout)
+        if self.final_status != "running" and len(self.waited) > self.pending_waits:
+            self.jobs[job_id] = ProjectionJob(id=job_id, generation=int(job_id), status=self.final_status)
+        return self.jobs[job_id]
+
+
+class FakeEmbedder(PostEmbedder):
+    """Has the embeddings of the first ``stored`` posts, and never encodes for a preview."""
+
+    def __init__(self, stored=6):
+        self.stored = stored
+
+    def embed_posts(self, posts):
+        raise AssertionError("the preview must not encode posts")
+
+    def stored_post_embeddings(self, posts):
+        found = list(range(min(self.stored, len(posts))))
+        # Two clusters spread along the first axis
+        return found, np.array([[10.0 * (i % 2), float(i), 0.0] for i in found], dtype=np.float32)
+
+    def embed_query(self, query):
+        return np.zeros(3, dtype=np.float32)
+
+
+def make_post(i: int) -> Post:
+    return Post(
+        author="a",
+        profileUrl="",
+        authorImage="",
+        authorHeadline="",
+        timestamp="",
+        text=f"post number {i}",
+        postUrl="",
+        meta={},
+        postImage="",
+        userId=UserId("u1"),
+        id=PostId(f"p{i}"),
+    )
+
+
+def make_use_case(jobs: FakeJobs, **kwargs) -> ComputeProjection:
+    post_repository = InMemoryPostRepository()
+    post_repository.add_posts([make_post(i) for i in range(6)])
+    return ComputeProjection(
+        post_repository=post_repository,
+        post_projector=None,
+        projection_jobs=jobs,
+        index_repository=InMemorySearchIndexRepository(),
+        index_builder=InMemorySearchIndexBuilder(),
+        tokenizer=SimpleTokenizer(),
+        **kwargs,
+    )
+
+
+class TestProgressiveProjection:
+    def test_preview_comes_before_the_refined_layout(self):
+        use_case = make_use_case(FakeJobs(), post_embedder=FakeEmbedder())
+
+        preview, refined = list(use_case.progressive(UserId("u1")))
+
+        assert preview.stage == "preview"
+        assert [p.post_id for p in preview.projections] == [f"p{i}" for i in range(6)]
+        # The clusters end up on either side of the first principal axis
+        xs = np.array([p.x for p in preview.projections])
+        assert (np.sign(xs[::2]) != np.sign(xs[1::2])).all()
+        assert refined.stage == "refined"
+        assert refined.job.status == "done"
+        assert refined.projections[0].x == 1.0
+
+    def test_preview_covers_only_the_stored_embeddings(self):
+        use_case = make_use_case(FakeJobs(), post_embedder=FakeEmbedder(stored=4))
+
+        preview, _ = list(use_case.progressive(UserId("u1")))
+
+        assert [p.post_id for p in preview.projections] == ["p0", "p1", "p2", "p3"]
+
+    def test_preview_is_sent_once_the_job_stores_the_embeddings(self):
+        jobs = FakeJobs(pending_waits=2)
+        embedder = FakeEmbedder(stored=0)
+        original_wait = jobs.wait
+
+        def wait(user_id, job_id, timeout):
+            embedder.stored = 6 if len(jobs.waited) >= 1 else 0  # the worker embeds during the second wait
+            return original_wait(user_id, job_id, timeout)
+
+        jobs.wait = wait
+        use_case = make_use_case(jobs, post_embedder=embedder, preview_poll_interval=0.01)
+
+        preview, refined = list(use_case.progressive(UserId("u1")))
+
+        assert preview.stage == "preview"
+        assert len(preview.projections) == 6
+        assert refined.stage == "refined"
+        assert jobs.waited[:2] == [0.01, 0.01]
+
+    def test_no_preview_while_the_store_is_cold(self):
+        use_case = make_use_case(FakeJobs(), post_embedder=FakeEmbedder(stored=0))
+
+        assert [update.stage for update in use_case.progressive(UserId("u1"))] == ["refined"]
+
+    def test_budget_exceeded_leaves_the_preview(self):
+        jobs = FakeJobs(status="running")
+        use_case = make_use_case(jobs, post_embedder=FakeEmbedder(), refine_budget=0.5)
+
+        updates = list(use_case.progressive(UserId("u1")))
+
+        assert [update.stage for update in updates] == ["preview", "timeout"]
+        assert updates[-1].job.status == "pending"
+        assert 0.0 <= jobs.waited[0] <= 0.5
+
+    def test_failed_job_is_reported(self):
+        use_case = make_use_case(FakeJobs(status="failed"), post_embedder=FakeEmbedder())
+
+        assert [update.stage for update in use_case.progressive(UserId("u1"))] == ["preview", "failed"]
+
+    def test_no_preview_without_an_embedder(self):
+        use_case = make_use_case(FakeJobs())
+
+        assert [update.stage for update in use_case.progressive(UserId("u1"))] == ["refined"]
+
+    def test_progressive_requires_a_job_runner(self):
+        use_case = make_use_case(None)
+
+        with pytest.raises(ValueError):
+            next(use_case.progressive(UserId("u1")))
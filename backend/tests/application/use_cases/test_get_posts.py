@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from application.use_cases.get_posts import GetPostsUseCase
+from domain.entities.post import Post, PostId
+from domain.entities.search import PostFilter
+from domain.entities.user_id import UserId
+from infrastructure.post_repository import InMemoryPostRepository
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+def make_post(i: int, author: str, timestamp: str) -> Post:
+    return Post(
+        author=author,
+        profileUrl="",
+        authorImage="",
+        authorHeadline="",
+        timestamp=timestamp,
+        text=f"post number {i}",
+        postUrl="",
+        meta={},
+        postImage="",
+        userId=UserId("u1"),
+        id=PostId(f"p{i}"),
+    )
+
+
+@pytest.fixture
+def use_case() -> GetPostsUseCase:
+    post_repository = InMemoryPostRepository()
+    post_repository.add_posts([
+        make_post(1, "Ada", "2024-01-05"),
+        make_post(2, "Grace", "2024-01-20"),
+        make_post(3, "Ada", "2024-03-02"),
+    ])
+    return GetPostsUseCase(
+        post_repository=post_repository,
+        index_lookup=SimpleSearchIndexLookup(tokenizer=SimpleTokenizer()),
+        index_repository=InMemorySearchIndexRepository(),
+        index_builder=InMemorySearchIndexBuilder(),
+        tokenizer=SimpleTokenizer(),
+    )
+
+
+class TestGetPosts:
+    def test_facets_count_the_returned_posts(self, use_case):
+        response = use_case.execute_with_facets(UserId("u1"), None, PostFilter(since=date(2024, 1, 10)))
+
+        assert [post.id for post in response.posts] == ["p2", "p3"]
+        assert response.facets.authors == {"Ada": 1, "Grace": 1}
+        assert response.facets.months == {"2024-01": 1, "2024-03": 1}
+
+    def test_facets_require_a_search_index(self, use_case):
+        use_case.index_lookup = None
+
+        with pytest.raises(ValueError):
+            use_case.execute_with_facets(UserId("u1"), None)
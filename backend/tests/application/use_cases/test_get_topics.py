@@ -0,0 +1,87 @@
+from application.services.search_index import get_or_build_user_index
+from application.use_cases.get_topics import GetTopics
+from domain.entities.post import KeywordRelevance, Post, PostId
+from domain.entities.topic import Topic, UserTopics
+from domain.entities.user_id import UserId
+from infrastructure.lru_topic_store import LRUTopicStore
+from infrastructure.post_repository import InMemoryPostRepository
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+def make_post(i: int) -> Post:
+    return Post(
+        author="a",
+        profileUrl="",
+        authorImage="",
+        authorHeadline="",
+        timestamp="",
+        text=f"post number {i}",
+        postUrl="",
+        meta={},
+        postImage="",
+        userId=UserId("u1"),
+        id=PostId(f"p{i}"),
+    )
+
+
+def make_use_case() -> GetTopics:
+    post_repository = InMemoryPostRepository()
+    post_repository.add_posts([make_post(i) for i in range(6)])
+    return GetTopics(
+        topic_store=LRUTopicStore(),
+        post_repository=post_repository,
+        index_repository=InMemorySearchIndexRepository(),
+        index_builder=InMemorySearchIndexBuilder(),
+        tokenizer=SimpleTokenizer(),
+    )
+
+
+def current_generation(use_case: GetTopics) -> int:
+    return get_or_build_user_index(
+        UserId("u1"),
+        use_case.index_repository,
+        use_case.index_builder,
+        use_case.post_repository,
+        use_case.tokenizer,
+    ).generation
+
+
+def store_topics(use_case: GetTopics, generation: int) -> None:
+    keywords = [KeywordRelevance(keyword="number", score=0.5)]
+    use_case.topic_store.put(
+        UserId("u1"),
+        UserTopics(
+            generation=generation,
+            topics={
+                1: Topic(id=1, keywords=keywords, post_ids=["p4", "p5"], representative_post_ids=["p5"]),
+                0: Topic(id=0, keywords=keywords, post_ids=["p0", "p1", "p2", "p3"], representative_post_ids=["p2", "p0"]),
+            },
+        ),
+    )
+
+
+class TestGetTopics:
+    def test_topics_of_the_current_generation_are_served(self):
+        use_case = make_use_case()
+        store_topics(use_case, current_generation(use_case))
+
+        assert [(topic.id, topic.size) for topic in use_case.topics(UserId("u1"))] == [(0, 4), (1, 2)]
+        posts = use_case.topic_posts(UserId("u1"), 0, limit=2, offset=1)
+        assert [post.id for post in posts] == ["p1", "p2"]
+        assert [post.id for post in use_case.representative_posts(UserId("u1"), 0)] == ["p2", "p0"]
+
+    def test_no_topics_until_the_current_posts_are_projected(self):
+        use_case = make_use_case()
+        store_topics(use_case, current_generation(use_case) - 1)
+
+        assert use_case.topics(UserId("u1")) is None
+        assert use_case.topic_posts(UserId("u1"), 0, limit=10, offset=0) is None
+
+    def test_unknown_topic_is_none(self):
+        use_case = make_use_case()
+        store_topics(use_case, current_generation(use_case))
+
+        assert use_case.topic_posts(UserId("u1"), 7, limit=10, offset=0) is None
+        assert use_case.representative_posts(UserId("u1"), 7) is None
@@ -0,0 +1,87 @@
+import numpy as np
+
+from application.services.search_index import get_or_build_user_index
+from application.use_cases.delete_posts import DeletePostsUseCase
+from application.use_cases.save_posts import SavePostsUseCase
+from domain.entities.post import Post, PostId
+from domain.entities.user_id import UserId
+from infrastructure.numpy_vector_index import NumpyVectorIndex
+from infrastructure.post_repository import InMemoryPostRepository
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+def make_post(i: int, text: str = "python tips") -> Post:
+    return Post(
+        author="a",
+        profileUrl="",
+        authorImage="",
+        authorHeadline="",
+        timestamp="",
+        text=text,
+        postUrl="",
+        meta={},
+        postImage="",
+        userId=UserId("u1"),
+        id=PostId(f"p{i}"),
+    )
+
+
+class LengthEmbedder:
+    """Embeds each post as its text length, counting the posts it encodes."""
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_posts(self, posts):
+        self.embedded.extend(post.id for post in posts)
+        return np.array([[len(post.text), 1.0] for post in posts], dtype=np.float32)
+
+
+def make_use_case(**kwargs) -> SavePostsUseCase:
+    return SavePostsUseCase(
+        post_repository=InMemoryPostRepository(),
+        index_repository=InMemorySearchIndexRepository(),
+        index_builder=InMemorySearchIndexBuilder(),
+        tokenizer=SimpleTokenizer(),
+        compaction_threshold=0.3,
+        **kwargs,
+    )
+
+
+class TestSavePosts:
+    def test_reindexed_posts_trigger_compaction(self):
+        use_case = make_use_case()
+        use_case.execute([make_post(i) for i in range(4)])
+        user_index = get_or_build_user_index(
+            UserId("u1"), use_case.index_repository, use_case.index_builder,
+            use_case.post_repository, use_case.tokenizer,
+        )
+
+        use_case.execute([make_post(0, "rust jobs")])
+        assert not use_case.compact(UserId("u1"))  # 1 of 5 docs tombstoned
+        use_case.execute([make_post(1, "rust jobs")])
+        assert use_case.compact(UserId("u1"))
+
+        assert user_index.tombstones == set()
+        assert sorted(user_index.post_ids) == ["p0", "p1", "p2", "p3"]
+
+    def test_saved_posts_are_embedded_and_deleted_ones_dropped(self):
+        embedder, vector_index = LengthEmbedder(), NumpyVectorIndex()
+        use_case = make_use_case(post_embedder=embedder, vector_index=vector_index)
+        posts = [make_post(i) for i in range(3)]
+        use_case.execute(posts)
+
+        use_case.embed(posts)
+        assert embedder.embedded == ["p0", "p1", "p2"]
+        assert vector_index.size(UserId("u1")) == 3
+
+        delete = DeletePostsUseCase(
+            post_repository=use_case.post_repository,
+            index_repository=use_case.index_repository,
+            index_builder=use_case.index_builder,
+            vector_index=vector_index,
+        )
+        delete.execute(UserId("u1"), [PostId("p1")])
+        assert vector_index.size(UserId("u1")) == 2
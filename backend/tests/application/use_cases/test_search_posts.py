@@ -0,0 +1,621 @@
+import pytest
+from unittest.mock import Mock
+from typing import List
+
+from application.use_cases.search_posts import SearchPosts
+from domain.entities.user_id import UserId
+from domain.entities.post import Post, PostId
+from domain.entities.search import PostFilter, SearchResponse
+from application.interfaces.search_index_lookup import RankedMatches
+from application.interfaces.search_index_builder import UserIndex
+from infrastructure.lru_search_result_cache import LRUSearchResultCache
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+from infrastructure.post_repository import InMemoryPostRepository
+from infrastructure.search_index_repository import InMemorySearchIndexRepository
+from infrastructure.simple_snippet_builder import SimpleSnippetBuilder
+
+
+@pytest.fixture
+def user_id() -> UserId:
+    """Create a sample user ID."""
+    return UserId("user_123")
+
+
+@pytest.fixture
+def sample_posts() -> List[Post]:
+    """Create sample posts for testing."""
+    return [
+        Post(
+            id=PostId("post_1"),
+            userId=UserId("user_123"),
+            author="Author One",
+            profileUrl="",
+            authorImage="image1.jpg",
+            authorHeadline="Headline 1",
+            timestamp="2024-01-01",
+            text="This is a Python programming post",
+            postImage="post1.jpg",
+            postUrl="",
+            meta={},
+        ),
+        Post(
+            id=PostId("post_2"),
+            userId=UserId("user_123"),
+            author="Author Two",
+            profileUrl="",
+            authorImage="image2.jpg",
+            authorHeadline="Headline 2",
+            timestamp="2024-01-02",
+            text="This is a Java programming post",
+            postImage="post2.jpg",
+            postUrl="",
+            meta={},
+        ),
+        Post(
+            id=PostId("post_3"),
+            userId=UserId("user_123"),
+            author="Author Three",
+            profileUrl="",
+            authorImage="image3.jpg",
+            authorHeadline="Headline 3",
+            timestamp="2024-01-03",
+            text="This is a web development post",
+            postImage="post3.jpg",
+            postUrl="",
+            meta={},
+        ),
+    ]
+
+
+@pytest.fixture
+def mock_index_lookup() -> Mock:
+    """Create a mock SearchIndexLookup."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_index_repository() -> Mock:
+    """Create a mock SearchIndexRepository."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_index_builder() -> Mock:
+    """Create a mock SearchIndexBuilder."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_tokenizer() -> Mock:
+    """Create a mock Tokenizer."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_post_repository() -> Mock:
+    """Create a mock PostRepository."""
+    post_repository = Mock()
+    post_repository.get_posts_by_user_id_and_ids.return_value = []
+    return post_repository
+
+
+@pytest.fixture
+def mock_snippet_builder() -> Mock:
+    """Create a mock SnippetBuilder."""
+    return Mock()
+
+
+@pytest.fixture
+def search_posts(
+    mock_index_lookup,
+    mock_index_repository,
+    mock_index_builder,
+    mock_tokenizer,
+    mock_post_repository,
+    mock_snippet_builder,
+) -> SearchPosts:
+    """Create a SearchPosts instance with mocked dependencies."""
+    return SearchPosts(
+        index_lookup=mock_index_lookup,
+        index_repository=mock_index_repository,
+        index_builder=mock_index_builder,
+        tokenizer=mock_tokenizer,
+        post_repository=mock_post_repository,
+        snippet_builder=mock_snippet_builder,
+    )
+
+
+class TestSearchPosts:
+    """Test suite for SearchPosts use case."""
+
+    def test_execute_with_existing_index(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test execute when index already exists for user."""
+        # Arrange
+        query = "Python"
+        existing_index = UserIndex()
+        expected_matches = [("post_1", 2.0), ("post_2", 1.0)]
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result == SearchResponse(
+            results=search_posts.snippet_builder.build.return_value,
+            total=len(expected_matches),
+        )
+        mock_index_repository.get_index_by_user_id.assert_called_once_with(user_id)
+        mock_index_lookup.lookup.assert_called_once_with(
+            query, existing_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+        search_posts.post_repository.get_posts_by_user_id.assert_not_called()
+        search_posts.index_builder.build_index.assert_not_called()
+        mock_index_repository.save_user_index.assert_not_called()
+
+    def test_execute_without_existing_index(
+        self,
+        search_posts,
+        user_id,
+        sample_posts,
+        mock_index_repository,
+        mock_index_builder,
+        mock_tokenizer,
+        mock_index_lookup,
+    ):
+        """Test execute when index doesn't exist and needs to be built."""
+        # Arrange
+        query = "programming"
+        built_index = UserIndex()
+        expected_matches = [("post_1", 2.0), ("post_2", 1.0)]
+
+        mock_index_repository.get_index_by_user_id.return_value = None
+        search_posts.post_repository.get_posts_by_user_id.return_value = sample_posts
+        mock_index_builder.build_index.return_value = built_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result == SearchResponse(
+            results=search_posts.snippet_builder.build.return_value,
+            total=len(expected_matches),
+        )
+        mock_index_repository.get_index_by_user_id.assert_called_once_with(user_id)
+        search_posts.post_repository.get_posts_by_user_id.assert_called_once_with(
+            user_id
+        )
+        mock_index_builder.build_index.assert_called_once_with(
+            sample_posts, mock_tokenizer
+        )
+        mock_index_repository.save_user_index.assert_called_once_with(user_id, built_index)
+        mock_index_lookup.lookup.assert_called_once_with(
+            query, built_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_returns_correct_matches(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test that execute returns the matches from lookup."""
+        # Arrange
+        query = "test query"
+        existing_index = UserIndex()
+        expected_matches = [("post_1", 3.0), ("post_2", 2.0), ("post_3", 1.0)]
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result == SearchResponse(
+            results=search_posts.snippet_builder.build.return_value,
+            total=len(expected_matches),
+        )
+        assert result.total == 3
+
+    def test_execute_with_empty_query(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test execute with an empty query string."""
+        # Arrange
+        query = ""
+        existing_index = UserIndex()
+        expected_matches = []
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result == SearchResponse(
+            results=search_posts.snippet_builder.build.return_value,
+            total=len(expected_matches),
+        )
+        mock_index_lookup.lookup.assert_called_once_with(
+            query, existing_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_with_no_matching_results(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test execute when no posts match the query."""
+        # Arrange
+        query = "nonexistent_keyword"
+        existing_index = UserIndex()
+        expected_matches = []
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result.total == 0
+        mock_index_lookup.lookup.assert_called_once_with(
+            query, existing_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_builds_index_only_once(
+        self,
+        search_posts,
+        user_id,
+        sample_posts,
+        mock_index_repository,
+        mock_index_builder,
+        mock_tokenizer,
+        mock_index_lookup,
+    ):
+        """Test that index is built and saved exactly once when it doesn't exist."""
+        # Arrange
+        query = "search"
+        built_index = UserIndex()
+        mock_index_repository.get_index_by_user_id.return_value = None
+        search_posts.post_repository.get_posts_by_user_id.return_value = sample_posts
+        mock_index_builder.build_index.return_value = built_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=[("match", 1.0)], total=1
+        )
+
+        # Act
+        search_posts.execute(query, user_id)
+
+        # Assert
+        mock_index_builder.build_index.assert_called_once()
+        mock_index_repository.save_user_index.assert_called_once()
+
+    def test_execute_passes_correct_parameters_to_dependencies(
+        self,
+        search_posts,
+        user_id,
+        sample_posts,
+        mock_index_repository,
+        mock_index_builder,
+        mock_tokenizer,
+        mock_index_lookup,
+    ):
+        """Test that execute passes correct parameters to all dependencies."""
+        # Arrange
+        query = "specific query"
+        built_index = UserIndex()
+
+        mock_index_repository.get_index_by_user_id.return_value = None
+        search_posts.post_repository.get_posts_by_user_id.return_value = sample_posts
+        mock_index_builder.build_index.return_value = built_index
+        mock_index_lookup.lookup.return_value = RankedMatches(matches=[], total=0)
+
+        # Act
+        search_posts.execute(query, user_id)
+
+        # Assert
+        mock_index_repository.get_index_by_user_id.assert_called_with(user_id)
+        search_posts.post_repository.get_posts_by_user_id.assert_called_with(user_id)
+        mock_index_builder.build_index.assert_called_with(sample_posts, mock_tokenizer)
+        mock_index_repository.save_user_index.assert_called_with(user_id, built_index)
+        mock_index_lookup.lookup.assert_called_with(
+            query, built_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_with_special_characters_in_query(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test execute with special characters in the query."""
+        # Arrange
+        query = "C++ && Python || Java?"
+        existing_index = UserIndex()
+        expected_matches = [("post_1", 1.0)]
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=expected_matches, total=len(expected_matches)
+        )
+
+        # Act
+        result = search_posts.execute(query, user_id)
+
+        # Assert
+        assert result == SearchResponse(
+            results=search_posts.snippet_builder.build.return_value,
+            total=len(expected_matches),
+        )
+        mock_index_lookup.lookup.assert_called_once_with(
+            query, existing_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_preserves_query_string(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test that the query string is passed unchanged to lookup."""
+        # Arrange
+        queries = ["Python", "PYTHON", "python", "PyThOn"]
+        existing_index = UserIndex()
+
+        mock_index_repository.get_index_by_user_id.return_value = existing_index
+        mock_index_lookup.lookup.return_value = RankedMatches(matches=[], total=0)
+
+        # Act & Assert
+        for query in queries:
+            search_posts.execute(query, user_id)
+            mock_index_lookup.lookup.assert_called_with(
+            query, existing_index, limit=None, offset=0, fuzzy=False, filters=None
+        )
+
+    def test_execute_with_different_user_ids(
+        self, search_posts, mock_index_repository, mock_index_lookup, sample_posts
+    ):
+        """Test execute maintains separate indices for different users."""
+        # Arrange
+        user_id_1 = UserId("user_1")
+        user_id_2 = UserId("user_2")
+        query = "search"
+        index_1 = UserIndex()
+        index_2 = UserIndex()
+
+        mock_index_repository.get_index_by_user_id.side_effect = [index_1, index_2]
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=[("match", 1.0)], total=1
+        )
+
+        # Act
+        search_posts.execute(query, user_id_1)
+        search_posts.execute(query, user_id_2)
+
+        # Assert
+        assert mock_index_repository.get_index_by_user_id.call_count == 2
+        mock_index_repository.get_index_by_user_id.assert_any_call(user_id_1)
+        mock_index_repository.get_index_by_user_id.assert_any_call(user_id_2)
+        assert mock_index_lookup.lookup.call_count == 2
+
+    def test_execute_hybrid_fuses_keyword_and_dense_rankings(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test hybrid mode ranks posts found by both retrievers first."""
+        # Arrange
+        search_posts.post_embedder = Mock()
+        search_posts.vector_index = Mock()
+        search_posts.vector_index.search.return_value = [("post_3", 0.9), ("post_1", 0.8)]
+        search_posts.vector_index.size.return_value = 2
+        search_posts.hybrid_candidates = 50
+        user_index = UserIndex()
+        mock_index_repository.get_index_by_user_id.return_value = user_index
+        mock_index_lookup.lookup.return_value = RankedMatches(
+            matches=[("post_1", 4.0), ("post_2", 2.0)],
+            total=2,
+            terms=["python"],
+            highlights={"post_1": [(0, 6)], "post_2": [(3, 9)]},
+        )
+
+        # Act
+        result = search_posts.execute("python", user_id, limit=2, mode="hybrid")
+
+        # Assert
+        assert result.total == 3
+        mock_index_lookup.lookup.assert_called_once_with("python", user_index, limit=50, fuzzy=False, filters=None)
+        assert search_posts.vector_index.search.call_args.kwargs["top_k"] == 50
+        # Dense retrieval only reads the vector index
+        search_posts.post_repository.get_posts_by_user_id.assert_not_called()
+        matches, highlights, _ = search_posts.snippet_builder.build.call_args.args
+        assert [post_id for post_id, _ in matches] == ["post_1", "post_3"]
+        assert highlights == {"post_1": [(0, 6)]}
+        assert not result.total_capped
+
+    def test_execute_hybrid_reports_a_capped_total(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test hybrid mode ranks every candidate without a limit, and flags a cut-off total with one."""
+        # Arrange
+        search_posts.post_embedder = Mock()
+        search_posts.vector_index = Mock()
+        search_posts.vector_index.size.return_value = 3
+        search_posts.vector_index.search.return_value = [("post_3", 0.9), ("post_1", 0.8), ("post_4", 0.1)]
+        search_posts.hybrid_candidates = 2
+        mock_index_repository.get_index_by_user_id.return_value = UserIndex()
+        mock_index_lookup.lookup.return_value = RankedMatches(matches=[("post_1", 4.0), ("post_2", 2.0)], total=2)
+
+        # Act
+        everything = search_posts.execute("python", user_id, mode="hybrid")
+        page = search_posts.execute("python", user_id, limit=1, mode="hybrid")
+
+        # Assert
+        assert mock_index_lookup.lookup.call_args_list[0].kwargs["limit"] is None
+        assert search_posts.vector_index.search.call_args_list[0].kwargs["top_k"] is None
+        assert everything.total == 4
+        assert not everything.total_capped
+        assert page.total_capped
+        assert page.next_cursor is not None
+
+    def test_execute_hybrid_filters_dense_hits_before_the_depth_cut(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test filtered hybrid queries rank every vector, so filtered-out posts never crowd the candidates."""
+        # Arrange
+        search_posts.post_embedder = Mock()
+        search_posts.vector_index = Mock()
+        search_posts.vector_index.search.return_value = [(f"other_{i}", 0.9) for i in range(5)] + [("post_9", 0.5)]
+        search_posts.hybrid_candidates = 2
+        mock_index_repository.get_index_by_user_id.return_value = UserIndex()
+        mock_index_lookup.lookup.return_value = RankedMatches(matches=[], total=0)
+        mock_index_lookup.filter_posts.return_value = ["post_9"]
+
+        # Act
+        result = search_posts.execute(
+            "python", user_id, limit=1, mode="hybrid", filters=PostFilter(authors=("Ada",))
+        )
+
+        # Assert
+        assert search_posts.vector_index.search.call_args.kwargs["top_k"] is None
+        matches, _, _ = search_posts.snippet_builder.build.call_args.args
+        assert [post_id for post_id, _ in matches] == ["post_9"]
+        assert result.total == 1
+
+    def test_execute_hybrid_without_dense_retriever_raises(
+        self, search_posts, user_id, mock_index_repository
+    ):
+        """Test hybrid mode requires an embedder and a vector index."""
+        mock_index_repository.get_index_by_user_id.return_value = UserIndex()
+
+        with pytest.raises(ValueError):
+            search_posts.execute("python", user_id, mode="hybrid")
+
+    def test_execute_serves_repeated_queries_from_cache(
+        self, search_posts, user_id, mock_index_repository, mock_index_lookup
+    ):
+        """Test a repeated query is cached until the index generation changes."""
+        # Arrange
+        search_posts.result_cache = LRUSearchResultCache()
+        user_index = UserIndex()
+        mock_index_repository.get_index_by_user_id.return_value = user_index
+        mock_index_lookup.lookup.return_value = RankedMatches(matches=[], total=0)
+
+        # Act
+        first = search_posts.execute("python  rust", user_id)
+        second = search_posts.execute("python rust", user_id)
+        user_index.generation += 1
+        search_posts.execute("python rust", user_id)
+
+        # Assert
+        assert second is first
+        assert mock_index_lookup.lookup.call_count == 2
+        assert search_posts.cache_stats().hits == 1
+
+    def test_execute_pages_with_cursor_and_hydrates_selected_fields(self, sample_posts, user_id):
+        """Test cursor pagination and sparse post hydration end to end."""
+        # Arrange
+        post_repo = InMemoryPostRepository()
+        post_repo.add_posts(sample_posts)
+        search_posts = SearchPosts(
+            index_lookup=SimpleSearchIndexLookup(tokenizer=SimpleTokenizer()),
+            index_repository=InMemorySearchIndexRepository(),
+            index_builder=InMemorySearchIndexBuilder(),
+            tokenizer=SimpleTokenizer(),
+            post_repository=post_repo,
+            snippet_builder=SimpleSnippetBuilder(),
+        )
+
+        # Act
+        first = search_posts.execute(
+            "post", user_id, limit=2, include_posts=True, post_fields=["author"]
+        )
+        second = search_posts.execute("post", user_id, limit=2, cursor=first.next_cursor)
+
+        # Assert
+        assert first.total == 3
+        assert all(set(result.post) == {"author"} for result in first.results)
+        assert second.next_cursor is None
+        assert second.results[0].post is None
+        assert len({r.post_id for r in first.results + second.results}) == 3
+
+    def test_execute_rejects_stale_and_foreign_cursors(self, sample_posts, user_id):
+        """Test a cursor is refused once the posts change, or for another query."""
+        # Arrange
+        post_repo = InMemoryPostRepository()
+        post_repo.add_posts(sample_posts)
+        index_repository = InMemorySearchIndexRepository()
+        builder = InMemorySearchIndexBuilder()
+        search_posts = SearchPosts(
+            index_lookup=SimpleSearchIndexLookup(tokenizer=SimpleTokenizer()),
+            index_repository=index_repository,
+            index_builder=builder,
+            tokenizer=SimpleTokenizer(),
+            post_repository=post_repo,
+            snippet_builder=SimpleSnippetBuilder(),
+        )
+        first = search_posts.execute("post", user_id, limit=2)
+
+        # Act / Assert
+        with pytest.raises(ValueError, match="another query"):
+            search_posts.execute("programming", user_id, limit=2, cursor=first.next_cursor)
+        builder.remove_posts(index_repository.get_index_by_user_id(user_id), ["post_1"])
+        with pytest.raises(ValueError, match="Stale cursor"):
+            search_posts.execute("post", user_id, limit=2, cursor=first.next_cursor)
+
+    def test_execute_rejects_unknown_post_fields(self, search_posts, user_id):
+        """Test that sparse field selection is validated."""
+        with pytest.raises(ValueError):
+            search_posts.execute("python", user_id, include_posts=True, post_fields=["password"])
+
+    @pytest.mark.parametrize(
+        "looker,builder,tokenizer,post_repo,index_repo,snippet_builder",
+        [
+            (
+                SimpleSearchIndexLookup(tokenizer=SimpleTokenizer()),
+                InMemorySearchIndexBuilder(),
+                SimpleTokenizer(),
+                InMemoryPostRepository(),
+                InMemorySearchIndexRepository(),
+                SimpleSnippetBuilder(),
+            ),
+        ],
+    )
+    def test_integration_execute(
+        self,
+        looker,
+        builder,
+        tokenizer,
+        post_repo,
+        index_repo,
+        snippet_builder,
+        user_id,
+        sample_posts,
+    ):
+        """Integration test for SearchPosts with real implementations."""
+        # Arrange
+        search_posts = SearchPosts(
+            index_lookup=looker,
+            index_repository=index_repo,
+            index_builder=builder,
+            tokenizer=tokenizer,
+            post_repository=post_repo,
+            snippet_builder=snippet_builder,
+        )
+        query = "programming"
+
+        for post in sample_posts:
+            post_repo.add_post(post)
+
+        # Act
+        results = search_posts.execute(query, user_id)
+
+        # Assert
+        assert results.total == 2  # Expecting 2 posts related to programming
+        assert {r.post_id for r in results.results} == {"post_1", "post_2"}
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+import json
 from typing import List
 
 from fastapi.testclient import TestClient
@@ -8,13 +10,21 @@ from infrastructure.fastapi.get_most_popular_authors_api import (
     GetPopularAuthorsAPIBase,
 )
 from infrastructure.fastapi.search_posts_api import SearchPostsAPIBase
-from infrastructure.fastapi.compute_projection_api import ComputeProjectionAPIBase
+from infrastructure.fastapi.compute_projection_api import ComputeProjectionAPIBase, ComputeProjectionAPIImpl
+from infrastructure.fastapi.get_posts_api import GetPostsAPIImpl
+from infrastructure.fastapi.get_topics_api import GetTopicsAPIImpl
+from infrastructure.fastapi.health_api import HealthAPIImpl
+from application.interfaces.warm_up import WarmUp
+from application.use_cases.check_health import CheckHealth
 from infrastructure.fastapi.compute_word_cloud_api import (
     ComputeWordCloudAPIBase,
 )
-from domain.entities.post import PostId, Post
+from domain.entities.post import PostId, Post, PostsResponse
 from domain.entities.author import AuthorPopularity
-from domain.entities.post import PostProjection
+from domain.entities.post import KeywordRelevance, PostProjection
+from domain.entities.projection_job import ProjectionJob, ProjectionUpdate
+from domain.entities.search import Facets
+from domain.entities.topic import TopicSummary
 
 
 class DummyPopular(GetPopularAuthorsAPIBase):
@@ -29,6 +39,15 @@ class DummySearch(SearchPostsAPIBase):
 
 class DummyProjection(ComputeProjectionAPIBase):
     async def compute_projection(self):
+        return ProjectionJob(id="job_1", generation=1, status="pending")
+
+    async def compute_projection_stream(self):
+        return []
+
+    async def projection_job(self, job_id: str):
+        return ProjectionJob(id=job_id, generation=1, status="done")
+
+    async def projection_result(self, job_id: str):
         return [PostProjection(post_id="post_1", x=0.1, y=0.2, keywords=[])]
 
 
@@ -84,6 +103,14 @@ def test_app_builder_creates_working_app():
         assert r.json() == ["post_1", "post_2"]
 
         r = client.get("/projection")
+        assert r.status_code == 202
+        job_id = r.json()["id"]
+
+        r = client.get(f"/projection/jobs/{job_id}")
+        assert r.status_code == 200
+        assert r.json()["status"] == "done"
+
+        r = client.get(f"/projection/jobs/{job_id}/result")
         assert r.status_code == 200
         assert isinstance(r.json(), list)
 
@@ -106,3 +133,176 @@ def test_app_builder_creates_working_app():
             {"id": "p1", "userId": "user1", "author": "Author", "authorImage": "", "authorHeadline": "", "timestamp": "", "text": "", "postImage": "", "postUrl": "", "profileUrl": "", "meta": {}},
             {"id": "p2", "userId": "user1", "author": "Author", "authorImage": "", "authorHeadline": "", "timestamp": "", "text": "", "postImage": "", "postUrl": "", "profileUrl": "", "meta": {}},
         ]
+
+
+class DummyProgressiveProjection:
+    def progressive(self, user_id):
+        job = ProjectionJob(id="job_1", generation=1, status="running")
+        yield ProjectionUpdate(stage="preview", job=job, projections=[PostProjection("post_1", 0.5, -0.5, [])])
+        yield ProjectionUpdate(stage="timeout", job=job)
+
+
+def test_projection_stream_sends_server_sent_events():
+    api = ComputeProjectionAPIImpl(compute_projection_use_case=DummyProgressiveProjection())
+    app = AppBuilder(compute_projection_api=api).create_app()
+
+    with TestClient(app) as client:
+        r = client.get("/projection/stream")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n", 1) for block in r.text.strip().split("\n\n")]
+    assert [event for event, _ in events] == ["event: preview", "event: timeout"]
+    preview = json.loads(events[0][1].removeprefix("data: "))
+    assert preview["projections"] == [{"post_id": "post_1", "x": 0.5, "y": -0.5, "keywords": [], "topic_id": None}]
+    assert preview["job"]["id"] == "job_1"
+
+
+class DummyFinishedProjection:
+    keywords = [KeywordRelevance(keyword="model", score=0.5)]
+
+    def job(self, user_id, job_id):
+        return ProjectionJob(id=job_id, generation=1, status="done")
+
+    def result(self, user_id, job_id):
+        return [
+            PostProjection("post_1", 0.5, 1.5, self.keywords, topic_id=0),
+            PostProjection("post_2", 2.5, 3.5, self.keywords, topic_id=0),
+        ]
+
+
+def test_projection_result_is_negotiated():
+    api = ComputeProjectionAPIImpl(compute_projection_use_case=DummyFinishedProjection())
+    app = AppBuilder(compute_projection_api=api).create_app()
+
+    with TestClient(app) as client:
+        r = client.get("/projection/jobs/job_1/result")
+        assert r.status_code == 200
+        assert len(r.json()) == 2
+        assert r.json()[0]["keywords"] == [{"keyword": "model", "score": 0.5}]
+
+        r = client.get("/projection/jobs/job_1/result", params={"columnar": True})
+        assert r.status_code == 200
+        assert r.json() == {
+            "topics": [{"id": 0, "keywords": [{"keyword": "model", "score": 0.5}]}],
+            "post_id": ["post_1", "post_2"],
+            "x": [0.5, 2.5],
+            "y": [1.5, 3.5],
+            "topic_id": [0, 0],
+        }
+
+        r = client.get("/projection/jobs/job_1/result", headers={"Accept": "text/csv"})
+        assert r.status_code == 406
+
+
+class DummyTopics:
+    def __init__(self, fitted=True):
+        self.fitted = fitted
+        self.calls = []
+
+    def topics(self, user_id):
+        return [TopicSummary(id=0, keywords=[KeywordRelevance(keyword="model", score=0.5)], size=2)] if self.fitted else None
+
+    def topic_posts(self, user_id, topic_id, limit, offset):
+        self.calls.append((topic_id, limit, offset))
+        return [] if self.fitted else None
+
+    def representative_posts(self, user_id, topic_id):
+        return [] if self.fitted else None
+
+
+def test_topics_are_served_once_fitted():
+    use_case = DummyTopics()
+    app = AppBuilder(get_topics_api=GetTopicsAPIImpl(get_topics_use_case=use_case)).create_app()
+
+    with TestClient(app) as client:
+        r = client.get("/topics")
+        assert r.status_code == 200
+        assert r.json() == [{"id": 0, "keywords": [{"keyword": "model", "score": 0.5}], "size": 2}]
+        assert client.get("/topics/0/posts", params={"limit": 5, "offset": 10}).status_code == 200
+        assert client.get("/topics/0/representative").status_code == 200
+        assert client.get("/topics/0/posts", params={"limit": 0}).status_code == 422
+        assert use_case.calls == [(0, 5, 10)]
+
+        use_case.fitted = False
+        assert client.get("/topics").status_code == 404
+        assert client.get("/topics/0/posts").status_code == 404
+
+
+class DummyFilteredPosts:
+    def execute(self, user_id, post_ids, filters=None):
+        return []
+
+    def execute_with_facets(self, user_id, post_ids, filters=None):
+        if filters.authors == ("nobody",):
+            raise ValueError("Facet counts require a search index")
+        return PostsResponse(posts=[], facets=Facets(authors={"Ada": 2}, months={"2024-01": 2}))
+
+
+def test_posts_come_with_facets_on_request():
+    app = AppBuilder(get_posts_api=GetPostsAPIImpl(get_posts_use_case=DummyFilteredPosts())).create_app()
+
+    with TestClient(app) as client:
+        assert client.get("/users/me/posts", params={"author": "Ada"}).json() == []
+        r = client.get("/users/me/posts", params={"author": "Ada", "facets": True})
+        assert r.json() == {"posts": [], "facets": {"authors": {"Ada": 2}, "months": {"2024-01": 2}}}
+        assert client.get("/users/me/posts", params={"author": "nobody", "facets": True}).status_code == 400
+
+
+class DummyModel(WarmUp):
+    def __init__(self):
+        self.state = "cold"
+
+    def warm_up(self):
+        self.state = "ready"
+
+    def model_state(self):
+        return self.state
+
+
+def test_readiness_waits_for_the_models():
+    model = DummyModel()
+    app = AppBuilder(health_api=HealthAPIImpl(CheckHealth(models={"embedder": model}))).create_app()
+
+    with TestClient(app) as client:
+        assert client.get("/healthz").status_code == 200
+        r = client.get("/readyz")
+        assert r.status_code == 503
+        assert r.json() == {"ready": False, "models": {"embedder": "cold"}}
+
+        for thread in CheckHealth(models={"embedder": model}).start_warm_up():
+            thread.join()
+
+        r = client.get("/readyz")
+        assert r.status_code == 200
+        assert r.json()["ready"] is True
+
+
+def test_lazy_models_do_not_hold_readiness_back():
+    model = DummyModel()
+    app = AppBuilder(
+        health_api=HealthAPIImpl(CheckHealth(models={"embedder": model}, wait_for_models=False))
+    ).create_app()
+
+    with TestClient(app) as client:
+        assert client.get("/readyz").status_code == 200
+        model.state = "failed"
+        assert client.get("/readyz").status_code == 503
+
+
+def test_lifespan_runs_with_the_server():
+    events = []
+
+    @asynccontextmanager
+    async def lifespan(app):
+        events.append("start")
+        yield
+        events.append("stop")
+
+    app = AppBuilder(health_api=HealthAPIImpl(CheckHealth(models={})), lifespan=lifespan).create_app()
+
+    assert events == []
+    with TestClient(app) as client:
+        assert events == ["start"]
+        assert client.get("/healthz").status_code == 200
+    assert events == ["start", "stop"]
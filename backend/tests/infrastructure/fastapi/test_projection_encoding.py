@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from domain.entities.post import KeywordRelevance, ProjectionTable, ProjectionTopic
+from infrastructure.fastapi.projection_encoding import ARROW, JSON, MSGPACK, encode_table, negotiate
+
+TABLE = ProjectionTable(
+    topics=[ProjectionTopic(id=0, keywords=[KeywordRelevance(keyword="model", score=0.5)])],
+    post_id=["p1", "p2"],
+    x=[1.5, -2.0],
+    y=[0.25, 3.0],
+    topic_id=[0, None],
+)
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize(
+        "accept, media_type",
+        [
+            (None, JSON),
+            ("*/*", JSON),
+            ("application/json", JSON),
+            ("application/x-msgpack", MSGPACK),
+            ("application/json;q=0.5, application/msgpack", MSGPACK),
+            ("application/vnd.apache.arrow.stream, application/msgpack", ARROW),
+            ("text/html, */*;q=0.1", JSON),
+            ("text/html", None),
+            ("application/msgpack;q=0", None),
+        ],
+    )
+    def test_preferred_supported_type_is_picked(self, accept, media_type):
+        assert negotiate(accept) == media_type
+
+
+class TestEncodeTable:
+    def test_msgpack_carries_the_table(self):
+        msgpack = pytest.importorskip("msgpack")
+
+        decoded = msgpack.unpackb(encode_table(TABLE, MSGPACK))
+
+        assert decoded["post_id"] == ["p1", "p2"]
+        assert decoded["x"] == [1.5, -2.0]
+        assert decoded["topic_id"] == [0, None]
+        assert decoded["topics"] == [{"id": 0, "keywords": [{"keyword": "model", "score": 0.5}]}]
+
+    def test_arrow_stream_carries_the_columns_and_topics(self):
+        pa = pytest.importorskip("pyarrow")
+
+        table = pa.ipc.open_stream(encode_table(TABLE, ARROW)).read_all()
+
+        assert table.column("post_id").to_pylist() == ["p1", "p2"]
+        assert table.column("y").to_pylist() == [0.25, 3.0]
+        assert table.column("topic_id").to_pylist() == [0, None]
+        assert json.loads(table.schema.metadata[b"topics"])[0]["id"] == 0
+
+    def test_missing_encoder_is_not_acceptable(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def no_msgpack(name, *args, **kwargs):
+            if name == "msgpack":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", no_msgpack)
+
+        with pytest.raises(HTTPException) as error:
+            encode_table(TABLE, MSGPACK)
+        assert error.value.status_code == 406
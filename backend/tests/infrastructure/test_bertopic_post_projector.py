@@ -1,12 +1,18 @@
+import dataclasses
+
 import pytest
 from unittest.mock import MagicMock
 
 import numpy as np
+import sentence_transformers
 import umap
 
 from domain.entities.post import Post, PostId
 from infrastructure.bertopic_post_projector import BertopicPostProjector
+from infrastructure.landmark_umap import LandmarkUMAP
 from infrastructure import bertopic_post_projector
+from infrastructure.mmap_embedding_store import MmapEmbeddingStore
+from infrastructure.sentence_transformer_embedder import SentenceTransformerEmbedder
 
 
 @pytest.fixture
@@ -171,6 +177,213 @@ class TestBertopicProjector:
             assert proj.y == 2.0
             assert len(proj.keywords) >= 0
 
+    def test_embedding_store_skips_already_encoded_posts(self, tmp_path, sample_posts):
+        embedder_mock = MagicMock()
+        embedder_mock.encode.side_effect = lambda texts: np.ones((len(texts), 2))
+
+        for posts in (sample_posts[:9], sample_posts):
+            projector = BertopicPostProjector(
+                embedder=embedder_mock,
+                embedding_store=MmapEmbeddingStore(str(tmp_path)),
+            )
+            embeddings = projector.embed_posts(posts)
+            assert embeddings.shape == (len(posts), 2)
+
+        assert [len(call.args[0]) for call in embedder_mock.encode.call_args_list] == [9, 1]
+
+    def test_stored_post_embeddings_never_encode(self, tmp_path, sample_posts):
+        embedder_mock = MagicMock()
+        embedder_mock.encode.side_effect = lambda texts: np.ones((len(texts), 2))
+        projector = BertopicPostProjector(embedder=embedder_mock, embedding_store=MmapEmbeddingStore(str(tmp_path)))
+        projector.embed_posts(sample_posts[:3])
+
+        found, embeddings = projector.stored_post_embeddings(sample_posts[:5])
+
+        assert found == [0, 1, 2]
+        assert embeddings.shape == (3, 2)
+        assert embedder_mock.encode.call_count == 1
+        assert BertopicPostProjector(embedder=embedder_mock).stored_post_embeddings(sample_posts)[0] == []
+
+    @pytest.fixture
+    def topic_model(self, monkeypatch):
+        topic_model = MagicMock()
+
+        def fit_transform(docs, embeddings):
+            topic_model.umap_model.embedding_ = np.arange(2.0 * len(docs)).reshape(-1, 2)
+            return [0] * len(docs), None
+
+        topic_model.fit_transform.side_effect = fit_transform
+        topic_model.umap_model.transform.side_effect = lambda embeddings: np.full((len(embeddings), 2), -1.0)
+        topic_model.hdbscan_model.predict.side_effect = lambda reduced: [0] * len(reduced)
+        topic_model._map_predictions.side_effect = list
+        topic_model.get_topic.return_value = [("ai", 0.5)]
+        monkeypatch.setattr(bertopic_post_projector, "BERTopic", MagicMock(return_value=topic_model))
+        monkeypatch.setattr(bertopic_post_projector, "umap", MagicMock())
+        return topic_model
+
+    @pytest.fixture
+    def embedder(self):
+        embedder = MagicMock()
+        embedder.encode.side_effect = lambda texts: np.ones((len(texts), 2))
+        return embedder
+
+    def test_models_load_on_first_use(self, monkeypatch, topic_model, sample_posts):
+        sentence_transformer = MagicMock()
+        sentence_transformer.return_value.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 2))
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", sentence_transformer)
+        projector = BertopicPostProjector(embedder=SentenceTransformerEmbedder(model_name="some-model"))
+
+        assert projector.model_state() == "cold"
+        sentence_transformer.assert_not_called()
+        projector.project(sample_posts)
+
+        sentence_transformer.assert_called_once()
+        assert sentence_transformer.call_args.args == ("some-model",)
+        assert projector.model_state() == "ready"
+
+    def test_warm_up_loads_the_models_once(self, monkeypatch, topic_model):
+        sentence_transformer = MagicMock()
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", sentence_transformer)
+        projector = BertopicPostProjector()
+
+        projector.warm_up()
+        projector.warm_up()
+
+        assert sentence_transformer.call_count == 1
+        assert projector.model_state() == "ready"
+
+    def test_warm_up_can_load_the_embedder_alone(self, monkeypatch):
+        sentence_transformer = MagicMock()
+        import_topic_modelling = MagicMock()
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", sentence_transformer)
+        monkeypatch.setattr(bertopic_post_projector, "_import_topic_modelling", import_topic_modelling)
+        projector = BertopicPostProjector(warm_up_topic_modelling=False)
+
+        projector.warm_up()
+
+        assert sentence_transformer.call_count == 1
+        import_topic_modelling.assert_not_called()
+        assert projector.model_state() == "ready"
+
+    def test_small_additions_are_placed_on_the_fitted_models(self, topic_model, embedder, sample_posts):
+        projector = BertopicPostProjector(embedder=embedder, refit_growth=0.25)
+
+        first = projector.project(sample_posts[:8])
+        second = projector.project(sample_posts)
+
+        assert second[:8] == first
+        assert (second[9].x, second[9].y) == (-1.0, -1.0)
+        assert topic_model.fit_transform.call_count == 1
+        # The new posts are reduced once, and clustered without running UMAP again
+        assert topic_model.umap_model.transform.call_count == 1
+        topic_model.transform.assert_not_called()
+        assert [len(call.args[0]) for call in embedder.encode.call_args_list] == [8, 2]
+
+    def test_large_changes_trigger_a_refit(self, topic_model, embedder, sample_posts):
+        projector = BertopicPostProjector(embedder=embedder, refit_growth=0.25)
+        projector.project(sample_posts[:8])
+
+        projections = projector.project(sample_posts[:3])
+
+        assert topic_model.fit_transform.call_count == 2
+        assert [p.post_id for p in projections] == ["1", "2", "3"]
+
+    def test_posts_outside_every_topic_trigger_a_refit(self, topic_model, embedder, sample_posts):
+        topic_model.hdbscan_model.predict.side_effect = lambda reduced: [-1] * len(reduced)
+        projector = BertopicPostProjector(embedder=embedder, refit_growth=0.25, refit_drift=0.1)
+        projector.project(sample_posts[:8])
+
+        projections = projector.project(sample_posts[:9])
+
+        assert topic_model.fit_transform.call_count == 2
+        assert (projections[8].x, projections[8].y) == (16.0, 17.0)
+
+    def test_large_corpora_fit_on_landmarks_with_mini_batch_clustering(self, topic_model, embedder, sample_posts):
+        settings = dict(landmark_threshold=5, landmarks=4, minibatch_threshold=8, minibatch_clusters=3)
+
+        BertopicPostProjector(embedder=embedder, **settings).project(sample_posts[:7])
+        landmarks_only = bertopic_post_projector.BERTopic.call_args.kwargs
+        BertopicPostProjector(embedder=embedder, **settings).project(sample_posts)
+        both = bertopic_post_projector.BERTopic.call_args.kwargs
+
+        assert isinstance(landmarks_only["umap_model"], LandmarkUMAP)
+        assert landmarks_only["umap_model"].n_landmarks == 4
+        assert "hdbscan_model" not in landmarks_only
+        assert both["hdbscan_model"].n_clusters == 3
+
+    def test_umap_is_seeded_unless_in_fast_mode(self, topic_model, embedder, sample_posts):
+        BertopicPostProjector(embedder=embedder).project(sample_posts)
+        deterministic = bertopic_post_projector.umap.UMAP.call_args.kwargs
+        BertopicPostProjector(embedder=embedder, umap_mode="fast", n_jobs=4).project(sample_posts)
+        fast = bertopic_post_projector.umap.UMAP.call_args.kwargs
+
+        assert deterministic["random_state"] == 42
+        assert "n_jobs" not in deterministic
+        assert fast["random_state"] is None
+        assert fast["n_jobs"] == 4
+
+    def test_fast_refits_are_aligned_to_the_previous_layout(self, topic_model, embedder, sample_posts):
+        layouts = iter([lambda xy: xy, lambda xy: -2.0 * xy[:, ::-1] + 7.0])
+
+        def fit_transform(docs, embeddings):
+            layout = next(layouts)
+            coords = np.array([[float(i), float(i * i % 7)] for i in range(len(docs))])
+            topic_model.umap_model.embedding_ = layout(coords)
+            return [0] * len(docs), None
+
+        topic_model.fit_transform.side_effect = fit_transform
+        projector = BertopicPostProjector(embedder=embedder, umap_mode="fast", refit_growth=0.25)
+
+        first = projector.project(sample_posts[:8])
+        second = projector.project(sample_posts[:5])
+
+        assert topic_model.fit_transform.call_count == 2
+        # The refit starts from the previous layout and is aligned back onto it
+        assert np.allclose(bertopic_post_projector.umap.UMAP.call_args.kwargs["init"], [(p.x, p.y) for p in first[:5]])
+        assert np.allclose([(p.x, p.y) for p in second], [(p.x, p.y) for p in first[:5]])
+
+    def test_only_the_most_recent_users_keep_their_fit(self, topic_model, embedder, sample_posts):
+        projector = BertopicPostProjector(embedder=embedder, refit_growth=0.25, max_users=2)
+        posts_of = {
+            user_id: [dataclasses.replace(post, userId=user_id) for post in sample_posts[:8]]
+            for user_id in ("a", "b", "c")
+        }
+        projector.project(posts_of["a"])
+        projector.project(posts_of["b"])
+        projector.project(posts_of["a"])
+        projector.project(posts_of["c"])
+        assert list(projector._states) == ["a", "c"]
+        assert topic_model.fit_transform.call_count == 3
+
+        # An evicted user gets a full fit again
+        projector.project(posts_of["b"])
+        assert topic_model.fit_transform.call_count == 4
+        assert list(projector._states) == ["c", "b"]
+
+    def test_fitted_topics_group_the_placed_posts(self, topic_model, embedder, sample_posts):
+        topic_model.fit_transform.side_effect = None
+        topic_model.fit_transform.return_value = ([0, 0, 1, 1, 1, 0, 1, -1], None)
+        topic_model.umap_model.embedding_ = np.zeros((8, 2))
+        projector = BertopicPostProjector(embedder=embedder, refit_growth=0.25)
+        assert projector.fitted_topics(sample_posts[0].userId) is None
+        projector.project(sample_posts[:8])
+        texts = projector._states[sample_posts[0].userId].texts
+        topic_model.get_representative_docs.side_effect = lambda topic_id: {
+            0: [texts["6"], texts["1"]], 1: [texts["3"]]
+        }.get(topic_id)
+
+        topics = projector.fitted_topics(sample_posts[0].userId)
+
+        assert sorted(topics) == [-1, 0, 1]
+        assert topics[0].post_ids == ["1", "2", "6"]
+        assert topics[0].representative_post_ids == ["6", "1"]
+        assert topics[1].post_ids == ["3", "4", "5", "7"]
+        assert topics[-1].representative_post_ids == []
+
+    def test_unknown_umap_mode_is_rejected(self):
+        with pytest.raises(ValueError):
+            BertopicPostProjector(embedder=MagicMock(), umap_mode="turbo")
+
     def test_project_with_real_bertopic(self, sample_posts):
         # Set n_neighbors=2 for UMAP to avoid k >= N and n_neighbors > 1 errors with 6 samples
         # Set min_dist=0.1 and n_components=2
@@ -0,0 +1,134 @@
+import pytest
+
+from domain.entities.search import Post
+from infrastructure.file_search_index_repository import FileSearchIndexRepository
+from infrastructure.index_segment import SegmentPostings
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+@pytest.fixture
+def tokenizer():
+    return SimpleTokenizer()
+
+
+@pytest.fixture
+def builder():
+    return InMemorySearchIndexBuilder()
+
+
+@pytest.fixture
+def lookup(tokenizer):
+    return SimpleSearchIndexLookup(tokenizer=tokenizer)
+
+
+POSTS = [
+    Post(id="1", text="Python for data science", author="Ada Lovelace"),
+    Post(id="2", text="Rust systems programming", author="Grace Hopper"),
+    Post(id="3", text="Python web development with Django", author="Ada Lovelace"),
+    Post(id="4", text="Data engineering pipelines in Python", author="Alan Turing"),
+]
+
+
+def _reopen(tmp_path):
+    return FileSearchIndexRepository(str(tmp_path)).get_index_by_user_id("u1")
+
+
+class TestFileSearchIndexRepository:
+    def test_missing_user_has_no_index(self, tmp_path):
+        assert FileSearchIndexRepository(str(tmp_path)).get_index_by_user_id("u1") is None
+
+    def test_index_survives_restart(self, tmp_path, builder, tokenizer, lookup):
+        index = builder.build_index(POSTS, tokenizer)
+        FileSearchIndexRepository(str(tmp_path)).save_user_index("u1", index)
+
+        loaded = _reopen(tmp_path)
+
+        assert isinstance(loaded.postings, SegmentPostings)
+        assert loaded.post_ids == index.post_ids
+        assert loaded.terms == index.terms
+        assert loaded.total_length == index.total_length
+        for query in ["python", '"data science"', "author:ada", "python -django"]:
+            assert lookup.lookup(query, loaded) == lookup.lookup(query, index)
+
+    def test_highlight_spans_survive_restart(self, tmp_path, builder, tokenizer, lookup):
+        text = "Un cafe\u0301 de\u0301licieux"
+        index = builder.build_index([Post(id="1", text=text)], tokenizer)
+        FileSearchIndexRepository(str(tmp_path)).save_user_index("u1", index)
+        [(start, end)] = lookup.lookup("délicieux", _reopen(tmp_path)).highlights["1"]
+        assert text[start:end] == "de\u0301licieux"
+
+    def test_incremental_saves_append_segments(self, tmp_path, builder, tokenizer, lookup):
+        repository = FileSearchIndexRepository(str(tmp_path), merge_factor=10)
+        index = builder.build_index(POSTS[:2], tokenizer)
+        repository.save_user_index("u1", index)
+        builder.add_posts(index, POSTS[2:], tokenizer)
+        repository.save_user_index("u1", index)
+
+        assert len(list(tmp_path.glob("*/*.seg"))) == 2
+        loaded = _reopen(tmp_path)
+        assert lookup.lookup("python", loaded) == lookup.lookup("python", builder.build_index(POSTS, tokenizer))
+
+        # A loaded index keeps growing on top of its segments
+        builder.add_posts(loaded, [Post(id="5", text="Python tooling")], tokenizer)
+        assert lookup.lookup("python", loaded).total == 4
+
+    def test_tombstones_and_compaction_are_persisted(self, tmp_path, builder, tokenizer, lookup):
+        repository = FileSearchIndexRepository(str(tmp_path))
+        index = builder.build_index(POSTS, tokenizer)
+        repository.save_user_index("u1", index)
+
+        builder.remove_posts(index, ["1"])
+        repository.save_user_index("u1", index)
+        assert {post_id for post_id, _ in lookup.lookup("python", _reopen(tmp_path)).matches} == {"3", "4"}
+
+        builder.compact(index)
+        repository.save_user_index("u1", index)
+        loaded = _reopen(tmp_path)
+        assert loaded.tombstones == set()
+        assert loaded.post_ids == ["2", "3", "4"]
+        assert len(list(tmp_path.glob("*/*.seg"))) == 1
+
+    def test_loaded_index_takes_new_posts_after_compaction(self, tmp_path, builder, tokenizer, lookup):
+        FileSearchIndexRepository(str(tmp_path)).save_user_index("u1", builder.build_index(POSTS, tokenizer))
+        loaded = _reopen(tmp_path)
+        builder.remove_posts(loaded, ["2"])
+        # "python" loses no doc, so compaction renumbers its doc IDs and leaves the rest on disk
+        builder.compact(loaded)
+
+        builder.add_posts(loaded, [Post(id="5", text="Python tooling")], tokenizer)
+
+        assert {post_id for post_id, _ in lookup.lookup("python", loaded).matches} == {"1", "3", "4", "5"}
+        assert lookup.lookup("tooling", loaded).highlights == {"5": [(7, 14)]}
+
+    def test_live_doc_freqs_come_from_the_term_dictionary(self, tmp_path, builder, tokenizer):
+        repository = FileSearchIndexRepository(str(tmp_path), merge_factor=10)
+        index = builder.build_index(POSTS[:2], tokenizer)
+        repository.save_user_index("u1", index)
+        builder.add_posts(index, POSTS[2:], tokenizer)
+        builder.remove_posts(index, ["1"])
+        repository.save_user_index("u1", index)
+
+        loaded = _reopen(tmp_path)
+
+        assert loaded.doc_freqs == index.doc_freqs
+        assert loaded.doc_freqs["python"] == 2
+        assert list(loaded.postings.loaded_items()) == []  # no posting list was read
+        assert set(loaded.doc_terms[1]) == {"rust", "systems", "programming"}
+        builder.remove_posts(loaded, ["3"])
+        assert loaded.doc_freqs["python"] == 1
+
+    def test_small_segments_are_merged_in_background(self, tmp_path, builder, tokenizer, lookup):
+        repository = FileSearchIndexRepository(str(tmp_path), merge_factor=3, small_segment_docs=10)
+        index = builder.build_index([], tokenizer)
+        repository.save_user_index("u1", index)
+        for post in POSTS:
+            builder.add_posts(index, [post], tokenizer)
+            repository.save_user_index("u1", index)
+        repository.wait_for_merges()
+
+        assert len(list(tmp_path.glob("*/*.seg"))) < len(POSTS)
+        loaded = _reopen(tmp_path)
+        for query in ["python", '"web development"', "author:lovelace"]:
+            assert lookup.lookup(query, loaded) == lookup.lookup(query, index)
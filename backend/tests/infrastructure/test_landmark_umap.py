@@ -0,0 +1,57 @@
+import numpy as np
+
+from infrastructure.landmark_umap import LandmarkUMAP
+
+
+class FakeUMAP:
+    """Projects onto the first two axes, recording the rows it is fitted on and transforms."""
+    n_components = 2
+
+    def __init__(self):
+        self.fitted = None
+        self.transformed = []
+
+    def fit_transform(self, X, y=None):
+        self.fitted = X
+        return X[:, :2]
+
+    def transform(self, X):
+        self.transformed.append(len(X))
+        return X[:, :2]
+
+
+class TestLandmarkUMAP:
+    def test_fit_runs_on_the_landmarks_and_places_the_rest_in_chunks(self):
+        X = np.random.default_rng(0).standard_normal((25, 4)).astype(np.float32)
+        model = FakeUMAP()
+        landmark_umap = LandmarkUMAP(model, n_landmarks=10, chunk_size=4)
+
+        coords = landmark_umap.fit_transform(X)
+
+        assert len(model.fitted) == 10
+        assert model.transformed == [4, 4, 4, 3]
+        assert np.allclose(coords, X[:, :2])
+        assert landmark_umap.embedding_ is coords
+        assert len(set(landmark_umap.landmarks_)) == 10
+
+    def test_small_inputs_are_all_landmarks(self):
+        X = np.arange(12.0).reshape(6, 2)
+        model = FakeUMAP()
+
+        LandmarkUMAP(model, n_landmarks=10).fit(X)
+
+        assert len(model.fitted) == 6
+        assert model.transformed == []
+
+    def test_landmarks_are_reproducible(self):
+        X = np.random.default_rng(0).standard_normal((50, 3))
+
+        first = LandmarkUMAP(FakeUMAP(), n_landmarks=5).fit(X).landmarks_
+        second = LandmarkUMAP(FakeUMAP(), n_landmarks=5).fit(X).landmarks_
+
+        assert (first == second).all()
+
+    def test_transform_covers_new_points(self):
+        landmark_umap = LandmarkUMAP(FakeUMAP(), n_landmarks=5, chunk_size=2).fit(np.ones((8, 3)))
+
+        assert landmark_umap.transform(np.zeros((3, 3))).shape == (3, 2)
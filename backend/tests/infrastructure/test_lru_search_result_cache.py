@@ -0,0 +1,61 @@
+from domain.entities.search import SearchResponse, SearchResult
+from infrastructure.lru_search_result_cache import LRUSearchResultCache
+
+
+def _response(post_id: str, snippet: str = "") -> SearchResponse:
+    return SearchResponse(results=[SearchResult(post_id, 1.0, snippet)], total=1)
+
+
+class TestLRUSearchResultCache:
+    def test_hit_and_miss_counters(self):
+        cache = LRUSearchResultCache()
+        response = _response("1")
+
+        assert cache.get("u1", 1, "python") is None
+        cache.put("u1", 1, "python", response)
+
+        assert cache.get("u1", 1, "python") is response
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.bytes > 0
+
+    def test_new_generation_invalidates_user_entries(self):
+        cache = LRUSearchResultCache()
+        cache.put("u1", 1, "python", _response("1"))
+        cache.put("u2", 1, "python", _response("2"))
+
+        cache.put("u1", 2, "rust", _response("3"))
+
+        assert cache.get("u1", 1, "python") is None
+        assert cache.get("u2", 1, "python") is not None
+        assert cache.stats().entries == 2
+
+    def test_stale_generation_is_not_stored(self):
+        cache = LRUSearchResultCache()
+        cache.put("u1", 2, "python", _response("1"))
+        cache.put("u1", 1, "python", _response("2"))
+
+        assert cache.get("u1", 1, "python") is None
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        cache = LRUSearchResultCache(max_entries=2)
+        cache.put("u1", 1, "a", _response("1"))
+        cache.put("u1", 1, "b", _response("2"))
+        cache.get("u1", 1, "a")
+        cache.put("u1", 1, "c", _response("3"))
+
+        assert cache.get("u1", 1, "b") is None
+        assert cache.get("u1", 1, "a") is not None
+        assert cache.get("u1", 1, "c") is not None
+
+    def test_byte_budget(self):
+        small = _response("1", "x")
+        cache = LRUSearchResultCache(max_bytes=2000)
+        cache.put("u1", 1, "big", _response("1", "x" * 5000))
+        cache.put("u1", 1, "a", small)
+        cache.put("u1", 1, "b", _response("2", "y" * 900))
+        cache.put("u1", 1, "c", _response("3", "z" * 900))
+
+        assert cache.get("u1", 1, "big") is None
+        assert cache.stats().bytes <= 2000
+        assert cache.get("u1", 1, "c") is not None
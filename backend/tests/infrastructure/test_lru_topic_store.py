@@ -0,0 +1,65 @@
+import os
+
+from domain.entities.post import KeywordRelevance
+from domain.entities.topic import Topic, UserTopics
+from infrastructure.lru_topic_store import LRUTopicStore
+
+
+def _topics(generation: int) -> UserTopics:
+    return UserTopics(
+        generation=generation,
+        topics={
+            0: Topic(
+                id=0,
+                keywords=[KeywordRelevance(keyword="python", score=0.5)],
+                post_ids=["p1", "p2"],
+                representative_post_ids=["p2"],
+            )
+        },
+    )
+
+
+class TestLRUTopicStore:
+    def test_topics_are_kept_per_user_and_generation(self):
+        store = LRUTopicStore()
+        store.put("u1", _topics(1))
+
+        assert store.get("u1", 1) == _topics(1)
+        assert store.get("u1", 2) is None
+        assert store.get("u2", 1) is None
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        store = LRUTopicStore(max_entries=2)
+        store.put("u1", _topics(1))
+        store.put("u2", _topics(1))
+        store.get("u1", 1)
+
+        store.put("u3", _topics(1))
+
+        assert store.get("u1", 1) is not None
+        assert store.get("u2", 1) is None
+
+    def test_topics_on_disk_outlive_eviction_and_restarts(self, tmp_path):
+        store = LRUTopicStore(max_entries=1, root=str(tmp_path))
+        store.put("u1", _topics(1))
+        store.put("u2", _topics(1))
+
+        assert store.get("u1", 1) == _topics(1)
+        assert LRUTopicStore(root=str(tmp_path)).get("u2", 1) == _topics(1)
+
+    def test_old_generations_are_pruned_from_disk(self, tmp_path):
+        store = LRUTopicStore(root=str(tmp_path), generations_per_user=2)
+        for generation in (1, 2, 3):
+            store.put("u1", _topics(generation))
+
+        [user_dir] = os.listdir(tmp_path)
+        assert sorted(os.listdir(tmp_path / user_dir)) == ["2.json", "3.json"]
+        assert LRUTopicStore(root=str(tmp_path)).get("u1", 1) is None
+
+    def test_unreadable_file_is_a_miss(self, tmp_path):
+        store = LRUTopicStore(root=str(tmp_path))
+        store.put("u1", _topics(1))
+        [user_dir] = os.listdir(tmp_path)
+        (tmp_path / user_dir / "1.json").write_text("{not json")
+
+        assert LRUTopicStore(root=str(tmp_path)).get("u1", 1) is None
@@ -0,0 +1,116 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from application.services.embedding_cache import cached_embeddings, content_key, stored_embeddings
+from infrastructure.mmap_embedding_store import KEYS, MmapEmbeddingStore
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(10, 8)).astype(np.float32)
+
+
+class TestMmapEmbeddingStore:
+    def test_vectors_survive_restart(self, tmp_path, vectors):
+        store = MmapEmbeddingStore(str(tmp_path), initial_capacity=4)
+        store.put([f"k{i}" for i in range(6)], vectors[:6])
+        store.put([f"k{i}" for i in range(4, 10)], vectors[4:])
+
+        reopened = MmapEmbeddingStore(str(tmp_path))
+
+        assert reopened.size() == 10
+        found = reopened.get(["k9", "missing", "k0"])
+        np.testing.assert_array_equal(found[0], vectors[9])
+        assert found[1] is None
+        np.testing.assert_array_equal(found[2], vectors[0])
+
+    def test_float16_rows_are_read_back_as_float32(self, tmp_path, vectors):
+        store = MmapEmbeddingStore(str(tmp_path), dtype="float16")
+        store.put(["a"], vectors[:1])
+
+        [vector] = MmapEmbeddingStore(str(tmp_path)).get(["a"])
+
+        assert vector.dtype == np.float32
+        np.testing.assert_allclose(vector, vectors[0], rtol=1e-3, atol=1e-3)
+
+    def test_existing_keys_keep_their_vector(self, tmp_path, vectors):
+        store = MmapEmbeddingStore(str(tmp_path))
+        store.put(["a"], vectors[:1])
+        store.put(["a"], vectors[1:2])
+
+        np.testing.assert_array_equal(store.get(["a"])[0], vectors[0])
+        assert store.size() == 1
+
+    def test_dimension_is_fixed_by_the_first_write(self, tmp_path, vectors):
+        store = MmapEmbeddingStore(str(tmp_path))
+        store.put(["a"], vectors[:1])
+
+        with pytest.raises(ValueError):
+            store.put(["b"], np.zeros((1, 4), dtype=np.float32))
+
+    def test_partial_key_write_is_dropped(self, tmp_path, vectors):
+        MmapEmbeddingStore(str(tmp_path)).put(["a", "b"], vectors[:2])
+        with open(tmp_path / KEYS, "a") as f:
+            f.write("c-cut-sh")
+
+        store = MmapEmbeddingStore(str(tmp_path))
+        store.put(["d"], vectors[3:4])
+
+        assert MmapEmbeddingStore(str(tmp_path)).get(["a", "c-cut-sh", "d"])[1] is None
+        np.testing.assert_array_equal(MmapEmbeddingStore(str(tmp_path)).get(["d"])[0], vectors[3])
+
+    def test_stores_sharing_a_directory_see_each_others_rows(self, tmp_path, vectors):
+        first = MmapEmbeddingStore(str(tmp_path), initial_capacity=2)
+        second = MmapEmbeddingStore(str(tmp_path), initial_capacity=2)
+        first.put(["a", "b"], vectors[:2])
+        second.put(["b", "c", "d"], vectors[2:5])
+        first.put(["e"], vectors[5:6])
+
+        found = second.get(["a", "b", "e"])
+
+        np.testing.assert_array_equal(found[0], vectors[0])
+        np.testing.assert_array_equal(found[1], vectors[1])
+        np.testing.assert_array_equal(found[2], vectors[5])
+        assert first.get(["c"])[0] is not None
+        assert MmapEmbeddingStore(str(tmp_path)).size() == 5
+
+    def test_unpickled_store_reopens_the_directory(self, tmp_path, vectors):
+        store = MmapEmbeddingStore(str(tmp_path), dtype="float16")
+        store.put(["a"], vectors[:1])
+
+        copy = pickle.loads(pickle.dumps(store))
+
+        assert copy.dtype == "float16"
+        np.testing.assert_allclose(copy.get(["a"])[0], vectors[0], rtol=1e-3, atol=1e-3)
+
+
+class TestCachedEmbeddings:
+    def test_only_unseen_texts_are_encoded(self, tmp_path):
+        encoded = []
+
+        def encode(texts):
+            encoded.append(list(texts))
+            return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+        store = MmapEmbeddingStore(str(tmp_path))
+        first = cached_embeddings(["ab", "abc", "ab"], "model", encode, store)
+        second = cached_embeddings(["abc", "abcd"], "model", encode, store)
+        other_model = cached_embeddings(["abc"], "other", encode, store)
+
+        assert encoded == [["ab", "abc"], ["abcd"], ["abc"]]
+        np.testing.assert_array_equal(first[:, 0], [2, 3, 2])
+        np.testing.assert_array_equal(second[:, 0], [3, 4])
+        assert other_model.shape == (1, 2)
+        assert content_key("model", "abc") != content_key("other", "abc")
+
+    def test_stored_embeddings_are_looked_up_without_encoding(self, tmp_path):
+        store = MmapEmbeddingStore(str(tmp_path))
+        assert stored_embeddings(["ab"], "model", store)[0] == []
+        cached_embeddings(["abc"], "model", lambda texts: np.array([[len(t), 1.0] for t in texts]), store)
+
+        found, vectors = stored_embeddings(["ab", "abc"], "model", store)
+
+        assert found == [1]
+        np.testing.assert_array_equal(vectors, [[3.0, 1.0]])
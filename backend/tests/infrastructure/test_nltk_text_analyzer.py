@@ -0,0 +1,101 @@
+import pickle
+
+import nltk.corpus
+import pytest
+
+from infrastructure.nltk_text_analyzer import NltkTextAnalyzer
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+class FakeStopwords:
+    lists = {"english": ["the", "and", "of", "is"], "spanish": ["el", "la", "de", "y", "es"]}
+
+    def __init__(self):
+        self.reads = 0
+
+    def fileids(self):
+        return list(self.lists)
+
+    def words(self, language):
+        self.reads += 1
+        if language not in self.lists:
+            raise OSError(language)
+        return self.lists[language]
+
+
+@pytest.fixture
+def stopwords(monkeypatch):
+    stopwords = FakeStopwords()
+    monkeypatch.setattr(nltk.corpus, "stopwords", stopwords)
+    return stopwords
+
+
+class TestNltkTextAnalyzer:
+    def test_tokens_keep_accented_words_and_skip_urls(self):
+        text = "Café naïve CAFÉ, see https://example.com/a?b=1 and www.example.org 2024 x_y"
+
+        analyzed = NltkTextAnalyzer().analyze(text)
+
+        assert analyzed.tokens == ("café", "naïve", "café", "see", "and", "2024")
+        assert [text[offset:offset + len(token)].lower() for token, offset in zip(analyzed.tokens, analyzed.offsets)] \
+            == list(analyzed.tokens)
+
+    def test_decomposed_accents_are_normalized(self):
+        assert NltkTextAnalyzer().analyze("cafe\u0301").tokens == ("caf\u00e9",)
+
+    def test_stopwords_of_every_language_are_dropped_by_default(self, stopwords):
+        analyzer = NltkTextAnalyzer()
+
+        assert analyzer.content_tokens("The graph of la red") == ("graph", "red")
+
+    def test_stopword_sets_are_built_once(self, stopwords):
+        analyzer = NltkTextAnalyzer()
+        for text in ("the graph", "el grafo", "and again"):
+            analyzer.content_tokens(text)
+
+        assert stopwords.reads == 2
+
+    def test_detected_language_picks_the_stopwords(self, stopwords):
+        analyzer = NltkTextAnalyzer(detect_language=True)
+
+        assert analyzer.language("El modelo de la red es bueno") == "spanish"
+        assert analyzer.language("graph networks") is None
+        # "the" is kept: only Spanish stopwords apply to a Spanish post
+        assert analyzer.content_tokens("El modelo de la red es the best") == ("modelo", "red", "the", "best")
+
+    def test_unknown_language_is_reported(self, stopwords):
+        with pytest.raises(ValueError):
+            NltkTextAnalyzer(languages=("klingon",)).content_tokens("qapla")
+
+    def test_results_are_cached_per_text(self):
+        analyzer = NltkTextAnalyzer(cache_size=2)
+        first = analyzer.analyze("graph neural networks")
+
+        assert analyzer.analyze("graph neural networks") is first
+        analyzer.analyze("b")
+        analyzer.analyze("c")
+        assert analyzer.analyze("graph neural networks") is not first
+
+    def test_pickling_keeps_only_the_settings(self, stopwords):
+        analyzer = NltkTextAnalyzer(languages=("english",), detect_language=True)
+        analyzer.content_tokens("the graph")
+
+        copy = pickle.loads(pickle.dumps(analyzer))
+
+        assert copy.languages == ("english",) and copy.detect_language
+        assert len(copy._cache) == 0
+
+    def test_tokenizer_shares_the_analyzer(self):
+        analyzer = NltkTextAnalyzer()
+        tokenizer = SimpleTokenizer(analyzer=analyzer)
+
+        assert tokenizer.tokenize_with_spans("Über GraphQL") == [("über", 0, 4), ("graphql", 5, 12)]
+        assert "Über GraphQL" in analyzer._cache
+
+    def test_last_word_is_normalized_like_tokens(self):
+        analyzer = NltkTextAnalyzer()
+
+        assert analyzer.last_word("graph Ne") == "ne"
+        assert analyzer.last_word("un café ") == "café"
+        assert analyzer.last_word("p") == "p"
+        assert analyzer.last_word("graph (") == ""
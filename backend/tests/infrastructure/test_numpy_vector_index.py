@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from infrastructure.numpy_vector_index import NumpyVectorIndex
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(500, 32)).astype(np.float32)
+
+
+def exact_top_k(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k])
+
+
+class TestNumpyVectorIndex:
+    def test_search_matches_exhaustive_ranking(self, vectors):
+        index = NumpyVectorIndex()
+        index.add("u1", [str(i) for i in range(len(vectors))], vectors)
+
+        query = vectors[7] + 0.5 * vectors[11]
+        results = index.search("u1", query, top_k=5)
+
+        assert [post_id for post_id, _ in results] == [str(i) for i in exact_top_k(vectors, query, 5)]
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_users_are_isolated(self, vectors):
+        index = NumpyVectorIndex()
+        index.add("u1", ["a"], vectors[:1])
+        index.add("u2", ["b"], vectors[1:2])
+
+        assert [post_id for post_id, _ in index.search("u1", vectors[1], top_k=5)] == ["a"]
+        assert index.search("u3", vectors[1], top_k=5) == []
+
+    def test_sync_drops_stale_and_reports_missing(self, vectors):
+        index = NumpyVectorIndex()
+        index.add("u1", ["a", "b", "c"], vectors[:3])
+
+        missing = index.sync("u1", ["a", "c", "d"])
+
+        assert missing == ["d"]
+        assert index.size("u1") == 2
+        assert {post_id for post_id, _ in index.search("u1", vectors[1], top_k=10)} == {"a", "c"}
+
+    def test_remove_drops_the_given_posts(self, vectors):
+        index = NumpyVectorIndex()
+        index.add("u1", ["a", "b", "c"], vectors[:3])
+
+        index.remove("u1", ["b", "unknown"])
+        index.remove("u2", ["a"])
+
+        assert index.size("u1") == 2
+        assert {post_id for post_id, _ in index.search("u1", vectors[1], top_k=None)} == {"a", "c"}
+
+    def test_add_replaces_existing_vector(self, vectors):
+        index = NumpyVectorIndex()
+        index.add("u1", ["a", "b"], vectors[:2])
+        index.add("u1", ["a"], vectors[2:3])
+
+        assert index.size("u1") == 2
+        assert index.search("u1", vectors[2], top_k=1)[0][0] == "a"
+
+    def test_ivf_keeps_recall_high(self, vectors):
+        rng = np.random.default_rng(1)
+        # Clustered data, as sentence embeddings of related posts are
+        centers = rng.normal(size=(20, 32))
+        data = (centers[rng.integers(0, 20, 4000)] + 0.3 * rng.normal(size=(4000, 32))).astype(np.float32)
+        index = NumpyVectorIndex(ivf_min_size=1000, nprobe=8)
+        index.add("u1", [str(i) for i in range(len(data))], data)
+
+        hits = 0
+        for query in data[:20]:
+            expected = {str(i) for i in exact_top_k(data, query, 10)}
+            hits += len(expected & {post_id for post_id, _ in index.search("u1", query, top_k=10)})
+
+        assert hits / 200 >= 0.9
+
+    def test_search_without_top_k_scores_every_vector_past_ivf(self, vectors):
+        index = NumpyVectorIndex(ivf_min_size=100, nprobe=1)
+        index.add("u1", [str(i) for i in range(len(vectors))], vectors)
+
+        results = index.search("u1", vectors[3], top_k=None)
+
+        assert len(results) == len(vectors)
+        assert [post_id for post_id, _ in results[:5]] == [str(i) for i in exact_top_k(vectors, vectors[3], 5)]
@@ -0,0 +1,20 @@
+from array import array
+
+import pytest
+
+from infrastructure.postings import intersect, union, difference
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        ([1, 3, 5, 7], [3, 4, 5, 6]),
+        ([2], list(range(0, 1000, 2))),  # skewed sizes take the galloping path
+        ([], [1, 2, 3]),
+    ],
+)
+def test_set_operations_match_python_sets(a, b):
+    x, y = array("I", a), array("I", b)
+    assert list(intersect(x, y)) == sorted(set(a) & set(b))
+    assert list(union(x, y)) == sorted(set(a) | set(b))
+    assert list(difference(x, y)) == sorted(set(a) - set(b))
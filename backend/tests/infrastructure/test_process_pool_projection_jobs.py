@@ -0,0 +1,200 @@
+import os
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from application.interfaces.fitted_topics import FittedTopics
+from application.interfaces.vector_index import VectorIndex
+from domain.entities.post import KeywordRelevance, Post, PostProjection
+from domain.entities.topic import Topic
+from infrastructure.lru_topic_store import LRUTopicStore
+from infrastructure.numpy_vector_index import NumpyVectorIndex
+from infrastructure.process_pool_projection_jobs import ProcessPoolProjectionJobs
+
+
+@dataclass
+class FakeProjector:
+    """Places posts by length, counting calls and naming its process in the keywords."""
+    delay: float = 0.0
+    calls: int = 0
+
+    def project(self, posts):
+        self.calls += 1
+        time.sleep(self.delay)
+        if any(post.text == "boom" for post in posts):
+            raise RuntimeError("projection failed")
+        return [
+            PostProjection(
+                post_id=post.id,
+                x=float(len(post.text)),
+                y=float(self.calls),
+                keywords=[KeywordRelevance(keyword=str(os.getpid()), score=1.0)],
+            )
+            for post in posts
+        ]
+
+
+class FakeTopicsProjector(FakeProjector, FittedTopics):
+    """Puts every projected post in one topic."""
+    posts = []
+
+    def project(self, posts):
+        self.posts = posts
+        return super().project(posts)
+
+    def fitted_topics(self, user_id):
+        post_ids = [post.id for post in self.posts]
+        return {0: Topic(id=0, keywords=[], post_ids=post_ids, representative_post_ids=post_ids[:1])}
+
+
+@dataclass
+class FakeEmbeddingProjector(FakeProjector):
+    """Embeds each post as its text length, like a projector sharing its embeddings with semantic search."""
+    vector_index: Optional[VectorIndex] = None
+
+    def project(self, posts):
+        vectors = np.array([[len(post.text), 1.0] for post in posts])
+        self.vector_index.add(posts[0].userId, [post.id for post in posts], vectors)
+        return super().project(posts)
+
+
+def make_post(post_id, text="hello", user_id="u1"):
+    return Post(
+        author="a",
+        profileUrl="",
+        authorImage="",
+        authorHeadline="",
+        timestamp="",
+        text=text,
+        postUrl="",
+        meta={},
+        postImage="",
+        userId=user_id,
+        id=post_id,
+    )
+
+
+def wait_for(jobs, user_id, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.status(user_id, job_id)
+        if job.status in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+@pytest.fixture
+def jobs():
+    jobs = ProcessPoolProjectionJobs(projector_factory=partial(FakeProjector, delay=0.2), max_workers=2)
+    yield jobs
+    jobs.shutdown()
+
+
+class TestProcessPoolProjectionJobs:
+    def test_job_result_is_computed_in_a_worker(self, jobs):
+        job = jobs.submit("u1", 1, [make_post("p1", "abc")])
+
+        assert job.status in ("pending", "running")
+        assert wait_for(jobs, "u1", job.id).status == "done"
+        [projection] = jobs.result("u1", job.id)
+        assert projection.post_id == "p1"
+        assert projection.x == 3.0
+        assert projection.keywords[0].keyword != str(os.getpid())
+
+    def test_same_generation_joins_the_running_job(self, jobs):
+        first = jobs.submit("u1", 1, [make_post("p1")])
+        second = jobs.submit("u1", 1, [make_post("p1")])
+        newer = jobs.submit("u1", 2, [make_post("p1"), make_post("p2")])
+
+        assert second.id == first.id
+        assert newer.id != first.id
+
+    def test_users_keep_their_worker_state(self, jobs):
+        for generation in (1, 2, 3):
+            job = jobs.submit("u1", generation, [make_post("p1")])
+            wait_for(jobs, "u1", job.id)
+
+        # The third projection ran on the projector that made the first two
+        assert jobs.result("u1", job.id)[0].y == 3.0
+
+    def test_jobs_are_private_to_their_user(self, jobs):
+        job = jobs.submit("u1", 1, [make_post("p1")])
+        wait_for(jobs, "u1", job.id)
+
+        assert jobs.status("u2", job.id) is None
+        assert jobs.result("u2", job.id) is None
+        assert jobs.status("u1", "unknown") is None
+
+    def test_wait_returns_once_the_job_finishes_or_times_out(self, jobs):
+        job = jobs.submit("u1", 1, [make_post("p1")])
+
+        assert jobs.wait("u1", job.id, timeout=0.01).status in ("pending", "running")
+        assert jobs.wait("u1", job.id, timeout=60).status == "done"
+        assert jobs.wait("u2", job.id, timeout=0.01) is None
+
+    def test_failed_job_is_retried_on_resubmit(self, jobs):
+        job = jobs.submit("u1", 1, [make_post("p1", "boom")])
+
+        failed = wait_for(jobs, "u1", job.id)
+
+        assert failed.status == "failed"
+        assert "projection failed" in failed.error
+        assert jobs.result("u1", job.id) is None
+        assert jobs.submit("u1", 1, [make_post("p1", "boom")]).id != job.id
+
+    def test_old_finished_jobs_are_forgotten(self):
+        jobs = ProcessPoolProjectionJobs(projector_factory=FakeProjector, max_workers=1, max_finished_jobs=1)
+        try:
+            first = jobs.submit("u1", 1, [make_post("p1")])
+            wait_for(jobs, "u1", first.id)
+            second = jobs.submit("u1", 2, [make_post("p1")])
+            wait_for(jobs, "u1", second.id)
+            jobs.submit("u1", 3, [make_post("p1")])
+
+            assert jobs.status("u1", first.id) is None
+            assert jobs.status("u1", second.id).status == "done"
+        finally:
+            jobs.shutdown()
+
+    def test_warm_up_starts_every_worker(self, jobs):
+        assert jobs.model_state() == "cold"
+
+        jobs.warm_up()
+
+        assert jobs.model_state() == "ready"
+        assert all(pool is not None for pool in jobs._pools)
+
+    def test_topics_of_finished_jobs_are_stored(self):
+        topic_store = LRUTopicStore()
+        jobs = ProcessPoolProjectionJobs(projector_factory=FakeTopicsProjector, max_workers=1, topic_store=topic_store)
+        try:
+            job = jobs.submit("u1", 3, [make_post("p1"), make_post("p2")])
+            jobs.wait("u1", job.id, timeout=60)
+            failed = jobs.submit("u1", 4, [make_post("p1", "boom")])
+            jobs.wait("u1", failed.id, timeout=60)
+        finally:
+            jobs.shutdown()
+
+        topics = topic_store.get("u1", 3).topics
+        assert topics[0].post_ids == ["p1", "p2"]
+        assert topics[0].representative_post_ids == ["p1"]
+        assert topic_store.get("u1", 4) is None
+
+    def test_embeddings_of_finished_jobs_reach_the_vector_index(self):
+        vector_index = NumpyVectorIndex()
+        jobs = ProcessPoolProjectionJobs(
+            projector_factory=FakeEmbeddingProjector, max_workers=1, vector_index=vector_index
+        )
+        try:
+            job = jobs.submit("u1", 1, [make_post("p1", "a"), make_post("p2", "abc")])
+            jobs.wait("u1", job.id, timeout=60)
+        finally:
+            jobs.shutdown()
+
+        assert vector_index.size("u1") == 2
+        assert vector_index.search("u1", np.array([1.0, 1.0]), top_k=1)[0][0] == "p1"
@@ -0,0 +1,99 @@
+import pytest
+
+from domain.entities.search import Post
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+@pytest.fixture
+def tokenizer():
+    return SimpleTokenizer()
+
+
+@pytest.fixture
+def builder():
+    return InMemorySearchIndexBuilder()
+
+
+@pytest.fixture
+def lookup(tokenizer):
+    return SimpleSearchIndexLookup(tokenizer=tokenizer)
+
+
+def _ids(lookup, query, index):
+    return {post_id for post_id, _ in lookup.lookup(query, index).matches}
+
+
+class TestInMemorySearchIndexBuilder:
+    def test_add_posts_matches_full_build(self, builder, tokenizer):
+        posts = [
+            Post(id="1", text="Python for data science"),
+            Post(id="2", text="Rust systems programming"),
+            Post(id="3", text="Python web development"),
+        ]
+        incremental = builder.build_index(posts[:1], tokenizer)
+        builder.add_posts(incremental, posts[1:], tokenizer)
+        full = builder.build_index(posts, tokenizer)
+
+        assert incremental.postings == full.postings
+        assert incremental.post_ids == full.post_ids
+        assert incremental.doc_lengths == full.doc_lengths
+        assert incremental.total_length == full.total_length
+
+    def test_removed_posts_are_hidden_before_compaction(self, builder, tokenizer, lookup):
+        index = builder.build_index(
+            [Post(id="1", text="python tips"), Post(id="2", text="python jobs")], tokenizer
+        )
+        builder.remove_posts(index, ["1"])
+
+        assert _ids(lookup, "python", index) == {"2"}
+        assert index.n_docs == 1
+        assert list(index.postings["python"].doc_ids) == [0, 1]  # still physically present
+
+    def test_compact_purges_tombstones(self, builder, tokenizer, lookup):
+        index = builder.build_index(
+            [Post(id="1", text="python tips"), Post(id="2", text="python jobs")], tokenizer
+        )
+        builder.remove_posts(index, ["1"])
+        builder.compact(index)
+
+        assert index.tombstones == set()
+        assert "tips" not in index.postings
+        assert list(index.postings["python"].doc_ids) == [0]
+        assert list(index.postings["python"].term_freqs) == [1]
+        assert index.post_ids == ["2"]
+        assert index.doc_id_by_post == {"2": 0}
+        assert list(index.doc_lengths) == [2]
+        assert _ids(lookup, "python", index) == {"2"}
+
+    def test_readding_a_post_replaces_its_postings(self, builder, tokenizer, lookup):
+        index = builder.build_index([Post(id="1", text="python tips")], tokenizer)
+        builder.add_posts(index, [Post(id="1", text="rust tips")], tokenizer)
+
+        assert _ids(lookup, "python", index) == set()
+        assert _ids(lookup, "rust", index) == {"1"}
+        assert index.total_length == 2
+
+    def test_compact_keeps_postings_sorted(self, builder, tokenizer, lookup):
+        posts = [Post(id=str(i), text=f"shared word{i % 3}") for i in range(10)]
+        index = builder.build_index(posts, tokenizer)
+        builder.remove_posts(index, ["0", "4", "5", "9"])
+        builder.compact(index)
+
+        doc_ids = list(index.postings["shared"].doc_ids)
+        assert doc_ids == sorted(doc_ids) == list(range(6))
+        assert _ids(lookup, "word1", index) == {"1", "7"}
+
+    def test_char_offsets_survive_compaction(self, builder, tokenizer, lookup):
+        index = builder.build_index(
+            [Post(id="1", text="python"), Post(id="2", text="Learn İstanbul PYTHON, then python")],
+            tokenizer,
+        )
+        builder.remove_posts(index, ["1"])
+        builder.compact(index)
+
+        spans = lookup.lookup("python", index).highlights["2"]
+
+        text = "Learn İstanbul PYTHON, then python"
+        assert [text[start:end] for start, end in spans] == ["PYTHON", "python"]
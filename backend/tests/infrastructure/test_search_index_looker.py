@@ -0,0 +1,217 @@
+import random
+from datetime import date
+
+import pytest
+
+from domain.entities.search import Post, PostFilter
+from infrastructure import search_index_looker
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+@pytest.fixture
+def index():
+    posts = [
+        Post(id="1", text="Python tips for data science"),
+        Post(id="2", text="Python, Python and more Python"),
+        Post(id="3", text="Hiring a Java developer"),
+        Post(id="4", text="A very long post about many things that mentions python only once at the end"),
+    ]
+    return InMemorySearchIndexBuilder().build_index(posts, SimpleTokenizer())
+
+
+@pytest.fixture
+def lookup():
+    return SimpleSearchIndexLookup(tokenizer=SimpleTokenizer())
+
+
+class TestSimpleSearchIndexLookup:
+    def test_ranks_by_bm25(self, lookup, index):
+        ranked = lookup.lookup("python", index)
+        assert [post_id for post_id, _ in ranked.matches] == ["2", "1", "4"]
+        assert ranked.total == 3
+
+    def test_scores_are_descending(self, lookup, index):
+        ranked = lookup.lookup("python java", index)
+        scores = [score for _, score in ranked.matches]
+        assert scores == sorted(scores, reverse=True)
+        assert all(score > 0 for score in scores)
+
+    def test_limit_and_offset(self, lookup, index):
+        full = lookup.lookup("python", index).matches
+        page = lookup.lookup("python", index, limit=1, offset=1)
+        assert page.matches == full[1:2]
+        assert page.total == 3
+
+    def test_terms_are_reported_for_snippets(self, lookup, index):
+        assert lookup.lookup("python -java", index).terms == ["python"]
+
+    def test_highlights_come_from_the_postings(self, lookup, index):
+        ranked = lookup.lookup("python more", index, limit=1)
+        assert ranked.highlights == {"2": [(0, 6), (8, 14), (19, 23), (24, 30)]}
+
+    def test_highlights_cover_decomposed_accents(self, lookup):
+        text = "Un cafe\u0301 de\u0301licieux"
+        index = InMemorySearchIndexBuilder().build_index([Post(id="1", text=text)], SimpleTokenizer())
+        ranked = lookup.lookup("délicieux", index)
+        [(start, end)] = ranked.highlights["1"]
+        assert text[start:end] == "de\u0301licieux"
+
+    def test_unknown_token_returns_nothing(self, lookup, index):
+        ranked = lookup.lookup("rust", index)
+        assert ranked.matches == []
+        assert ranked.total == 0
+
+
+@pytest.fixture
+def boolean_index():
+    posts = [
+        Post(id="1", text="Machine learning in production", author="Jane Doe"),
+        Post(id="2", text="Learning to use a sewing machine", author="John Smith"),
+        Post(id="3", text="Deep learning and machine learning papers", author="Jane Roe"),
+        Post(id="4", text="Java streams explained", author="Jane Doe"),
+    ]
+    return InMemorySearchIndexBuilder().build_index(posts, SimpleTokenizer())
+
+
+def _ids(lookup, query, index):
+    return {post_id for post_id, _ in lookup.lookup(query, index).matches}
+
+
+class TestQueryLanguage:
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("machine learning", {"1", "2", "3"}),
+            ("machine AND learning", {"1", "2", "3"}),
+            ('"machine learning"', {"1", "3"}),
+            ('"learning machine"', set()),
+            ("learning NOT sewing", {"1", "3"}),
+            ("learning -deep -sewing", {"1"}),
+            ("NOT learning", {"4"}),
+            ("author:jane", {"1", "3", "4"}),
+            ('author:"jane doe" learning', {"1"}),
+            ("(java OR deep) AND author:doe", {"4"}),
+            ('"machine learning" OR java', {"1", "3", "4"}),
+        ],
+    )
+    def test_boolean_queries(self, lookup, boolean_index, query, expected):
+        assert _ids(lookup, query, boolean_index) == expected
+
+    def test_filter_only_query_counts_matches(self, lookup, boolean_index):
+        ranked = lookup.lookup("author:smith", boolean_index)
+        assert ranked.matches == [("2", 0.0)]
+        assert ranked.total == 1
+
+    def test_phrase_survives_compaction(self, lookup, boolean_index):
+        builder = InMemorySearchIndexBuilder()
+        builder.remove_posts(boolean_index, ["1", "2"])
+        builder.compact(boolean_index)
+        assert _ids(lookup, '"machine learning"', boolean_index) == {"3"}
+        assert _ids(lookup, "author:jane", boolean_index) == {"3", "4"}
+
+
+@pytest.fixture
+def dated_index():
+    posts = [
+        Post(id="1", text="python tips", author="Ada", timestamp="2024-01-05"),
+        Post(id="2", text="python news", author="Grace", timestamp="2024-01-20"),
+        Post(id="3", text="python jobs", author="Ada", timestamp="2024-03-02"),
+        Post(id="4", text="rust jobs", author="Ada", timestamp="Edited"),
+    ]
+    return InMemorySearchIndexBuilder().build_index(posts, SimpleTokenizer())
+
+
+class TestFilters:
+    def test_facets_count_every_match(self, lookup, dated_index):
+        ranked = lookup.lookup("python", dated_index, limit=1)
+        assert ranked.facets.authors == {"Ada": 2, "Grace": 1}
+        assert ranked.facets.months == {"2024-01": 2, "2024-03": 1}
+
+    def test_author_filter(self, lookup, dated_index):
+        ranked = lookup.lookup("python", dated_index, filters=PostFilter(authors=("Grace",)))
+        assert [post_id for post_id, _ in ranked.matches] == ["2"]
+        assert ranked.facets.authors == {"Grace": 1}
+
+    def test_date_range_filter(self, lookup, dated_index):
+        filters = PostFilter(since=date(2024, 1, 10), until=date(2024, 3, 2))
+        assert _ids(lookup, "python", dated_index) >= {"2", "3"}
+        ranked = lookup.lookup("python", dated_index, filters=filters)
+        assert {post_id for post_id, _ in ranked.matches} == {"2", "3"}
+
+    def test_undated_posts_are_excluded_by_date_filters(self, lookup, dated_index):
+        assert lookup.filter_posts(PostFilter(since=date(2000, 1, 1)), dated_index) == ["1", "2", "3"]
+        assert lookup.filter_posts(PostFilter(authors=("Ada",)), dated_index) == ["1", "3", "4"]
+
+    def test_facets_of_listed_posts(self, lookup, dated_index):
+        facets = lookup.facets(["1", "4", "unknown"], dated_index)
+        assert facets.authors == {"Ada": 2}
+        assert facets.months == {"2024-01": 1}
+
+    def test_filters_survive_compaction(self, lookup, dated_index):
+        builder = InMemorySearchIndexBuilder()
+        builder.remove_posts(dated_index, ["1"])
+        builder.compact(dated_index)
+        filters = PostFilter(authors=("Ada",), until=date(2024, 12, 31))
+        assert lookup.filter_posts(filters, dated_index) == ["3"]
+        assert lookup.lookup("python", dated_index).facets.months == {"2024-01": 1, "2024-03": 1}
+
+
+@pytest.fixture
+def large_index():
+    rng = random.Random(3)
+    vocabulary = [f"w{i}" for i in range(200)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    posts = [
+        Post(id=str(i), text=" ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(5, 40))))
+        for i in range(2000)
+    ]
+    index = InMemorySearchIndexBuilder().build_index(posts, SimpleTokenizer())
+    InMemorySearchIndexBuilder().remove_posts(index, [str(i) for i in range(0, 2000, 7)])
+    return index
+
+
+class TestTopKPruning:
+    @pytest.fixture(autouse=True)
+    def always_prune(self, monkeypatch):
+        monkeypatch.setattr(search_index_looker, "PRUNING_MIN_POSTINGS", 0)
+
+    @pytest.mark.parametrize(
+        "query", ["w0 w150", "w1 w2 w3 w199", "w0 OR w1", "w5 w90 -w0", "w0 w1 w2 w3 w4 w5 w6"]
+    )
+    @pytest.mark.parametrize("limit,offset", [(1, 0), (10, 0), (10, 30), (500, 0)])
+    def test_matches_exhaustive_ranking(self, large_index, query, limit, offset):
+        tokenizer = SimpleTokenizer()
+        pruned = SimpleSearchIndexLookup(tokenizer=tokenizer)
+        exhaustive = SimpleSearchIndexLookup(tokenizer=tokenizer, top_k_pruning=False)
+        expected = exhaustive.lookup(query, large_index, limit=limit, offset=offset)
+        assert pruned.lookup(query, large_index, limit=limit, offset=offset) == expected
+        full = exhaustive.lookup(query, large_index).matches
+        assert expected.matches == full[offset:offset + limit]
+
+    def test_ranking_after_tombstones_matches_the_compacted_index(self):
+        builder, tokenizer = InMemorySearchIndexBuilder(), SimpleTokenizer()
+        posts = [Post(id=str(i), text="w1 " * (i % 3 + 1) + ("w2" if i % 5 else "w3")) for i in range(200)]
+        index = builder.build_index(posts, tokenizer)
+        # Re-ingesting every post leaves a tombstone behind for each
+        builder.remove_posts(index, [post.id for post in posts])
+        builder.add_posts(index, posts[:60], tokenizer)
+        compacted = builder.build_index(posts[:60], tokenizer)
+
+        for lookup in (
+            SimpleSearchIndexLookup(tokenizer=tokenizer),
+            SimpleSearchIndexLookup(tokenizer=tokenizer, top_k_pruning=False),
+        ):
+            ranked = lookup.lookup("w1 w3", index, limit=10)
+            assert ranked == lookup.lookup("w1 w3", compacted, limit=10)
+            assert all(score > 0 for _, score in ranked.matches)
+
+    def test_bounds_are_dropped_when_the_index_changes(self, large_index):
+        lookup = SimpleSearchIndexLookup(tokenizer=SimpleTokenizer())
+        lookup.lookup("w0 w150", large_index, limit=5)
+        InMemorySearchIndexBuilder().add_posts(
+            large_index, [Post(id="new", text="w150 " * 30)], SimpleTokenizer()
+        )
+        ranked = lookup.lookup("w0 w150", large_index, limit=1)
+        assert ranked.matches[0][0] == "new"
@@ -0,0 +1,33 @@
+import pytest
+
+from infrastructure.search_query import (
+    Term, Phrase, Author, Not, And, Or, parse_query, scoring_terms
+)
+from infrastructure.simple_tokenizer import SimpleTokenizer
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("machine learning", Or((Term("machine"), Term("learning")))),
+        ("machine AND learning", And((Term("machine"), Term("learning")))),
+        ('"Machine Learning"', Phrase(("machine", "learning"))),
+        ("node.js", Phrase(("node", "js"))),
+        ("python NOT java", And((Term("python"), Not(Term("java"))))),
+        ("python -java", And((Term("python"), Not(Term("java"))))),
+        ("python author:jane", And((Term("python"), Author(("jane",))))),
+        ('author:"Jane Doe"', And((Author(("jane", "doe")),))),
+        ("aa bb AND cc", Or((Term("aa"), And((Term("bb"), Term("cc")))))),
+        ("(rust OR go) AND wasm", And((Or((Term("rust"), Term("go"))), Term("wasm")))),
+        ('(rust OR "web assembly', Or((Term("rust"), Phrase(("web", "assembly"))))),
+        ("", None),
+        ("AND OR )", Term("and")),  # leading operator is a plain word
+    ],
+)
+def test_parse_query(query, expected):
+    assert parse_query(query, SimpleTokenizer()) == expected
+
+
+def test_scoring_terms_skip_negations_and_filters():
+    node = parse_query('"deep learning" python -java author:jane', SimpleTokenizer())
+    assert scoring_terms(node) == ["deep", "learning", "python"]
@@ -0,0 +1,38 @@
+import pickle
+from unittest.mock import MagicMock
+
+import numpy as np
+import sentence_transformers
+
+from infrastructure.sentence_transformer_embedder import SentenceTransformerEmbedder
+
+
+class TestSentenceTransformerEmbedder:
+    def test_model_is_loaded_once_with_the_configured_backend(self, monkeypatch):
+        sentence_transformer = MagicMock()
+        sentence_transformer.return_value.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 3))
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", sentence_transformer)
+        embedder = SentenceTransformerEmbedder(backend="onnx", onnx_file="onnx/model.onnx", batch_size=8)
+
+        embedder.encode(["a", "b"])
+        embeddings = embedder.encode(["c"])
+
+        sentence_transformer.assert_called_once_with(
+            "all-MiniLM-L6-v2", backend="onnx", model_kwargs={"file_name": "onnx/model.onnx"}
+        )
+        assert sentence_transformer.return_value.encode.call_args.kwargs["batch_size"] == 8
+        assert embeddings.dtype == np.float32
+
+    def test_quantized_vectors_get_their_own_name(self):
+        assert SentenceTransformerEmbedder().name == "all-MiniLM-L6-v2"
+        assert SentenceTransformerEmbedder(backend="onnx").name == "all-MiniLM-L6-v2@onnx/model_quint8_avx2.onnx"
+
+    def test_pickling_keeps_only_the_settings(self, monkeypatch):
+        monkeypatch.setattr(sentence_transformers, "SentenceTransformer", MagicMock())
+        embedder = SentenceTransformerEmbedder(threads=0, batch_size=4)
+        embedder.load()
+
+        copy = pickle.loads(pickle.dumps(embedder))
+
+        assert copy.batch_size == 4
+        assert copy._model is None
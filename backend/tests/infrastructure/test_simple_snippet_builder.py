@@ -0,0 +1,38 @@
+from domain.entities.search import Post
+from infrastructure.simple_snippet_builder import SimpleSnippetBuilder
+
+
+def _text(n_words: int) -> str:
+    return " ".join(f"w{i:03d}" for i in range(n_words))  # each word spans 5 chars
+
+
+class TestSimpleSnippetBuilder:
+    def test_window_covers_the_densest_run_of_highlights(self):
+        text = _text(40)
+        # A lone hit early on, then three close together near the end
+        spans = [(5, 9), (150, 154), (160, 164), (170, 174)]
+
+        [result] = SimpleSnippetBuilder(width=40).build([("1", 1.0)], {"1": spans}, {"1": Post(id="1", text=text)})
+
+        assert [result.snippet[start:end] for start, end in result.highlights] == ["w030", "w032", "w034"]
+
+    def test_highlights_are_clipped_to_the_snippet(self):
+        text = _text(10)
+
+        [result] = SimpleSnippetBuilder(width=7).build(
+            [("1", 1.0)], {"1": [(0, 4), (5, 9)]}, {"1": Post(id="1", text=text)}
+        )
+
+        assert result.snippet == text[:7]
+        assert result.highlights == [(0, 4), (5, 7)]
+
+    def test_without_highlights_the_snippet_is_the_start_of_the_post(self):
+        text = _text(40)
+
+        [result] = SimpleSnippetBuilder().build([("1", 0.5)], {}, {"1": Post(id="1", text=text)})
+
+        assert result.snippet == text[:80]
+        assert result.highlights == []
+
+    def test_missing_post_has_an_empty_snippet(self):
+        assert SimpleSnippetBuilder().build([("1", 0.5)], {}, {})[0].snippet == ""
@@ -0,0 +1,73 @@
+import pytest
+
+from domain.entities.search import Post, TermSuggestion
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.simple_tokenizer import SimpleTokenizer
+from infrastructure.sorted_term_suggester import SortedTermSuggester
+
+
+@pytest.fixture
+def builder():
+    return InMemorySearchIndexBuilder()
+
+
+@pytest.fixture
+def index(builder):
+    posts = [
+        Post(id="1", text="python pytorch pandas"),
+        Post(id="2", text="python pyspark"),
+        Post(id="3", text="python pytorch"),
+        Post(id="4", text="rust"),
+    ]
+    return builder.build_index(posts, SimpleTokenizer())
+
+
+class TestSortedTermSuggester:
+    def test_suggestions_ranked_by_doc_freq(self, index):
+        suggestions = SortedTermSuggester().suggest("Py", index)
+        assert suggestions == [
+            TermSuggestion("python", 3),
+            TermSuggestion("pytorch", 2),
+            TermSuggestion("pyspark", 1),
+        ]
+
+    def test_completes_last_word_only(self, index):
+        suggestions = SortedTermSuggester().suggest("python pa", index, limit=5)
+        assert [s.term for s in suggestions] == ["pandas"]
+
+    def test_limit_and_no_match(self, index):
+        assert len(SortedTermSuggester().suggest("p", index, limit=2)) == 2
+        assert SortedTermSuggester().suggest("go", index) == []
+        assert SortedTermSuggester().suggest("  ", index) == []
+
+    def test_terms_follow_ingest_and_compaction(self, builder, index):
+        builder.add_posts(index, [Post(id="5", text="pydantic")], SimpleTokenizer())
+        assert "pydantic" in [s.term for s in SortedTermSuggester().suggest("pyd", index)]
+        assert index.terms == sorted(index.terms)
+
+        builder.remove_posts(index, ["4"])
+        builder.compact(index)
+        assert "rust" not in index.terms
+
+    def test_deleted_posts_do_not_count(self, builder, index):
+        builder.remove_posts(index, ["1", "3"])
+
+        suggestions = SortedTermSuggester().suggest("py", index)
+
+        assert set(suggestions) == {TermSuggestion("python", 1), TermSuggestion("pyspark", 1)}
+        assert SortedTermSuggester().suggest("pa", index) == []
+        # Broad prefixes walk the frequency ordering instead of the range
+        assert {s.term for s in SortedTermSuggester().suggest("p", index, limit=5)} == {"python", "pyspark"}
+
+    def test_prefix_is_normalized_like_the_indexed_terms(self, builder):
+        index = builder.build_index([Post(id="1", text="Un café délicieux, l'été")], SimpleTokenizer())
+
+        def terms(prefix):
+            return [s.term for s in SortedTermSuggester().suggest(prefix, index)]
+
+        assert terms("CAF") == ["café"]
+        assert terms("un de\u0301li") == ["délicieux"]  # decomposed accent
+        assert terms("(dé") == ["délicieux"]
+        assert terms("l'ét") == ["été"]
+        assert terms("café ") == ["café"]
+        assert terms("café, ") == []  # punctuation ends the word
@@ -0,0 +1,44 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from infrastructure.static_token_embedder import StaticTokenEmbedder
+
+
+class FakeTokenizer:
+    vocabulary = {"graph": 0, "neural": 1, "networks": 2, "hiring": 3}
+
+    def __call__(self, texts, add_special_tokens):
+        return {"input_ids": [[self.vocabulary[word] for word in text.split()] for text in texts]}
+
+
+@pytest.fixture
+def embedder():
+    embedder = StaticTokenEmbedder(batch_size=2)
+    embedder._tokenizer = FakeTokenizer()
+    embedder._vectors = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [-1.0, 0.0]], dtype=np.float32)
+    return embedder
+
+
+class TestStaticTokenEmbedder:
+    def test_texts_are_the_normalized_mean_of_their_tokens(self, embedder):
+        embeddings = embedder.encode(["graph neural", "hiring", "", "graph networks neural"])
+
+        assert embeddings.dtype == np.float32
+        np.testing.assert_allclose(embeddings[0], [np.sqrt(0.5), np.sqrt(0.5)], rtol=1e-6)
+        np.testing.assert_allclose(embeddings[1], [-1.0, 0.0])
+        np.testing.assert_array_equal(embeddings[2], [0.0, 0.0])
+        np.testing.assert_allclose(embeddings[3], [np.sqrt(0.5), np.sqrt(0.5)], rtol=1e-6)
+
+    def test_no_texts(self, embedder):
+        assert embedder.encode([]).shape == (0, 2)
+
+    def test_name_tells_it_apart_from_the_full_model(self, embedder):
+        assert embedder.name == "static:all-MiniLM-L6-v2"
+
+    def test_pickling_drops_the_loaded_table(self, embedder):
+        copy = pickle.loads(pickle.dumps(embedder))
+
+        assert copy.batch_size == 2
+        assert copy._vectors is None
@@ -0,0 +1,67 @@
+import pytest
+
+from domain.entities.search import Post
+from infrastructure.search_index_builder import InMemorySearchIndexBuilder
+from infrastructure.search_index_looker import SimpleSearchIndexLookup
+from infrastructure.simple_tokenizer import SimpleTokenizer
+from infrastructure.trigram_term_expander import TrigramTermExpander, bounded_edit_distance
+
+
+@pytest.mark.parametrize(
+    "a,b,max_edits,expected",
+    [
+        ("python", "python", 2, 0),
+        ("pyhton", "python", 2, 1),  # adjacent transposition
+        ("pythn", "python", 2, 1),
+        ("pthn", "python", 2, 2),
+        ("java", "python", 2, None),
+        ("kubernetes", "kubernets", 1, 1),
+        ("ab", "abcd", 1, None),
+    ],
+)
+def test_bounded_edit_distance(a, b, max_edits, expected):
+    assert bounded_edit_distance(a, b, max_edits) == expected
+
+
+@pytest.fixture
+def index():
+    posts = [
+        Post(id="1", text="Python typing tips"),
+        Post(id="2", text="Python packaging"),
+        Post(id="3", text="Pythonic code and Kubernetes"),
+        Post(id="4", text="Go and Rust"),
+    ]
+    return InMemorySearchIndexBuilder().build_index(posts, SimpleTokenizer())
+
+
+class TestTrigramTermExpander:
+    def test_expands_typos(self, index):
+        assert TrigramTermExpander().expand("pyhton", index) == ["python"]
+        assert TrigramTermExpander().expand("kubernets", index) == ["kubernetes"]
+        assert TrigramTermExpander().expand("rst", index) == ["rust"]
+
+    def test_transpositions_inside_long_tokens_are_found(self):
+        index = InMemorySearchIndexBuilder().build_index([Post(id="1", text="abcdefgh")], SimpleTokenizer())
+
+        # One transposition, yet only 4 of the 8 trigrams survive it
+        assert TrigramTermExpander(max_edits=1).expand("abcedfgh", index) == ["abcdefgh"]
+
+    def test_short_tokens_are_not_expanded(self, index):
+        assert TrigramTermExpander().expand("go", index) == []
+        assert TrigramTermExpander().expand("gp", index) == []
+
+    def test_max_expansions(self, index):
+        # "python" and "pythonic" are both one edit away; the more frequent term wins
+        assert TrigramTermExpander(max_expansions=1).expand("pythonc", index) == ["python"]
+        assert TrigramTermExpander(max_expansions=0).expand("pyhton", index) == []
+
+    def test_fuzzy_lookup_reports_expansions(self, index):
+        lookup = SimpleSearchIndexLookup(tokenizer=SimpleTokenizer(), term_expander=TrigramTermExpander())
+
+        exact = lookup.lookup("pyhton", index)
+        assert exact.matches == []
+
+        fuzzy = lookup.lookup("pyhton", index, fuzzy=True)
+        assert {post_id for post_id, _ in fuzzy.matches} == {"1", "2"}
+        assert fuzzy.expansions == {"pyhton": ["python"]}
+        assert fuzzy.terms == ["pyhton", "python"]
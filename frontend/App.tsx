@@ -61,14 +61,19 @@ const App: React.FC = () => {
 
   const fetchInsights = async () => {
     setIsLoading(true);
+    // the projection streams in on its own: a quick preview first, then the refined layout
+    api.getProjection(setProjection)
+      .then(setProjection)
+      .catch(err => {
+        console.error(err);
+        setError("Failed to fetch insights. Please ensure at least 10 posts are uploaded.");
+      });
     try {
-      const [authors, proj, imageBlobUrl] = await Promise.all([
+      const [authors, imageBlobUrl] = await Promise.all([
         api.getPopularAuthors(),
-        api.getProjection(),
         api.getWordCloudImage()
       ]);
       setPopularAuthors(authors);
-      setProjection(proj);
       setWordCloudImageUrl(imageBlobUrl);
     } catch (err) {
       console.error(err);
@@ -1,8 +1,20 @@
 
-import { LinkedInPost, PopularAuthor, ProjectionPoint } from './types';
+import { LinkedInPost, PopularAuthor, ProjectionPoint, ProjectionTable, ProjectionUpdate, SearchResponse } from './types';
 
 const BASE_URL = 'http://localhost:8000'; // Default FastAPI port
 
+// points of the same topic share its keyword list
+const fromTable = (table: ProjectionTable): ProjectionPoint[] => {
+  const keywords = new Map(table.topics.map(topic => [topic.id, topic.keywords]));
+  return table.post_id.map((post_id, i) => ({
+    post_id,
+    x: table.x[i],
+    y: table.y[i],
+    topic_id: table.topic_id[i],
+    keywords: keywords.get(table.topic_id[i] ?? NaN) ?? [],
+  }));
+};
+
 export const api = {
   getPosts: async (postIds?: string[]): Promise<LinkedInPost[]> => {
     const queryParams = postIds ? `?${postIds.map(id => `ids=${id}`).join('&')}` : '';
@@ -15,16 +27,17 @@ export const api = {
   },
 
   searchPosts: async (query: string): Promise<LinkedInPost[]> => {
-    const response = await fetch(`${BASE_URL}/search?query=${encodeURIComponent(query)}`, 
+    // posts come back hydrated with the ranked results, in a single round trip
+    const response = await fetch(`${BASE_URL}/search?query=${encodeURIComponent(query)}&include_posts=true`, 
     {
       method: 'GET',
       credentials: 'include',
     });
     if (!response.ok) throw new Error('Search failed');
-    // backend returns a list of post IDs for search; fetch full posts by IDs
-    const ids: string[] = await response.json();
-    if (!ids || ids.length === 0) return [];
-    return await api.getPosts(ids);
+    const body: SearchResponse = await response.json();
+    return body.results
+      .map(result => result.post)
+      .filter((post): post is LinkedInPost => post != null);
   },
 
   savePosts: async (posts: LinkedInPost[]): Promise<{ status: string }> => {
@@ -50,15 +63,36 @@ export const api = {
     return body;
   },
 
-  getProjection: async (): Promise<ProjectionPoint[]> => {
-    const response = await fetch(`${BASE_URL}/projection`, 
-    {
-      method: 'GET',
-      credentials: 'include',
-    }
-    );
-    if (!response.ok) throw new Error('Failed to fetch projection');
-    return response.json();
+  getProjection: (onPreview?: (points: ProjectionPoint[]) => void): Promise<ProjectionPoint[]> => {
+    // a quick PCA preview arrives first, then the refined UMAP layout with topic keywords;
+    // if refining runs past the server's budget the preview is what we keep
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${BASE_URL}/projection/stream?columnar=true`, { withCredentials: true });
+      let preview: ProjectionPoint[] = [];
+      let finished = false;
+      const finish = (settle: () => void) => {
+        finished = true;
+        source.close();
+        settle();
+      };
+      source.addEventListener('preview', event => {
+        preview = fromTable((JSON.parse((event as MessageEvent).data) as ProjectionUpdate).projections);
+        onPreview?.(preview);
+      });
+      source.addEventListener('refined', event => {
+        const update: ProjectionUpdate = JSON.parse((event as MessageEvent).data);
+        finish(() => resolve(fromTable(update.projections)));
+      });
+      source.addEventListener('timeout', () => finish(() => resolve(preview)));
+      source.addEventListener('failed', event => {
+        const update: ProjectionUpdate = JSON.parse((event as MessageEvent).data);
+        finish(() => reject(new Error(`Projection failed: ${update.job.error}`)));
+      });
+      // the server closes the stream after the last event; anything else is a failure
+      source.onerror = () => {
+        if (!finished) finish(() => reject(new Error('Failed to fetch projection')));
+      };
+    });
   },
 
   getWordCloudImage: async (): Promise<string> => {
@@ -25,6 +25,49 @@ export interface ProjectionPoint {
   y: number;
   post_id: string; // Match backend naming
   keywords: { keyword: string; score: number }[]; // Match backend structure
+  topic_id?: number | null; // null in previews, -1 for posts outside every topic
+}
+
+// Projections as parallel columns; each topic's keywords are sent once
+export interface ProjectionTable {
+  topics: { id: number; keywords: { keyword: string; score: number }[] }[];
+  post_id: string[];
+  x: number[];
+  y: number[];
+  topic_id: (number | null)[];
+}
+
+export interface ProjectionJob {
+  id: string;
+  generation: number;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  error: string | null;
+}
+
+export interface ProjectionUpdate {
+  stage: 'preview' | 'refined' | 'timeout' | 'failed';
+  job: ProjectionJob;
+  projections: ProjectionTable; // requested with columnar=true; preview points have no topic
+}
+
+export interface SearchResult {
+  post_id: string;
+  score: number;
+  snippet: string;
+  post?: LinkedInPost | null; // present with include_posts=true
+  highlights: [number, number][]; // [start, end) spans of the query terms in snippet
+}
+
+export interface SearchResponse {
+  results: SearchResult[];
+  total: number;
+  next_cursor?: string | null;
+  facets?: SearchFacets;
+}
+
+export interface SearchFacets {
+  authors: Record<string, number>; // author -> matching posts
+  months: Record<string, number>; // "YYYY-MM" -> matching posts
 }
 
 export interface WordCloudItem {